@@ -1,84 +1,78 @@
 #!/usr/bin/env python3
 """
 Script to check which motors are actually available on the follower arm.
+Opens the port once and discovers every responding ID instead of trying fixed layouts.
 """
 
+import argparse
 import sys
-import os
+import time
 from pathlib import Path
 
-# Add the lerobot package to the path
+# Add the lerobot package and the shared helpers to the path
 sys.path.insert(0, str(Path(__file__).parent / "lerobot" / "src"))
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
 
-from lerobot.motors.feetech import FeetechMotorsBus
-from lerobot.motors import Motor, MotorNormMode
-import time
+from so101_bus import DEFAULT_BAUDRATE, MAX_MOTOR_ID, discover_motors, motors_from_discovery
 
-def check_available_motors():
+def check_available_motors(port=None, baudrates=None, max_id=MAX_MOTOR_ID):
     print("=" * 60)
     print("CHECKING AVAILABLE MOTORS ON FOLLOWER ARM")
     print("=" * 60)
     print()
-    
-    # Get the port from user input
-    print("Please enter the port where your SO101 follower arm is connected.")
-    port = input("Enter the port (e.g., COM4): ").strip()
+
+    # Get the port from user input if it was not given on the command line
+    if not port:
+        print("Please enter the port where your SO101 follower arm is connected.")
+        port = input("Enter the port (e.g., COM4): ").strip()
     if not port:
         print("Error: Port is required!")
         return
-    
+
+    baudrates = baudrates or [DEFAULT_BAUDRATE]
+
     try:
-        # Try to connect and see what motors are available
-        print(f"\nScanning for motors on port {port}...")
-        
-        # Try different motor configurations
-        motor_configs = [
-            {
-                'shoulder_pan': Motor(1, 'sts3215', MotorNormMode.DEGREES),
-                'shoulder_lift': Motor(2, 'sts3215', MotorNormMode.DEGREES),
-                'elbow_flex': Motor(3, 'sts3215', MotorNormMode.DEGREES),
-                'wrist_flex': Motor(4, 'sts3215', MotorNormMode.DEGREES),
-                'gripper': Motor(5, 'sts3215', MotorNormMode.RANGE_0_100),
-                'wrist_roll': Motor(6, 'sts3215', MotorNormMode.DEGREES)
-            },
-            {
-                'shoulder_pan': Motor(1, 'sts3215', MotorNormMode.DEGREES),
-                'shoulder_lift': Motor(2, 'sts3215', MotorNormMode.DEGREES),
-                'gripper': Motor(5, 'sts3215', MotorNormMode.RANGE_0_100),
-                'wrist_roll': Motor(6, 'sts3215', MotorNormMode.DEGREES)
-            }
-        ]
-        
-        for i, motors in enumerate(motor_configs):
-            print(f"\nTrying configuration {i+1} with {len(motors)} motors...")
-            try:
-                bus = FeetechMotorsBus(port, motors=motors)
-                bus.connect()
-                print(f"✅ Successfully connected to {len(motors)} motors!")
-                print("Available motors:")
-                for name, motor in motors.items():
-                    print(f"  - {name}: ID {motor.id}")
-                
-                # Disable torque to free up motors
-                print("\nDisabling torque on all motors...")
-                bus.disable_torque()
-                print("✅ Torque disabled - motors should be free to move")
-                
-                bus.disconnect()
-                return motors
-                
-            except Exception as e:
-                print(f"❌ Configuration {i+1} failed: {e}")
-                continue
-        
-        print("\n❌ No working motor configuration found!")
-        print("Please check:")
-        print("1. The port is correct")
-        print("2. The follower arm is powered on")
-        print("3. The USB connection is working")
-        
+        print(f"\nScanning IDs 1-{max_id} on port {port} at {', '.join(map(str, baudrates))} bps...")
+        start = time.perf_counter()
+        # Discovery also releases torque on everything it finds
+        found = discover_motors(port, baudrates=baudrates, max_id=max_id, disable_torque=True)
+        elapsed = time.perf_counter() - start
+        print(f"Scan finished in {elapsed * 1000:.0f} ms")
+
+        if not found:
+            print("\n❌ No motors responded!")
+            print("Please check:")
+            print("1. The port is correct")
+            print("2. The follower arm is powered on")
+            print("3. The USB connection is working")
+            return
+
+        motors = {}
+        for baudrate, id_models in found.items():
+            print(f"\n✅ Found {len(id_models)} motors at {baudrate} bps:")
+            for motor_id, model_number in id_models.items():
+                print(f"  - ID {motor_id}: model number {model_number}")
+            motors.update(motors_from_discovery(id_models))
+
+        print("\nAvailable motors:")
+        for name, motor in motors.items():
+            print(f"  - {name}: ID {motor.id}")
+        print("✅ Torque disabled - motors should be free to move")
+        return motors
+
     except Exception as e:
         print(f"Error: {e}")
 
+def main():
+    parser = argparse.ArgumentParser(description='Discover motors on an SO-101 arm')
+    parser.add_argument('--port', help='Serial port of the arm (prompted if omitted)')
+    parser.add_argument('--baudrates', type=int, nargs='+', default=[DEFAULT_BAUDRATE],
+                       help=f'Baudrates to scan (default: {DEFAULT_BAUDRATE})')
+    parser.add_argument('--max-id', type=int, default=MAX_MOTOR_ID,
+                       help=f'Highest ID swept if broadcast ping fails (default: {MAX_MOTOR_ID})')
+
+    args = parser.parse_args()
+    check_available_motors(args.port, args.baudrates, args.max_id)
+
 if __name__ == "__main__":
-    check_available_motors() 
\ No newline at end of file
+    main()
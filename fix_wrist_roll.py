@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 
+import sys
+import time
+from pathlib import Path
+
+# Add the shared helpers to the path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
 from lerobot.motors.feetech import FeetechMotorsBus
 from lerobot.motors import Motor, MotorNormMode
-import time
+from motion import move_and_settle
+from so101_bus import JointBus
 
 def fix_wrist_roll():
     print("Attempting to fix stuck wrist_roll motor...")
@@ -11,8 +19,9 @@ def fix_wrist_roll():
         # Connect to just the wrist_roll motor
         bus = FeetechMotorsBus('COM4', motors={'wrist_roll': Motor(5, 'sts3215', MotorNormMode.DEGREES)})
         bus.connect()
+        joints = JointBus(bus, ['wrist_roll'])
         
-        current_pos = bus.read("Present_Position", "wrist_roll")
+        current_pos = int(joints.read_positions()[0])
         print(f"Current wrist_roll position: {current_pos}")
         
         # Try to disable torque first
@@ -26,12 +35,11 @@ def fix_wrist_roll():
         for pos in test_positions:
             try:
                 print(f"Trying to move wrist_roll to {pos}...")
-                bus.write("Goal_Position", "wrist_roll", pos)
-                time.sleep(2)
-                actual_pos = bus.read("Present_Position", "wrist_roll")
-                print(f"  Actual position: {actual_pos}")
+                # Returns as soon as it arrives, or once it stops making progress
+                result = move_and_settle(joints, {'wrist_roll': pos}, tolerance=50, timeout=2.0)
+                print(f"  Actual position: {result.positions[0]} - {result.summary()}")
                 
-                if abs(actual_pos - pos) < 50:  # If it moved successfully
+                if result.settled:  # If it moved successfully
                     print("  ✅ Wrist_roll is now responding!")
                     break
                     
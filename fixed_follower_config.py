@@ -10,12 +10,16 @@ from pathlib import Path
 
 # Add the lerobot package to the path
 sys.path.insert(0, str(Path(__file__).parent / "lerobot" / "src"))
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
 
 from lerobot.motors.feetech import FeetechMotorsBus
 from lerobot.motors import Motor, MotorNormMode, MotorCalibration
 import json
 import time
 
+from range_recorder import RangeRecorder
+from so101_bus import JointBus
+
 def create_fixed_calibration():
     print("=" * 60)
     print("CREATING FIXED FOLLOWER ARM CALIBRATION")
@@ -73,9 +77,14 @@ def create_fixed_calibration():
         
         print("\nMove all joints sequentially through their entire ranges of motion.")
         print("Recording positions. Press ENTER to stop...")
-        input()
         
-        range_mins, range_maxes = bus.record_ranges_of_motion()
+        # Back-to-back sync reads of all joints; Enter stops the capture without pausing sampling
+        recorder = RangeRecorder(JointBus(bus, joint_names=list(bus.motors)))
+        recorder.run()
+        range_mins, range_maxes = recorder.ranges()
+        unswept = recorder.unswept()
+        if unswept:
+            print(f"⚠️  Barely moved: {', '.join(unswept)}")
         
         # Create calibration with correct mapping
         calibration = {}
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 
+import sys
+import time
+from pathlib import Path
+
+# Add the shared helpers to the path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
 from lerobot.motors.feetech import FeetechMotorsBus
 from lerobot.motors import Motor, MotorNormMode
-import time
+from motion import move_and_settle
+from so101_bus import JointBus
 
 def force_wrist_roll():
     print("Attempting to force wrist_roll motor to move...")
@@ -13,6 +21,7 @@ def force_wrist_roll():
         bus.connect()
         
         print("✅ Connected to wrist_roll motor")
+        joints = JointBus(bus, ['wrist_roll'])
         
         # Try to read current position
         try:
@@ -38,17 +47,14 @@ def force_wrist_roll():
         for pos in test_positions:
             try:
                 print(f"Trying to force move to position {pos}...")
-                bus.write("Goal_Position", "wrist_roll", pos, normalize=False)
-                time.sleep(3)
-                
-                # Check if it moved
+                # Wait for arrival (or a stall) instead of a fixed 3 s
                 try:
-                    actual_pos = bus.read("Present_Position", "wrist_roll", normalize=False)
-                    print(f"  Actual position: {actual_pos}")
-                    if abs(actual_pos - pos) < 100:
+                    result = move_and_settle(joints, {'wrist_roll': pos}, tolerance=100, timeout=3.0)
+                    print(f"  Actual position: {result.positions[0]} - {result.summary()}")
+                    if result.settled:
                         print("  ✅ Motor moved successfully!")
                         break
-                except:
+                except ConnectionError:
                     print("  Could not read position")
                     
             except Exception as e:
@@ -8,12 +8,14 @@ import sys
 import os
 from pathlib import Path
 
-# Add the lerobot package to the path
+# Add the lerobot package and the shared helpers to the path
 sys.path.insert(0, str(Path(__file__).parent / "lerobot" / "src"))
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
 
 from lerobot.motors.feetech import FeetechMotorsBus
 from lerobot.motors import Motor, MotorNormMode
-import time
+from motion import move_and_settle
+from so101_bus import JointBus
 
 def identify_motors():
     print("=" * 60)
@@ -55,31 +57,34 @@ def identify_motors():
         print("For each motor, we'll try to move it slightly and you can observe which joint moves.")
         print()
         
+        # All joints are read in one sync read and goals written in one sync write
+        joints = JointBus(bus, list(bus.motors))
+
         # Test each motor individually
-        for motor_name in bus.motors:
-            print(f"\nTesting {motor_name} (Motor ID {bus.motors[motor_name].id})...")
-            print(f"  Current position: {bus.read('Present_Position', motor_name)}")
+        for i, motor_name in enumerate(joints.joint_names):
+            print(f"\nTesting {motor_name} (Motor ID {joints.ids[i]})...")
             
-            # Try to move the motor slightly
+            # Try to move the motor slightly, holding every other joint where it is
             try:
-                current_pos = bus.read('Present_Position', motor_name)
-                test_pos = current_pos + 100  # Move 100 units
+                start_positions = joints.read_positions()
+                current_pos = start_positions[i]
+                print(f"  Current position: {current_pos}")
+                goal = current_pos + 100  # Move 100 units
                 
-                print(f"  Moving to position {test_pos}...")
-                bus.write('Goal_Position', motor_name, test_pos)
-                time.sleep(2)
+                print(f"  Moving to position {goal}...")
+                result = move_and_settle(joints, {motor_name: goal}, tolerance=50, timeout=2.0,
+                                         start_positions=start_positions)
                 
-                new_pos = bus.read('Present_Position', motor_name)
-                print(f"  New position: {new_pos}")
+                new_pos = result.positions[i]
+                print(f"  New position: {new_pos} ({result.summary()})")
                 
-                if abs(new_pos - test_pos) < 50:
+                if result.settled:
                     print(f"  ✅ {motor_name} moved successfully!")
                 else:
                     print(f"  ⚠️  {motor_name} may be stuck or not responding")
                 
                 # Move back to original position
-                bus.write('Goal_Position', motor_name, current_pos)
-                time.sleep(1)
+                move_and_settle(joints, start_positions, tolerance=50, timeout=1.0)
                 
             except Exception as e:
                 print(f"  ❌ Error testing {motor_name}: {e}")
@@ -88,7 +93,7 @@ def identify_motors():
             observed_joint = input("  Your observation: ").strip().lower()
             
             if observed_joint != 'none':
-                print(f"  📝 Motor ID {bus.motors[motor_name].id} ({motor_name}) controls {observed_joint}")
+                print(f"  📝 Motor ID {joints.ids[i]} ({motor_name}) controls {observed_joint}")
         
         print("\n" + "=" * 60)
         print("SUMMARY")
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Async Feetech Transport
+asyncio ping/read/write/sync-read/sync-write for STS3215 buses, built on pyserial
+
+Each bus still runs one transaction at a time (the wire is half duplex), but
+transactions on different ports overlap in one event loop, so a tick that
+touches both arms costs about max(leader, follower) instead of the sum.
+
+On POSIX the serial fd is watched with loop.add_reader; elsewhere a reader
+thread hands received bytes to the loop.
+"""
+
+import argparse
+import asyncio
+import os
+import threading
+import time
+
+import numpy as np
+
+from feetech_protocol import (
+    CONTROL_TABLE,
+    INST_PING,
+    INST_READ,
+    INST_WRITE,
+    SIGN_BITS,
+    STATUS_OVERHEAD,
+    PacketParser,
+    decode_register,
+    encode_instruction,
+    encode_register,
+    encode_sign_magnitude,
+    encode_sync_read,
+    encode_sync_write,
+    from_bytes,
+    to_bytes,
+    wire_time,
+)
+from feetech_serial import REPLY_TIMEOUT_MS, tuned_timeout_ms
+from so101_bus import (
+    DEFAULT_BAUDRATE,
+    DEFAULT_MOTOR_IDS,
+    JOINT_NAMES,
+    POSITION_ADDRESS,
+    POSITION_LENGTH,
+    STATE_ADDRESS,
+    STATE_FIELDS,
+    STATE_LENGTH,
+    decode_positions,
+    decode_state,
+)
+
+class _Waiter:
+    """Replies still expected for the transaction in flight"""
+
+    def __init__(self, ids, future):
+        self.pending = set(ids)
+        self.replies = {}
+        self.future = future
+
+class AsyncFeetechTransport:
+    """
+    One serial port speaking the Feetech protocol.
+
+    transact() writes an instruction packet and waits for the status
+    packets of the given IDs; an asyncio.Lock keeps transactions on this
+    port strictly one at a time. Without timeout_ms the port's tuned reply
+    timeout from config/bus_tuning.json is used, else REPLY_TIMEOUT_MS.
+    """
+
+    def __init__(self, port, baudrate=DEFAULT_BAUDRATE, timeout_ms=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout_ms = tuned_timeout_ms(port) if timeout_ms is None else timeout_ms
+        self.serial = None
+        self.stray_packets = 0
+        self.status_errors = {}
+        self._parser = PacketParser()
+        self._waiter = None
+        self._lock = None
+        self._loop = None
+        self._reader_thread = None
+
+    @property
+    def is_open(self):
+        return self.serial is not None
+
+    async def open(self):
+        import serial
+
+        self._loop = asyncio.get_running_loop()
+        self._lock = asyncio.Lock()
+        self.serial = serial.Serial(self.port, self.baudrate, timeout=0)
+        self.serial.reset_input_buffer()
+        if os.name == 'posix':
+            self._loop.add_reader(self.serial.fileno(), self._on_readable)
+        else:
+            self._reader_thread = threading.Thread(target=self._read_forever, daemon=True)
+            self._reader_thread.start()
+
+    async def close(self):
+        if self.serial is None:
+            return
+        ser, self.serial = self.serial, None
+        if self._reader_thread is None:
+            self._loop.remove_reader(ser.fileno())
+        ser.close()
+        if self._reader_thread is not None:
+            self._reader_thread.join(1.0)
+            self._reader_thread = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _on_readable(self):
+        ser = self.serial
+        if ser is not None:
+            self._feed(ser.read(ser.in_waiting or 1))
+
+    def _read_forever(self):
+        ser = self.serial
+        ser.timeout = 0.001
+        while self.serial is not None:
+            try:
+                data = ser.read(ser.in_waiting or 1)
+            except Exception:
+                break
+            if data:
+                self._loop.call_soon_threadsafe(self._feed, data)
+
+    def _feed(self, data):
+        waiter = self._waiter
+        for id_, code, params in self._parser.feed(data):
+            if waiter is None or id_ not in waiter.pending:
+                self.stray_packets += 1
+                continue
+            if code:
+                self.status_errors[id_] = code
+            waiter.replies[id_] = params
+            waiter.pending.discard(id_)
+            if not waiter.pending and not waiter.future.done():
+                waiter.future.set_result(waiter.replies)
+
+    async def transact(self, packet, reply_ids=(), reply_params=0, timeout_ms=None):
+        """Send one packet; returns {id: params} for reply_ids (missing IDs are left out on timeout)"""
+        if self.serial is None:
+            raise ConnectionError(f"{self.port} is not open")
+        async with self._lock:
+            self._parser.buffer.clear()
+            waiter = None
+            if reply_ids:
+                waiter = _Waiter(reply_ids, self._loop.create_future())
+                self._waiter = waiter
+            self.serial.write(packet)
+            if waiter is None:
+                return {}
+            reply_bytes = len(waiter.pending) * (STATUS_OVERHEAD + reply_params)
+            timeout = wire_time(len(packet) + reply_bytes, self.baudrate) + \
+                (self.timeout_ms if timeout_ms is None else timeout_ms) / 1000
+            try:
+                return await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+            except asyncio.TimeoutError:
+                return dict(waiter.replies)
+            finally:
+                self._waiter = None
+
+class AsyncMotorsBus:
+    """
+    FeetechMotorsBus-style access to one arm over an AsyncFeetechTransport.
+
+    motors maps name -> lerobot Motor (or a plain motor ID). Values are raw
+    register values with sign-magnitude decoding, i.e. what the sync
+    FeetechMotorsBus returns with normalize=False.
+    """
+
+    def __init__(self, port, motors=None, baudrate=DEFAULT_BAUDRATE, timeout_ms=None):
+        motors = motors or DEFAULT_MOTOR_IDS
+        self.motors = motors
+        self.ids = {name: getattr(motor, 'id', motor) for name, motor in motors.items()}
+        self.transport = AsyncFeetechTransport(port, baudrate, timeout_ms)
+
+    @property
+    def port(self):
+        return self.transport.port
+
+    @property
+    def is_connected(self):
+        return self.transport.is_open
+
+    async def connect(self, handshake=True):
+        await self.transport.open()
+        if handshake:
+            missing = [name for name in self.ids if await self.ping(name) is None]
+            if missing:
+                await self.transport.close()
+                raise ConnectionError(f"Motors {missing} did not answer on {self.port}")
+
+    async def disconnect(self):
+        await self.transport.close()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.disconnect()
+
+    def _id(self, motor):
+        return self.ids[motor] if isinstance(motor, str) else motor
+
+    async def ping(self, motor):
+        """Model number of a motor, or None if it does not answer"""
+        id_ = self._id(motor)
+        replies = await self.transport.transact(encode_instruction(id_, INST_PING), (id_,))
+        if id_ not in replies:
+            return None
+        addr, length = CONTROL_TABLE['Model_Number']
+        replies = await self.transport.transact(encode_instruction(id_, INST_READ, bytes((addr, length))),
+                                                (id_,), length)
+        return from_bytes(replies[id_]) if id_ in replies else None
+
+    async def read(self, data_name, motor):
+        id_ = self._id(motor)
+        addr, length = CONTROL_TABLE[data_name]
+        replies = await self.transport.transact(encode_instruction(id_, INST_READ, bytes((addr, length))),
+                                                (id_,), length)
+        if id_ not in replies:
+            raise ConnectionError(f"Failed to read '{data_name}' on id_={id_} on {self.port}")
+        return decode_register(data_name, from_bytes(replies[id_]))
+
+    async def write(self, data_name, motor, value):
+        id_ = self._id(motor)
+        addr, length = CONTROL_TABLE[data_name]
+        packet = encode_instruction(id_, INST_WRITE, bytes((addr,)) + to_bytes(encode_register(data_name, value), length))
+        replies = await self.transport.transact(packet, (id_,))
+        if id_ not in replies:
+            raise ConnectionError(f"Failed to write '{data_name}' on id_={id_} on {self.port}")
+
+    async def sync_read(self, data_name, motors=None):
+        """{name: value} for every motor (or the given names) in one transaction"""
+        names = list(self.ids) if motors is None else [motors] if isinstance(motors, str) else list(motors)
+        ids = [self.ids[name] for name in names]
+        addr, length = CONTROL_TABLE[data_name]
+        replies = await self.transport.transact(encode_sync_read(addr, length, ids), ids, length)
+        missing = [id_ for id_ in ids if id_ not in replies]
+        if missing:
+            raise ConnectionError(f"Failed to sync read '{data_name}' on ids={missing} on {self.port}")
+        return {name: decode_register(data_name, from_bytes(replies[id_])) for name, id_ in zip(names, ids)}
+
+    async def sync_write(self, data_name, values):
+        """Broadcast {name: value} in one packet (no status replies)"""
+        addr, length = CONTROL_TABLE[data_name]
+        ids_data = {self.ids[name]: to_bytes(encode_register(data_name, value), length) for name, value in values.items()}
+        await self.transport.transact(encode_sync_write(addr, length, ids_data))
+
+class AsyncJointBus:
+    """Fixed-order joint vectors over an AsyncMotorsBus, same layout as so101_bus.JointBus"""
+
+    def __init__(self, bus, joint_names=JOINT_NAMES, ids=None):
+        self.bus = bus
+        self.joint_names = list(joint_names)
+        self.ids = list(ids) if ids is not None else [bus.ids[name] for name in self.joint_names]
+        goal_addr, self._goal_len = CONTROL_TABLE['Goal_Position']
+        self._position_packet = encode_sync_read(POSITION_ADDRESS, POSITION_LENGTH, self.ids)
+        self._state_packet = encode_sync_read(STATE_ADDRESS, STATE_LENGTH, self.ids)
+        self._goal_addr = goal_addr
+
+    def __len__(self):
+        return len(self.ids)
+
+    async def _sync_read(self, packet, length):
+        replies = await self.bus.transport.transact(packet, self.ids, length)
+        if len(replies) != len(self.ids):
+            missing = [id_ for id_ in self.ids if id_ not in replies]
+            raise ConnectionError(f"Failed to sync read joints {missing} on {self.bus.port}")
+        return replies
+
+    async def read_positions(self, out=None):
+        out = np.empty(len(self.ids), dtype=np.int32) if out is None else out
+        return decode_positions(await self._sync_read(self._position_packet, POSITION_LENGTH), self.ids, out)
+
+    async def read_state(self, out=None):
+        out = np.empty((len(self.ids), len(STATE_FIELDS)), dtype=np.int32) if out is None else out
+        return decode_state(await self._sync_read(self._state_packet, STATE_LENGTH), self.ids, out)
+
+    async def write_goals(self, goals):
+        sign_bit = SIGN_BITS['Goal_Position']
+        ids_data = {id_: to_bytes(encode_sign_magnitude(int(goal), sign_bit), self._goal_len)
+                    for id_, goal in zip(self.ids, goals)}
+        await self.bus.transport.transact(encode_sync_write(self._goal_addr, self._goal_len, ids_data))
+
+async def overlapped_tick(leader_joints, follower_joints, mapping, raw, goals):
+    """
+    One pipelined teleop tick: the follower write of the previous goals overlaps
+    this tick's leader read, then the new goals are mapped for the next tick.
+    """
+    await asyncio.gather(leader_joints.read_positions(raw), follower_joints.write_goals(goals))
+    mapping.apply(raw, goals)
+    return goals
+
+async def _time_ticks(tick, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        await tick()
+    return (time.perf_counter() - start) / ticks * 1000
+
+async def _bench(leader_port, follower_port, ticks, timeout_ms=None, leader_id='leader_arm',
+                 follower_id='follower_arm'):
+    """
+    Per-tick wall time, one after the other vs overlapped: a state read on
+    both arms, and a teleop tick (leader read, mapping, follower goal write)
+    against overlapped_tick()
+    """
+    from calibration_tables import default_calibration_path
+    from joint_mapping import JointMapping
+
+    mapping = JointMapping.from_files(default_calibration_path('leader', leader_id),
+                                      default_calibration_path('follower', follower_id))
+    leader = AsyncMotorsBus(leader_port, timeout_ms=timeout_ms)
+    follower = AsyncMotorsBus(follower_port, timeout_ms=timeout_ms)
+    await asyncio.gather(leader.connect(), follower.connect())
+    try:
+        leader_joints = AsyncJointBus(leader, mapping.joint_names, mapping.leader_ids)
+        follower_joints = AsyncJointBus(follower, mapping.joint_names, mapping.follower_ids)
+        raw = await leader_joints.read_positions()
+        goals = mapping.apply(raw)
+
+        async def read_sequential():
+            await leader_joints.read_state()
+            await follower_joints.read_state()
+
+        async def read_overlapped():
+            await asyncio.gather(leader_joints.read_state(), follower_joints.read_state())
+
+        async def tick_sequential():
+            await leader_joints.read_positions(raw)
+            mapping.apply(raw, goals)
+            await follower_joints.write_goals(goals)
+
+        async def tick_overlapped():
+            await overlapped_tick(leader_joints, follower_joints, mapping, raw, goals)
+
+        return {
+            'state read': {'sequential': await _time_ticks(read_sequential, ticks),
+                           'overlapped': await _time_ticks(read_overlapped, ticks)},
+            'teleop tick': {'sequential': await _time_ticks(tick_sequential, ticks),
+                            'overlapped': await _time_ticks(tick_overlapped, ticks)},
+        }
+    finally:
+        await asyncio.gather(leader.disconnect(), follower.disconnect())
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sequential vs overlapped bus I/O on two arms')
+    parser.add_argument('--leader-port', default='COM3', help='Leader arm port (default: COM3)')
+    parser.add_argument('--follower-port', default='COM4', help='Follower arm port (default: COM4)')
+    parser.add_argument('--leader-id', default='leader_arm', help='Leader calibration id (default: leader_arm)')
+    parser.add_argument('--follower-id', default='follower_arm', help='Follower calibration id (default: follower_arm)')
+    parser.add_argument('--ticks', type=int, default=500, help='Ticks per mode (default: 500)')
+    parser.add_argument('--timeout-ms', type=float,
+                       help=f'Reply window on top of the wire time (default: tuned value or {REPLY_TIMEOUT_MS:g})')
+
+    args = parser.parse_args()
+    print("⚡ Async bus I/O on both arms per tick")
+    print("=" * 50)
+    results = asyncio.run(_bench(args.leader_port, args.follower_port, args.ticks, args.timeout_ms,
+                                 args.leader_id, args.follower_id))
+    for name, modes in results.items():
+        print(f"{name}:")
+        for mode, ms in modes.items():
+            print(f"  {mode:<12} {ms:6.2f} ms/tick")
+        print(f"  Speedup: x{modes['sequential'] / modes['overlapped']:.2f}")
+
+if __name__ == "__main__":
+    main()
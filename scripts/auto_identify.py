@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Automatic Motor Identification
+Infer which motor ID drives which joint without watching the arm
+
+Every motor is excited at once (one sync write per tick) with a small sine
+at its own frequency while Present_Position/Velocity/Load are streamed with
+one sync read per tick. Lock-in demodulation turns that into per-motor
+features (tracking, gravity hold load, load coupling between motors), which
+are scored against SO-101 joint profiles for all 720 ID -> joint
+assignments. The calibrated range span of each motor ID is used too when a
+calibration file is available: it follows the motor, whatever name it was
+saved under, and the gripper's short span stands out.
+"""
+
+import argparse
+import itertools
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from calibration_store import load_calibration
+from calibration_tables import default_calibration_path
+from joint_mapping import DEFAULT_MAPPING_PATH, save_arm_mapping
+from so101_bus import DEFAULT_MOTOR_IDS, JOINT_NAMES, JointBus
+from teleop_engine import FixedRateLoop
+
+EXCITATION_RATE_HZ = 100
+EXCITATION_SECONDS = 2.0
+EXCITATION_AMPLITUDE = 40          # ticks, about 3.5 degrees
+
+# Expected behaviour of each joint on an SO-101 in its rest pose.
+# gravity: relative static load while holding; span: typical calibrated range in ticks
+JOINT_PROFILES = {
+    'shoulder_pan': {'gravity': 0.0, 'span': 1980},
+    'shoulder_lift': {'gravity': 1.0, 'span': 2350},
+    'elbow_flex': {'gravity': 0.6, 'span': 2250},
+    'wrist_flex': {'gravity': 0.25, 'span': 2420},
+    'wrist_roll': {'gravity': 0.05, 'span': 2290},
+    'gripper': {'gravity': 0.0, 'span': 1390},
+}
+
+# Score weights; the default-layout prior only breaks ties
+WEIGHTS = {'gravity': 1.0, 'span': 4.0, 'coupling': 0.5, 'prior': 0.05}
+
+# A motor whose position follows less than this share of its excitation is reported as not moving
+MIN_TRACKING = 0.3
+
+# Present_Load is in 0.1 % of stall torque. Below these levels a load feature is noise and is left out
+# of the score instead of being stretched to full scale by normalization.
+MIN_GRAVITY_LOAD = 50
+MIN_COUPLING_LOAD = 20
+
+def excitation_frequencies(n, seconds=EXCITATION_SECONDS):
+    """Distinct frequencies with a whole number of periods in the window, so they demodulate orthogonally"""
+    return np.array([(k + 2) / seconds for k in range(n)])
+
+class ExcitationLoop(FixedRateLoop):
+    """Drive every motor with its own sine around its start position and log the state each tick"""
+
+    def __init__(self, joints, amplitude=EXCITATION_AMPLITUDE, seconds=EXCITATION_SECONDS,
+                 rate_hz=EXCITATION_RATE_HZ):
+        super().__init__(rate_hz, stages=('write', 'read', 'slack'))
+        self.joints = joints
+        self.amplitude = amplitude
+        self.seconds = seconds
+        self.freqs = excitation_frequencies(len(joints), seconds)
+        n_ticks = int(math.ceil(seconds * rate_hz)) + 1
+        n = len(joints)
+        self.t = np.zeros(n_ticks)
+        self.command = np.zeros((n_ticks, n))
+        self.state = np.zeros((n_ticks, n, 3), dtype=np.int32)
+        self.count = 0
+        self.start_positions = None
+        self._goals = np.zeros(n, dtype=np.int32)
+        self._t0 = None
+
+    def tick(self):
+        now = time.perf_counter()
+        if self._t0 is None:
+            self.start_positions = self.joints.read_positions()
+            self._t0 = now
+        t = now - self._t0
+        i = self.count
+        if t > self.seconds or i >= len(self.t):
+            self.joints.write_goals(self.start_positions)
+            self.stop()
+            return
+
+        offsets = self.amplitude * np.sin(2 * math.pi * self.freqs * t)
+        np.add(self.start_positions, np.rint(offsets), out=self._goals, casting='unsafe')
+        t0 = time.perf_counter_ns()
+        self.joints.write_goals(self._goals)
+        t1 = time.perf_counter_ns()
+        self.joints.read_state(self.state[i])
+        t2 = time.perf_counter_ns()
+        self.latency['write'].record_ns(t1 - t0)
+        self.latency['read'].record_ns(t2 - t1)
+
+        self.t[i] = t
+        self.command[i] = offsets
+        self.count += 1
+
+def lock_in(t, signals, freqs):
+    """Amplitude of every signal column at every frequency: (n_freqs, n_signals)"""
+    x = signals - signals.mean(axis=0)
+    phase = 2 * math.pi * np.outer(t, freqs)
+    s = np.sin(phase).T @ x
+    c = np.cos(phase).T @ x
+    return 2 * np.hypot(s, c) / len(t)
+
+def extract_features(loop):
+    """Per-motor features from an excitation run"""
+    n = loop.count
+    t = loop.t[:n]
+    position = loop.state[:n, :, 0].astype(float)
+    load = loop.state[:n, :, 2].astype(float)
+    position_amp = lock_in(t, position, loop.freqs)
+    load_amp = lock_in(t, load, loop.freqs)
+
+    gravity = np.abs(load.mean(axis=0))
+    coupling = load_amp.copy()                       # coupling[a, b]: load on b at a's frequency
+    np.fill_diagonal(coupling, 0.0)
+    return {
+        'tracking': np.diag(position_amp) / loop.amplitude,
+        'gravity': gravity / gravity.max() if gravity.max() >= MIN_GRAVITY_LOAD else None,
+        'coupling': coupling / coupling.max() if coupling.max() >= MIN_COUPLING_LOAD else None,
+        'raw_gravity': gravity,
+        'samples': n,
+    }
+
+def score_assignment(joint_of, features, spans=None, default_joint=None):
+    """Cost of assigning joint_of[m] to motor index m (lower is better)"""
+    chain = {name: i for i, name in enumerate(JOINT_NAMES)}
+    cost = 0.0
+    for m, joint in enumerate(joint_of):
+        profile = JOINT_PROFILES[joint]
+        if features['gravity'] is not None:
+            cost += WEIGHTS['gravity'] * (features['gravity'][m] - profile['gravity']) ** 2
+        if spans is not None and spans[m]:
+            cost += WEIGHTS['span'] * math.log(spans[m] / profile['span']) ** 2
+        if default_joint is not None and default_joint[m] != joint:
+            cost += WEIGHTS['prior']
+    # Moving a joint shows up in the load of the joints that carry it (upstream), not downstream
+    coupling = features['coupling']
+    if coupling is None:
+        return cost
+    for a, b in itertools.permutations(range(len(joint_of)), 2):
+        if chain[joint_of[b]] > chain[joint_of[a]]:
+            cost += WEIGHTS['coupling'] * coupling[a, b]
+    return cost
+
+def infer_mapping(ids, features, spans=None):
+    """
+    Best joint -> motor ID map over every permutation.
+
+    Returns (mapping, margin): margin is the cost gap to the runner-up
+    assignment, so a small margin means the features could not tell two
+    joints apart.
+    """
+    default_joint = [next((j for j, i in DEFAULT_MOTOR_IDS.items() if i == id_), None) for id_ in ids]
+    span_list = [spans.get(id_) for id_ in ids] if spans else None
+    scored = sorted(
+        (score_assignment(perm, features, span_list, default_joint), perm)
+        for perm in itertools.permutations(JOINT_NAMES[:len(ids)])
+    )
+    best_cost, best = scored[0]
+    margin = scored[1][0] - best_cost if len(scored) > 1 else math.inf
+    return {joint: id_ for joint, id_ in zip(best, ids)}, margin
+
+def calibration_spans(path):
+    """{motor_id: range_max - range_min} from a calibration file, keyed by ID not by name"""
+    return {cal['id']: cal['range_max'] - cal['range_min'] for cal in load_calibration(path).values()}
+
+def identify(bus, ids, spans=None, amplitude=EXCITATION_AMPLITUDE, seconds=EXCITATION_SECONDS):
+    """Excite the motors on a connected bus and infer the map; returns (mapping, margin, features)"""
+    labels = [f"motor_{id_}" for id_ in ids]
+    joints = JointBus(bus, labels, ids=ids)
+    torque = {name: bus.read('Torque_Enable', name, normalize=False) for name in bus.motors}
+    bus.enable_torque()
+    try:
+        loop = ExcitationLoop(joints, amplitude, seconds)
+        loop.run()
+    finally:
+        for name, enabled in torque.items():
+            if not enabled:
+                bus.write('Torque_Enable', name, 0, normalize=False)
+    features = extract_features(loop)
+    mapping, margin = infer_mapping(ids, features, spans)
+    return mapping, margin, features
+
+def main():
+    parser = argparse.ArgumentParser(description='Identify which motor ID drives which SO-101 joint automatically')
+    parser.add_argument('--port', required=True, help='Arm port, e.g. COM4 or /dev/ttyACM0')
+    parser.add_argument('--arm', choices=('leader', 'follower'), default='follower', help='Arm type (default: follower)')
+    parser.add_argument('--calibration', help='Calibration JSON for range spans (default: calibration/<arm>/<arm>_arm.json)')
+    parser.add_argument('--amplitude', type=int, default=EXCITATION_AMPLITUDE,
+                       help=f'Excitation amplitude in ticks (default: {EXCITATION_AMPLITUDE})')
+    parser.add_argument('--seconds', type=float, default=EXCITATION_SECONDS,
+                       help=f'Excitation length (default: {EXCITATION_SECONDS})')
+    parser.add_argument('--min-margin', type=float, default=0.15,
+                       help='Refuse to write a map closer than this to the runner-up (default: 0.15)')
+    parser.add_argument('--write', action='store_true', help='Save the map into the joint mapping file')
+    parser.add_argument('--mapping', default=str(DEFAULT_MAPPING_PATH),
+                       help='Joint mapping file for --write (default: config/joint_mapping.json)')
+
+    args = parser.parse_args()
+
+    from lerobot.motors.feetech import FeetechMotorsBus
+    from so101_bus import make_motors
+
+    calibration = Path(args.calibration) if args.calibration else default_calibration_path(args.arm, f"{args.arm}_arm")
+    spans = calibration_spans(calibration) if calibration.exists() else None
+
+    print("🔎 SO-101 Automatic Motor Identification")
+    print("=" * 60)
+    print(f"Port: {args.port} ({args.arm} arm)")
+    print(f"Range spans: {calibration if spans else 'none (no calibration file)'}")
+    print(f"⚠️  Every motor will oscillate by ±{args.amplitude} ticks for {args.seconds:g} s")
+    print("=" * 60)
+
+    bus = FeetechMotorsBus(args.port, make_motors())
+    bus.connect()
+    try:
+        start = time.perf_counter()
+        ids = [motor.id for motor in bus.motors.values()]
+        mapping, margin, features = identify(bus, ids, spans, args.amplitude, args.seconds)
+        elapsed = time.perf_counter() - start
+    finally:
+        bus.disconnect(disable_torque=False)
+
+    print(f"\n{'motor':>6} {'tracking':>9} {'load':>6} {'span':>6}  joint")
+    joint_of = {id_: joint for joint, id_ in mapping.items()}
+    for m, id_ in enumerate(ids):
+        flag = '' if features['tracking'][m] >= MIN_TRACKING else '  ⚠️ not moving'
+        span = spans.get(id_, 0) if spans else 0
+        print(f"{id_:>6} {features['tracking'][m]:>9.2f} {features['raw_gravity'][m]:>6.0f} {span:>6}  "
+              f"{joint_of[id_]}{flag}")
+
+    swapped = [joint for joint, id_ in mapping.items() if DEFAULT_MOTOR_IDS[joint] != id_]
+    unused = [name for name in ('gravity', 'coupling') if features[name] is None]
+    print(f"\nDone in {elapsed:.1f} s ({features['samples']} samples), confidence margin {margin:.3f}")
+    if unused:
+        print(f"Too little load signal for: {', '.join(unused)}")
+    print("✅ Wiring matches the default layout" if not swapped else f"⚠️  Non-default wiring: {', '.join(swapped)}")
+    print(f"Motor map: {mapping}")
+
+    if args.write:
+        if margin < args.min_margin:
+            print(f"❌ Margin below {args.min_margin}: not writing, confirm with identify_motors.py")
+            return
+        save_arm_mapping(args.arm, mapping, args.mapping)
+        print(f"📝 {args.arm} map written to {args.mapping}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Calibration Benchmark
+Per-tick cost of raw <-> normalized conversion: per-joint loop vs compiled tables
+
+After the timings every compiled path is checked against the per-joint
+reference (lerobot's math) on random leader positions: the share of
+vectors with a goal off by a tick and the largest difference. Exact paths
+must agree on every vector and the others stay within one tick, otherwise
+the exit code is 1.
+"""
+
+import argparse
+import sys
+import timeit
+
+import numpy as np
+
+from calibration_tables import (
+    DEFAULT_NORM_MODES,
+    CompiledCalibration,
+    default_calibration_path,
+    load_calibration_json,
+    normalize_reference,
+    unnormalize_reference,
+)
+from joint_mapping import JointMapping
+from so101_bus import JOINT_NAMES
+
+def _lerobot_tick(leader_cal, follower_cal, raw_dict):
+    """MotorsBus._normalize/_unnormalize round trip (what lerobot does per tick), if lerobot is installed"""
+    try:
+        from lerobot.motors import MotorCalibration
+        from lerobot.motors.feetech import FeetechMotorsBus
+        from so101_bus import make_motors
+    except ImportError:
+        return None
+
+    # Buses are never connected: only the calibration math is exercised
+    leader = FeetechMotorsBus('unused', make_motors(),
+                              {n: MotorCalibration(**c) for n, c in leader_cal.items()})
+    follower = FeetechMotorsBus('unused', make_motors(),
+                                {n: MotorCalibration(**c) for n, c in follower_cal.items()})
+    ids_values = {leader.motors[name].id: value for name, value in raw_dict.items()}
+
+    def tick():
+        follower._unnormalize(leader._normalize(ids_values))
+
+    return tick
+
+def run_benchmark(leader_path, follower_path, number=20000):
+    """Time one leader normalize + follower unnormalize tick for each method; returns {method: us/tick}"""
+    leader_cal = load_calibration_json(leader_path)
+    follower_cal = load_calibration_json(follower_path)
+    leader = CompiledCalibration(leader_cal)
+    follower = CompiledCalibration(follower_cal)
+    leader.lut  # build the table outside the timed region
+
+    raw = np.array([(leader_cal[n]['range_min'] + leader_cal[n]['range_max']) // 2 for n in JOINT_NAMES],
+                   dtype=np.int32)
+    raw_dict = dict(zip(JOINT_NAMES, raw.tolist()))
+    normalized = np.empty(len(JOINT_NAMES))
+    goals = np.empty(len(JOINT_NAMES), dtype=np.int32)
+
+    def per_joint_loop():
+        norm = normalize_reference(leader_cal, DEFAULT_NORM_MODES, raw_dict)
+        unnormalize_reference(follower_cal, DEFAULT_NORM_MODES, norm)
+
+    methods = [('per-joint loop', per_joint_loop)]
+
+    lerobot_tick = _lerobot_tick(leader_cal, follower_cal, raw_dict)
+    if lerobot_tick is not None:
+        methods.insert(0, ('lerobot MotorsBus', lerobot_tick))
+
+    def compiled_affine():
+        follower.to_raw(leader.to_normalized(raw, normalized), goals)
+
+    def compiled_lut():
+        follower.to_raw(leader.lookup(raw, normalized), goals)
+
+    mapping = JointMapping(leader_cal, follower_cal)
+
+    def fused_mapping():
+        mapping.apply(raw, goals)
+
+    methods += [('compiled affine', compiled_affine), ('compiled lookup table', compiled_lut),
+                ('fused joint mapping', fused_mapping)]
+
+    results = {}
+    for name, fn in methods:
+        best = min(timeit.repeat(fn, number=number, repeat=5))
+        results[name] = best / number * 1e6
+    return results
+
+# Paths that must reproduce lerobot's goals exactly; the rest may be one tick off
+EXACT_METHODS = ('compiled exact', 'fused joint mapping')
+
+def check_agreement(leader_path, follower_path, samples=2000, seed=0):
+    """{method: (share of vectors differing from the reference, largest difference in ticks)}"""
+    leader_cal = load_calibration_json(leader_path)
+    follower_cal = load_calibration_json(follower_path)
+    leader = CompiledCalibration(leader_cal)
+    follower = CompiledCalibration(follower_cal)
+    methods = {
+        'compiled affine': lambda raw: follower.to_raw(leader.to_normalized(raw)),
+        'compiled lookup table': lambda raw: follower.to_raw(leader.lookup(raw)),
+        'compiled exact': lambda raw: follower.to_raw_exact(leader.to_normalized_exact(raw)),
+    }
+    mapping = JointMapping(leader_cal, follower_cal)
+    methods['fused joint mapping'] = mapping.apply
+    methods['fused affine (float)'] = lambda raw: mapping.apply_float(raw.astype(np.float64))
+    mismatches = dict.fromkeys(methods, 0)
+    max_diff = dict.fromkeys(methods, 0)
+    rng = np.random.default_rng(seed)
+    for raw in rng.integers(0, 4096, (samples, len(JOINT_NAMES)), dtype=np.int32):
+        norm = normalize_reference(leader_cal, DEFAULT_NORM_MODES, dict(zip(JOINT_NAMES, raw.tolist())))
+        goal = unnormalize_reference(follower_cal, DEFAULT_NORM_MODES, norm)
+        expected = np.array([goal[name] for name in JOINT_NAMES])
+        for name, fn in methods.items():
+            diff = int(np.abs(fn(raw) - expected).max())
+            mismatches[name] += diff > 0
+            max_diff[name] = max(max_diff[name], diff)
+    return {name: (mismatches[name] / samples, max_diff[name]) for name in methods}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark calibration conversion cost per teleop tick')
+    parser.add_argument('--leader', default=str(default_calibration_path('leader', 'leader_arm')),
+                       help='Leader calibration JSON')
+    parser.add_argument('--follower', default=str(default_calibration_path('follower', 'follower_arm')),
+                       help='Follower calibration JSON')
+    parser.add_argument('--number', type=int, default=20000, help='Ticks per timing run')
+
+    args = parser.parse_args()
+
+    print("⏱️  Calibration conversion benchmark (leader normalize + follower unnormalize, 6 joints)")
+    print("=" * 60)
+    results = run_benchmark(args.leader, args.follower, args.number)
+    baseline = next(iter(results.values()))
+    for name, us in results.items():
+        print(f"{name:<24} {us:8.2f} us/tick   x{baseline / us:5.2f}")
+
+    print("-" * 60)
+    print("Agreement with lerobot's per-joint math (random leader positions):")
+    failed = False
+    for name, (share, diff) in check_agreement(args.leader, args.follower).items():
+        ok = diff == 0 if name in EXACT_METHODS else diff <= 1
+        failed |= not ok
+        print(f"{name:<24} {share * 100:6.2f} % of vectors off, max {diff} tick(s)  {'✅' if ok else '❌'}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
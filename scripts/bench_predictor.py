@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Leader Predictor Benchmark
+Replay recorded leader trajectories through LeaderPredictor settings and score lag, noise and cost
+
+For every leader sample the predictor output is compared with where the
+leader actually was one latency later (interpolated from the recording):
+that error is what the follower's goal is off by once it gets there.
+Roughness is the RMS second difference of the output, the tick-level
+jitter the follower would be asked to track. Without a recording, a
+synthetic trajectory (smooth motion plus sensor noise) is used.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from leader_predictor import DEFAULT_BETA, DEFAULT_MIN_CUTOFF, LeaderPredictor
+from so101_bus import JOINT_NAMES
+from trajectory_recorder import TrajectoryReader
+
+# Read -> write -> servo chain measured on the real arms (~17 ms, see config/motor_config.txt)
+DEFAULT_LEAD_MS = 17.0
+
+SYNTHETIC_SECONDS = 30.0
+SYNTHETIC_RATE_HZ = 100.0
+SYNTHETIC_NOISE_TICKS = 1.5
+
+def synthetic_trajectory(seconds=SYNTHETIC_SECONDS, rate_hz=SYNTHETIC_RATE_HZ, noise=SYNTHETIC_NOISE_TICKS, seed=0):
+    """(t, noisy raw ticks) of slow multi-sine joint motion sampled with loop jitter"""
+    rng = np.random.default_rng(seed)
+    n = int(seconds * rate_hz)
+    t = np.arange(n) / rate_hz + rng.normal(0, 0.0003, n)
+    t.sort()
+    amplitude = rng.uniform(200, 800, (2, len(JOINT_NAMES)))
+    freq = rng.uniform(0.1, 1.2, (2, len(JOINT_NAMES)))
+    phase = rng.uniform(0, 2 * np.pi, (2, len(JOINT_NAMES)))
+    clean = 2048 + sum(amplitude[k] * np.sin(2 * np.pi * freq[k] * t[:, None] + phase[k]) for k in range(2))
+    return t, np.rint(clean + rng.normal(0, noise, clean.shape)).astype(np.int32)
+
+def load_trajectory(path):
+    records = TrajectoryReader(path).ordered()
+    if len(records) < 10:
+        raise ValueError(f"{path} holds only {len(records)} ticks")
+    return records['t'].astype(np.float64), records['leader_pos'].astype(np.int32)
+
+def evaluate(t, raw, lead_s, predictor=None):
+    """RMS error vs the leader lead_s later, RMS roughness and us per update, averaged over joints"""
+    out = np.empty(raw.shape)
+    start = time.perf_counter()
+    if predictor is None:
+        out[:] = raw
+    else:
+        for i in range(len(t)):
+            predictor.update(raw[i], t[i], out[i])
+    cost = (time.perf_counter() - start) / len(t) * 1e6 if predictor is not None else 0.0
+    # Truth is only known inside the recording
+    valid = t + lead_s <= t[-1]
+    future = np.column_stack([np.interp(t[valid] + lead_s, t, raw[:, j]) for j in range(raw.shape[1])])
+    # Skip the filter's settling ticks
+    skip = min(20, len(future) // 4)
+    error = (out[valid] - future)[skip:]
+    roughness = np.diff(out[skip:], n=2, axis=0)
+    return {
+        'rms_error': float(np.sqrt((error ** 2).mean())),
+        'max_error': float(np.abs(error).max()),
+        'roughness': float(np.sqrt((roughness ** 2).mean())),
+        'us_per_tick': cost,
+    }
+
+def run_benchmark(t, raw, lead_ms=DEFAULT_LEAD_MS, min_cutoff=DEFAULT_MIN_CUTOFF, beta=DEFAULT_BETA):
+    """{setting: metrics} for raw passthrough, filter only and both extrapolation models"""
+    lead_s = lead_ms / 1000
+    n = raw.shape[1]
+    settings = {
+        'raw (no predictor)': None,
+        'One-Euro only': LeaderPredictor(n, min_cutoff, beta, mode='none'),
+        'One-Euro + velocity': LeaderPredictor(n, min_cutoff, beta, mode='velocity', lead_s=lead_s),
+        'One-Euro + acceleration': LeaderPredictor(n, min_cutoff, beta, mode='acceleration', lead_s=lead_s),
+    }
+    return {name: evaluate(t, raw, lead_s, predictor) for name, predictor in settings.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark leader filtering/extrapolation on recorded trajectories')
+    parser.add_argument('paths', nargs='*', help='Trajectory files (.trj) from run_teleop.py --record')
+    parser.add_argument('--lead-ms', type=float, default=DEFAULT_LEAD_MS,
+                       help=f'Latency to compensate (default: {DEFAULT_LEAD_MS:g})')
+    parser.add_argument('--min-cutoff', type=float, default=DEFAULT_MIN_CUTOFF,
+                       help=f'One-Euro cutoff at rest in Hz (default: {DEFAULT_MIN_CUTOFF:g})')
+    parser.add_argument('--beta', type=float, default=DEFAULT_BETA,
+                       help=f'One-Euro speed coefficient (default: {DEFAULT_BETA:g})')
+
+    args = parser.parse_args()
+
+    sources = [(path, *load_trajectory(path)) for path in args.paths]
+    if not sources:
+        sources = [('synthetic', *synthetic_trajectory())]
+
+    print(f"⏱️  Leader predictor benchmark ({args.lead_ms:g} ms latency, "
+          f"min cutoff {args.min_cutoff:g} Hz, beta {args.beta:g})")
+    for name, t, raw in sources:
+        print("=" * 78)
+        print(f"{name}: {len(t)} ticks over {t[-1] - t[0]:.1f} s")
+        print(f"{'setting':<26} {'rms err':>9} {'max err':>9} {'roughness':>10} {'cost':>11}")
+        for setting, r in run_benchmark(t, raw, args.lead_ms, args.min_cutoff, args.beta).items():
+            print(f"{setting:<26} {r['rms_error']:>7.1f} t {r['max_error']:>7.0f} t {r['roughness']:>8.2f} t "
+                  f"{r['us_per_tick']:>7.1f} us")
+    print("(t = raw ticks, 4096 per turn; error is against the leader one latency later)")
+
+if __name__ == "__main__":
+    main()
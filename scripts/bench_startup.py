@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Startup Benchmark
+Wall time from launching a so101 subcommand to its first serial access, plus the slowest imports
+
+Each subcommand is started in a fresh interpreter against a port that does
+not exist, so the run covers interpreter start, argument parsing and every
+import up to opening the port, without needing hardware.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SO101 = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'so101.py')
+
+# Serial-only subcommands and the budget they must start within
+SERIAL_COMMANDS = {
+    'ping': ['ping', '--ids', '1'],
+    'torque': ['torque', 'off', '--ids', '1'],
+    'scan': ['scan'],
+}
+STARTUP_BUDGET_MS = 200.0
+
+# What the old per-utility scripts paid before touching the bus
+HEAVY_IMPORTS = {
+    'lerobot.motors.feetech': 'import lerobot.motors.feetech',
+    'numpy': 'import numpy',
+}
+
+def time_launch(cmd, runs):
+    """Wall times in ms of `runs` fresh launches of cmd"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def slowest_imports(cmd, top):
+    """[(cumulative ms, module)] of the top-level imports from python -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *cmd[1:]], capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level imports only: nested ones are indented under their parent
+        if not name.startswith('  ', 1):
+            rows.append((int(cumulative) / 1000, name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark so101 CLI startup time')
+    parser.add_argument('--runs', type=int, default=10, help='Launches per command (default: 10)')
+    parser.add_argument('--port', default='COM99' if os.name == 'nt' else '/dev/so101-bench-missing',
+                       help='A port that does not exist, so no hardware is touched')
+    parser.add_argument('--top', type=int, default=5, help='Slowest imports listed per command (default: 5)')
+
+    args = parser.parse_args()
+
+    print("⏱️  SO-101 CLI Startup Benchmark")
+    print("=" * 60)
+    baseline = time_launch([sys.executable, '-c', 'pass'], args.runs)
+    print(f"{'bare interpreter':<28} median {statistics.median(baseline):7.1f} ms")
+
+    over = []
+    for name, sub in SERIAL_COMMANDS.items():
+        cmd = [sys.executable, SO101, *sub]
+        cmd += [args.port] if name == 'scan' else ['--port', args.port]
+        times = time_launch(cmd, args.runs)
+        median = statistics.median(times)
+        flag = '✅' if median < STARTUP_BUDGET_MS else '❌'
+        print(f"{'so101 ' + name:<28} median {median:7.1f} ms  min {min(times):7.1f} ms  {flag}")
+        if median >= STARTUP_BUDGET_MS:
+            over.append(name)
+        for ms, module in slowest_imports(cmd, args.top):
+            print(f"    {module:<32} {ms:7.1f} ms")
+
+    print("-" * 60)
+    for name, code in HEAVY_IMPORTS.items():
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True)
+        if result.returncode:
+            print(f"{'import ' + name:<28} not installed")
+            continue
+        times = time_launch([sys.executable, '-c', code], max(args.runs // 2, 1))
+        print(f"{'import ' + name:<28} median {statistics.median(times):7.1f} ms")
+
+    print("=" * 60)
+    if over:
+        print(f"❌ Over the {STARTUP_BUDGET_MS:.0f} ms budget: {', '.join(over)}")
+        sys.exit(1)
+    print(f"✅ Every serial-only subcommand starts within {STARTUP_BUDGET_MS:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Hot-Path Benchmark Suite
+Hardware-free timings of every per-tick code path, saved as a baseline and compared against it
+
+Covers calibration normalize/unnormalize of the 6-joint vectors, Feetech
+packet encoding, checksums and reply parsing, the fused leader -> follower
+mapping, the leader predictor and a full teleop tick against a simulated
+bus (Linux only, sim_bus.py in a child process). --save writes the
+results to config/bench_baseline.json; --compare re-runs the suite and
+flags every benchmark slower than the baseline by more than its threshold
+(exit code 1), so a change to the control path can be checked in one run.
+
+Each micro benchmark is warmed up once, then timed as the best of
+`repeat` runs of a fixed number of calls; that is done for several
+rounds, interleaving the benchmarks, and the median of the per-round
+bests is reported. A burst of background load then costs one round of
+every benchmark rather than the whole result of one. Baselines only
+compare on the machine that recorded them: the committed one comes from
+a 1-CPU CI container, so record your own with --save before comparing.
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+from calibration_tables import CompiledCalibration, default_calibration_path, load_calibration_json
+from feetech_protocol import (
+    CONTROL_TABLE,
+    PacketParser,
+    checksum,
+    encode_status,
+    encode_sync_read,
+    encode_sync_write,
+    to_bytes,
+)
+from joint_mapping import JointMapping
+from leader_predictor import LeaderPredictor
+from so101_bus import JOINT_NAMES
+
+BASELINE_PATH = Path(__file__).resolve().parent.parent / "config" / "bench_baseline.json"
+SIM_BUS = Path(__file__).resolve().parent / "sim_bus.py"
+
+# A benchmark slower than its baseline by more than this fraction is a regression
+DEFAULT_THRESHOLD = 0.30
+
+# Sub-microsecond calls are dominated by interpreter and timer overhead, which moves more between runs
+THRESHOLDS = {
+    'protocol.checksum': 0.50,
+}
+
+# Timings on a simulated bus depend on the OS scheduler and the sim process: reported, never counted as regressions
+NOT_GATED = ('teleop.tick_sim_p50', 'teleop.tick_sim_p99')
+
+DEFAULT_NUMBER = 5000
+DEFAULT_REPEAT = 7
+DEFAULT_ROUNDS = 5
+DEFAULT_TICKS = 500
+
+IDS = list(range(1, len(JOINT_NAMES) + 1))
+
+def _micro_benchmarks(leader_cal, follower_cal):
+    """[(name, fn)] of the pure-CPU per-tick operations"""
+    leader = CompiledCalibration(leader_cal)
+    follower = CompiledCalibration(follower_cal)
+    leader.lut  # build the table outside the timed region
+    mapping = JointMapping(leader_cal, follower_cal)
+    predictor = LeaderPredictor(len(JOINT_NAMES), lead_s=0.017)
+
+    raw = np.array([(leader_cal[n]['range_min'] + leader_cal[n]['range_max']) // 2 for n in JOINT_NAMES],
+                   dtype=np.int32)
+    normalized = leader.to_normalized(raw)
+    goals = np.empty(len(JOINT_NAMES), dtype=np.int32)
+    predicted = np.empty(len(JOINT_NAMES))
+
+    addr, length = CONTROL_TABLE['Present_Position']
+    goal_addr, goal_length = CONTROL_TABLE['Goal_Position']
+    goal_bytes = {id_: to_bytes(2048, goal_length) for id_ in IDS}
+    read_packet = encode_sync_read(addr, length, IDS)
+    body = read_packet[2:-1]
+    replies = b''.join(encode_status(id_, 0, to_bytes(2048, length)) for id_ in IDS)
+    parser = PacketParser()
+
+    # The predictor is fed a clock that advances one 100 Hz tick per call
+    clock = [0.0]
+
+    def predictor_update():
+        clock[0] += 0.01
+        predictor.update(raw, clock[0], predicted)
+
+    return [
+        ('calibration.normalize', lambda: leader.to_normalized(raw, normalized)),
+        ('calibration.normalize_lut', lambda: leader.lookup(raw, normalized)),
+        ('calibration.unnormalize', lambda: follower.to_raw(normalized, goals)),
+        ('protocol.checksum', lambda: checksum(body)),
+        ('protocol.encode_sync_read', lambda: encode_sync_read(addr, length, IDS)),
+        ('protocol.encode_sync_write', lambda: encode_sync_write(goal_addr, goal_length, goal_bytes)),
+        ('protocol.parse_replies', lambda: parser.feed(replies)),
+        ('mapping.apply', lambda: mapping.apply(raw, goals)),
+        ('mapping.apply_float', lambda: mapping.apply_float(normalized, goals)),
+        ('predictor.update', predictor_update),
+    ]
+
+def run_micro(leader_cal, follower_cal, number=DEFAULT_NUMBER, repeat=DEFAULT_REPEAT, rounds=DEFAULT_ROUNDS,
+              pattern='*'):
+    """{name: us per call}: median over `rounds` of the best of `repeat` runs of `number` calls"""
+    benchmarks = [(name, fn) for name, fn in _micro_benchmarks(leader_cal, follower_cal)
+                  if fnmatch.fnmatch(name, pattern)]
+    for _, fn in benchmarks:
+        # Warm-up: lazily built buffers, caches and the first-call paths are not what the tick pays
+        timeit.timeit(fn, number=number)
+    bests = {name: [] for name, _ in benchmarks}
+    for _ in range(rounds):
+        for name, fn in benchmarks:
+            bests[name].append(min(timeit.repeat(fn, number=number, repeat=repeat)) / number * 1e6)
+    return {name: statistics.median(values) for name, values in bests.items()}
+
+def _start_sim(link):
+    """sim_bus.py in a child process (its reply timing must not share our interpreter); waits for the pty"""
+    proc = subprocess.Popen([sys.executable, str(SIM_BUS), '--link', link],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + 5.0
+    while not os.path.islink(link):
+        if proc.poll() is not None or time.perf_counter() > deadline:
+            proc.kill()
+            raise ConnectionError("Simulated bus did not start")
+        time.sleep(0.01)
+    return proc
+
+def _stop_sim(proc):
+    proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+def run_teleop_tick(leader_cal, follower_cal, ticks=DEFAULT_TICKS):
+    """Median and p99 us of one TeleopEngine.tick() (leader sync read, map, follower sync write) on simulated buses"""
+    from feetech_serial import FeetechSerial
+    from so101_bus import PacketJointBus
+    from teleop_engine import TeleopEngine
+
+    with tempfile.TemporaryDirectory() as tmp:
+        links = [os.path.join(tmp, 'leader'), os.path.join(tmp, 'follower')]
+        procs = []
+        try:
+            for link in links:
+                procs.append(_start_sim(link))
+            with FeetechSerial(links[0]) as leader, FeetechSerial(links[1]) as follower:
+                mapping = JointMapping(leader_cal, follower_cal)
+                engine = TeleopEngine(None, None, mapping=mapping,
+                                      leader_joints=PacketJointBus(leader, ids=mapping.leader_ids),
+                                      follower_joints=PacketJointBus(follower, ids=mapping.follower_ids))
+                for _ in range(20):
+                    engine.tick()
+                times = []
+                for _ in range(ticks):
+                    start = time.perf_counter()
+                    engine.tick()
+                    times.append(time.perf_counter() - start)
+        finally:
+            for proc in procs:
+                _stop_sim(proc)
+    times.sort()
+    return {
+        'teleop.tick_sim_p50': statistics.median(times) * 1e6,
+        'teleop.tick_sim_p99': times[min(len(times) - 1, int(len(times) * 0.99))] * 1e6,
+    }
+
+def run_suite(leader_path, follower_path, number=DEFAULT_NUMBER, repeat=DEFAULT_REPEAT, ticks=DEFAULT_TICKS,
+              pattern='*', rounds=DEFAULT_ROUNDS):
+    """{name: us} for every selected benchmark"""
+    leader_cal = load_calibration_json(leader_path)
+    follower_cal = load_calibration_json(follower_path)
+    results = run_micro(leader_cal, follower_cal, number, repeat, rounds, pattern)
+    if ticks and fnmatch.fnmatch('teleop.tick_sim_p50', pattern):
+        if hasattr(os, 'openpty'):
+            results.update(run_teleop_tick(leader_cal, follower_cal, ticks))
+        else:
+            print("⚠️  Skipping the simulated-bus teleop tick (needs a pseudo-terminal, Linux/macOS only)")
+    return results
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+def save_baseline(path, results, note=None):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {'unit': 'us', 'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'machine': machine_info(),
+                'results': results}
+    if note:
+        baseline['note'] = note
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+def threshold_for(name, default=DEFAULT_THRESHOLD):
+    return max(default, THRESHOLDS.get(name, default))
+
+def compare(results, baseline):
+    """[(name, baseline us, current us, change)] per benchmark; change is the relative slowdown"""
+    rows = []
+    for name, current in results.items():
+        before = baseline['results'].get(name)
+        rows.append((name, before, current, (current - before) / before if before else None))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Hardware-free benchmarks of the teleop hot path')
+    parser.add_argument('--save', nargs='?', const=str(BASELINE_PATH), metavar='PATH',
+                       help='Write the results as the new baseline (default: config/bench_baseline.json)')
+    parser.add_argument('--compare', nargs='?', const=str(BASELINE_PATH), metavar='PATH',
+                       help='Compare against a baseline and exit 1 on regressions (default: config/bench_baseline.json)')
+    parser.add_argument('--note', help='Free text stored with --save (e.g. which machine recorded it)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help=f'Relative slowdown counted as a regression; noisier benchmarks keep their higher '
+                            f'own threshold (default: {DEFAULT_THRESHOLD:g})')
+    parser.add_argument('--only', default='*', help="Run the benchmarks matching this pattern (e.g. 'protocol.*')")
+    parser.add_argument('--number', type=int, default=DEFAULT_NUMBER,
+                       help=f'Calls per timing run (default: {DEFAULT_NUMBER})')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                       help=f'Timing runs per round, the best counts (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS,
+                       help=f'Rounds over all benchmarks, the median counts (default: {DEFAULT_ROUNDS})')
+    parser.add_argument('--ticks', type=int, default=DEFAULT_TICKS,
+                       help='Simulated-bus teleop ticks, 0 to skip (default: 500)')
+    parser.add_argument('--leader', default=str(default_calibration_path('leader', 'leader_arm')),
+                       help='Leader calibration JSON')
+    parser.add_argument('--follower', default=str(default_calibration_path('follower', 'follower_arm')),
+                       help='Follower calibration JSON')
+
+    args = parser.parse_args()
+
+    print("⏱️  SO-101 hot-path benchmark suite")
+    print("=" * 60)
+    results = run_suite(args.leader, args.follower, args.number, args.repeat, args.ticks, args.only, args.rounds)
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        recorded = baseline.get('machine', {})
+        here = machine_info()
+        if (recorded.get('platform'), recorded.get('cpus')) != (here['platform'], here['cpus']):
+            print(f"⚠️  Baseline was recorded on {recorded.get('platform', 'another machine')} "
+                  f"({recorded.get('cpus', '?')} CPUs); record one here with --save for a meaningful comparison")
+        if baseline.get('note'):
+            print(f"Baseline note: {baseline['note']}")
+        regressions = 0
+        for name, before, current, change in compare(results, baseline):
+            if change is None:
+                print(f"{name:<28} {current:10.2f} us   (not in baseline)")
+                continue
+            flag = ''
+            threshold = threshold_for(name, args.threshold)
+            if name in NOT_GATED:
+                flag = '  (not gated)'
+            elif change > threshold:
+                flag = '  ❌ REGRESSION'
+                regressions += 1
+            elif change < -threshold:
+                flag = '  ✅ faster'
+            print(f"{name:<28} {current:10.2f} us   baseline {before:10.2f} us  {change * 100:+6.1f} %{flag}")
+        print("=" * 60)
+        if regressions:
+            print(f"❌ {regressions} benchmark(s) slower than baseline beyond their threshold "
+                  f"({args.threshold * 100:.0f} % unless noted in THRESHOLDS)")
+        else:
+            print(f"✅ No regression beyond {args.threshold * 100:.0f} % (or a benchmark's own threshold)")
+    else:
+        for name, us in results.items():
+            print(f"{name:<28} {us:10.2f} us")
+
+    if args.save:
+        if args.only != '*' and os.path.exists(args.save):
+            # A partial run only replaces the benchmarks it ran
+            results = {**load_baseline(args.save)['results'], **results}
+        save_baseline(args.save, results, args.note)
+        print(f"Baseline written to {args.save}")
+    if args.compare and regressions:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Bus Daemon
+Keep the arm serial ports open in one process and share them with any number of clients
+
+The daemon opens every configured port once, checks the motors once, and
+then forwards raw Feetech packets for clients connected over a Unix domain
+socket. Tools attach in milliseconds instead of reconnecting and
+re-handshaking, and they can share a bus with a running teleop loop:
+transactions on a bus run one at a time and waiting clients are served
+in priority order, so the control loop always goes first.
+
+Wire protocol (little endian, one request in flight per connection):
+
+    request   op u8, bus u8, n_ids u8, reply_params u8, timeout_ms u16, packet_len u16,
+              reply ids (n_ids bytes), Feetech instruction packet (packet_len bytes)
+    response  status u8, n_replies u8, payload_len u16, payload
+
+OP_TRANSACT payloads are n_replies x (id u8, error u8, n_params u8, params);
+OP_HELLO (bus = client priority) and OP_STATS answer with a JSON document.
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+
+from feetech_serial import DEFAULT_BAUDRATE, DEFAULT_SOCKET, REPLY_TIMEOUT_MS, FeetechRegisters, FeetechSerial
+
+REQUEST_HEADER = struct.Struct('<BBBBHH')
+RESPONSE_HEADER = struct.Struct('<BBH')
+REPLY_HEADER = struct.Struct('<BBB')
+
+OP_TRANSACT, OP_HELLO, OP_STATS = 1, 2, 3
+STATUS_OK, STATUS_BAD_REQUEST, STATUS_IO_ERROR = 0, 1, 2
+
+# Lower runs first when several clients wait for the same bus
+PRIORITY_CONTROL = 0
+PRIORITY_DIAGNOSTIC = 10
+
+DEFAULT_IDS = list(range(1, 7))
+
+# Pause before the first attempt to reopen a failed port, doubled after every failed attempt up to the cap
+RECONNECT_INTERVAL_S = 0.05
+RECONNECT_MAX_INTERVAL_S = 2.0
+
+def _recv_exact(sock, n):
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:])
+        if not k:
+            raise ConnectionError("Connection closed")
+        got += k
+    return bytes(buf)
+
+class BusArbiter:
+    """
+    Mutual exclusion for one bus where waiters are granted in (priority, arrival) order.
+
+    A plain lock wakes an arbitrary waiter; here a diagnostics client that
+    queued first still lets a control-priority request through ahead of it.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._busy = False
+        self._arrivals = itertools.count()
+
+    def acquire(self, priority):
+        """Block until this caller holds the bus; returns the seconds spent waiting"""
+        start = time.perf_counter()
+        with self._cond:
+            ticket = (priority, next(self._arrivals))
+            heapq.heappush(self._waiting, ticket)
+            while self._busy or self._waiting[0] != ticket:
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._busy = True
+        return time.perf_counter() - start
+
+    def release(self):
+        with self._cond:
+            self._busy = False
+            self._cond.notify_all()
+
+def _port_failed(error):
+    """The port itself failed (unplugged, USB reset), as opposed to a missing or bad reply"""
+    # so101_bus pulls in numpy; clients importing this module only need it on this path
+    from so101_bus import FAULT_PORT_LOST, classify_fault
+
+    return classify_fault(error) == FAULT_PORT_LOST
+
+class DaemonBus:
+    """
+    One arm port owned by the daemon, with its arbiter and counters.
+
+    When the port itself fails (unplugged, USB reset) it is closed and a
+    background thread reopens it with backoff, holding the bus for each
+    attempt, until every motor that answered at startup answers a ping
+    again. Requests meanwhile fail at once instead of queueing.
+    """
+
+    def __init__(self, name, port, baudrate=DEFAULT_BAUDRATE, timeout_ms=None, ids=DEFAULT_IDS, on_event=None):
+        self.name = name
+        self.port = port
+        self.ids = list(ids)
+        self.present = []
+        self.serial = FeetechSerial(port, baudrate, timeout_ms)
+        self.arbiter = BusArbiter()
+        self.on_event = on_event
+        self.up = True
+        self.transactions = 0
+        self.timeouts = 0
+        self.io_errors = 0
+        self.max_wait_ms = 0.0
+        self.busy_s = 0.0
+        self.reconnects = 0
+        self.reconnect_attempts = 0
+        self.downtime_s = 0.0
+        self._lost_at = None
+        self._stop = threading.Event()
+        self._reconnect_thread = None
+
+    def open(self):
+        """Open the port and check the motors once; returns the IDs that did not answer"""
+        self.serial.open()
+        missing = [id_ for id_ in self.ids if self.serial.ping(id_) is None]
+        self.present = [id_ for id_ in self.ids if id_ not in missing]
+        return missing
+
+    def close(self):
+        self._stop.set()
+        if self._reconnect_thread is not None:
+            self._reconnect_thread.join(timeout=1.0)
+        self.serial.close()
+
+    def _event(self, message):
+        if self.on_event is not None:
+            self.on_event(message)
+
+    def transact(self, priority, packet, reply_ids, reply_params, timeout_ms=None):
+        """Run one transaction when the arbiter grants the bus; returns [(id, error, params)]"""
+        if not self.up:
+            raise ConnectionError(f"{self.port} is being reconnected")
+        wait = self.arbiter.acquire(priority)
+        start = time.perf_counter()
+        # Counters are only touched while holding the bus
+        try:
+            if not self.up:
+                raise ConnectionError(f"{self.port} is being reconnected")
+            replies = self.serial.transact(packet, reply_ids, reply_params, timeout_ms)
+            errors = self.serial.status_errors
+            self.transactions += 1
+            if len(replies) < len(reply_ids):
+                self.timeouts += 1
+            self.max_wait_ms = max(self.max_wait_ms, wait * 1000)
+            return [(id_, errors.pop(id_, 0), params) for id_, params in replies.items()]
+        except Exception as e:
+            self.io_errors += 1
+            if self.up and _port_failed(e):
+                self._lose(e)
+            raise
+        finally:
+            self.busy_s += time.perf_counter() - start
+            self.arbiter.release()
+
+    def _lose(self, error):
+        """Close the failed port and start reopening it; called while holding the bus"""
+        self.up = False
+        self._lost_at = time.perf_counter()
+        try:
+            self.serial.close()
+        except Exception:
+            pass
+        self._event(f"{self.name} port {self.port} failed: {error}; reconnecting")
+        self._reconnect_thread = threading.Thread(target=self._reconnect, name=f"reconnect-{self.name}",
+                                                  daemon=True)
+        self._reconnect_thread.start()
+
+    def _reconnect(self):
+        interval = RECONNECT_INTERVAL_S
+        while not self._stop.wait(interval):
+            self.arbiter.acquire(PRIORITY_CONTROL)
+            try:
+                self.reconnect_attempts += 1
+                try:
+                    self.serial.close()
+                except Exception:
+                    pass
+                self.serial.open()
+                if all(self.serial.ping(id_) is not None for id_ in self.present):
+                    outage = time.perf_counter() - self._lost_at
+                    self.downtime_s += outage
+                    self.reconnects += 1
+                    self.up = True
+                    self._event(f"{self.name} port {self.port} back after {outage * 1000:.0f} ms")
+                    return
+            except Exception:
+                pass
+            finally:
+                self.arbiter.release()
+            interval = min(interval * 2, RECONNECT_MAX_INTERVAL_S)
+
+    def info(self):
+        downtime = self.downtime_s + (time.perf_counter() - self._lost_at if not self.up else 0.0)
+        return {'name': self.name, 'port': self.port, 'ids': self.ids, 'up': self.up,
+                'reconnects': self.reconnects, 'downtime_s': round(downtime, 3)}
+
+    def stats(self):
+        return {**self.info(), 'transactions': self.transactions, 'timeouts': self.timeouts,
+                'io_errors': self.io_errors, 'reconnect_attempts': self.reconnect_attempts,
+                'max_wait_ms': round(self.max_wait_ms, 3), 'busy_s': round(self.busy_s, 3)}
+
+class _ClientHandler(socketserver.BaseRequestHandler):
+    """One connected client: requests are served in order on the client's own thread"""
+
+    def handle(self):
+        daemon = self.server.bus_daemon
+        sock = self.request
+        priority = PRIORITY_DIAGNOSTIC
+        daemon.client_connected()
+        try:
+            while True:
+                try:
+                    header = _recv_exact(sock, REQUEST_HEADER.size)
+                except ConnectionError:
+                    return
+                op, bus, n_ids, reply_params, timeout_ms, packet_len = REQUEST_HEADER.unpack(header)
+                body = _recv_exact(sock, n_ids + packet_len) if n_ids + packet_len else b''
+                if op == OP_TRANSACT:
+                    response = daemon.handle_transact(priority, bus, body[:n_ids], reply_params,
+                                                      timeout_ms or None, body[n_ids:])
+                elif op == OP_HELLO:
+                    priority = bus
+                    response = _json_response(daemon.hello())
+                elif op == OP_STATS:
+                    response = _json_response(daemon.stats())
+                else:
+                    response = _error_response(STATUS_BAD_REQUEST, f"Unknown op {op}")
+                sock.sendall(response)
+        finally:
+            daemon.client_disconnected()
+
+def _json_response(document):
+    payload = json.dumps(document).encode()
+    return RESPONSE_HEADER.pack(STATUS_OK, 0, len(payload)) + payload
+
+def _error_response(status, message):
+    payload = message.encode()[:0xFFFF]
+    return RESPONSE_HEADER.pack(status, 0, len(payload)) + payload
+
+if hasattr(socket, 'AF_UNIX'):
+    class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+class BusDaemon:
+    """
+    Own the arm ports and serve them on a Unix socket.
+
+    buses maps a bus name (e.g. 'leader') to its port. Clients address a
+    bus by its index in the HELLO reply. on_event(message) is told about
+    every port loss and reconnect.
+    """
+
+    def __init__(self, buses, socket_path=DEFAULT_SOCKET, baudrate=DEFAULT_BAUDRATE, timeout_ms=None,
+                 ids=DEFAULT_IDS, on_event=None):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ConnectionError("The bus daemon needs Unix domain sockets, which this platform lacks")
+        self.buses = [DaemonBus(name, port, baudrate, timeout_ms, ids, on_event) for name, port in buses.items()]
+        self.socket_path = socket_path
+        self.clients = 0
+        self.clients_total = 0
+        self.started = None
+        self.server = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        """Open every port; returns {bus name: [IDs that did not answer]}"""
+        _claim_socket(self.socket_path)
+        missing = {}
+        try:
+            for bus in self.buses:
+                missing[bus.name] = bus.open()
+        except Exception:
+            self.close()
+            raise
+        self.server = _Server(self.socket_path, _ClientHandler)
+        self.server.bus_daemon = self
+        self.started = time.time()
+        return missing
+
+    def serve_forever(self):
+        self.server.serve_forever(poll_interval=0.5)
+
+    def close(self):
+        if self.server is not None:
+            self.server.server_close()
+            self.server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        for bus in self.buses:
+            bus.close()
+
+    def client_connected(self):
+        with self._lock:
+            self.clients += 1
+            self.clients_total += 1
+
+    def client_disconnected(self):
+        with self._lock:
+            self.clients -= 1
+
+    def handle_transact(self, priority, bus_index, reply_ids, reply_params, timeout_ms, packet):
+        if bus_index >= len(self.buses):
+            return _error_response(STATUS_BAD_REQUEST, f"Unknown bus {bus_index}")
+        try:
+            replies = self.buses[bus_index].transact(priority, packet, reply_ids, reply_params, timeout_ms)
+        except Exception as e:
+            return _error_response(STATUS_IO_ERROR, str(e))
+        parts = [REPLY_HEADER.pack(id_, error, len(params)) + params for id_, error, params in replies]
+        payload = b''.join(parts)
+        return RESPONSE_HEADER.pack(STATUS_OK, len(replies), len(payload)) + payload
+
+    def hello(self):
+        return {'buses': [bus.info() for bus in self.buses], 'pid': os.getpid()}
+
+    def stats(self):
+        return {'uptime_s': round(time.time() - self.started, 1), 'clients': self.clients,
+                'clients_total': self.clients_total, 'buses': [bus.stats() for bus in self.buses]}
+
+def _claim_socket(path):
+    """Remove a stale socket file, refuse to start next to a live daemon"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise ConnectionError(f"A bus daemon is already serving {path}")
+
+class BusClient:
+    """
+    Connection to a running bus daemon.
+
+    bus(name) returns a RemoteBus with the same register methods as
+    feetech_serial.FeetechSerial; name may be a bus name or its port.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, priority=PRIORITY_DIAGNOSTIC):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ConnectionError("The bus daemon needs Unix domain sockets, which this platform lacks")
+        self.socket_path = socket_path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(socket_path)
+        except OSError as e:
+            self._sock.close()
+            raise ConnectionError(f"No bus daemon on {socket_path} ({e})") from e
+        self._lock = threading.Lock()
+        self.buses = self._request(OP_HELLO, priority)[1]['buses']
+
+    def close(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _request(self, op, bus=0, reply_ids=b'', reply_params=0, timeout_ms=0, packet=b''):
+        header = REQUEST_HEADER.pack(op, bus, len(reply_ids), reply_params, timeout_ms, len(packet))
+        with self._lock:
+            self._sock.sendall(header + bytes(reply_ids) + packet)
+            status, n_replies, payload_len = RESPONSE_HEADER.unpack(_recv_exact(self._sock, RESPONSE_HEADER.size))
+            payload = _recv_exact(self._sock, payload_len) if payload_len else b''
+        if status != STATUS_OK:
+            raise ConnectionError(f"Bus daemon: {payload.decode(errors='replace')}")
+        if op == OP_TRANSACT:
+            return n_replies, payload
+        return n_replies, json.loads(payload)
+
+    def transact(self, bus, packet, reply_ids=(), reply_params=0, timeout_ms=None):
+        """Forward one packet on bus index `bus`; returns ({id: params}, {id: error})"""
+        timeout = min(int(round(timeout_ms)), 0xFFFF) if timeout_ms else 0
+        n_replies, payload = self._request(OP_TRANSACT, bus, reply_ids, reply_params, timeout, packet)
+        replies, errors = {}, {}
+        offset = 0
+        for _ in range(n_replies):
+            id_, error, n_params = REPLY_HEADER.unpack_from(payload, offset)
+            offset += REPLY_HEADER.size
+            replies[id_] = payload[offset:offset + n_params]
+            offset += n_params
+            if error:
+                errors[id_] = error
+        return replies, errors
+
+    def stats(self):
+        return self._request(OP_STATS)[1]
+
+    def bus(self, name):
+        for index, info in enumerate(self.buses):
+            if name in (info['name'], info['port']):
+                return RemoteBus(self, index, info)
+        known = ', '.join(f"{b['name']} ({b['port']})" for b in self.buses)
+        raise ValueError(f"The bus daemon has no bus '{name}'; it serves {known}")
+
+class RemoteBus(FeetechRegisters):
+    """One daemon bus seen from a client, usable wherever a FeetechSerial is"""
+
+    def __init__(self, client, index, info):
+        self.client = client
+        self.index = index
+        self.name = info['name']
+        self.port = info['port']
+        self.ids = info['ids']
+        self.status_errors = {}
+
+    def transact(self, packet, reply_ids=(), reply_params=0, timeout_ms=None):
+        replies, errors = self.client.transact(self.index, packet, reply_ids, reply_params, timeout_ms)
+        self.status_errors.update(errors)
+        return replies
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep the SO-101 arm ports open and share them over a Unix socket')
+    parser.add_argument('--leader-port', help='Leader arm port, e.g. COM3 or /dev/ttyACM0')
+    parser.add_argument('--follower-port', help='Follower arm port, e.g. COM4 or /dev/ttyACM1')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f'Socket path (default: {DEFAULT_SOCKET})')
+    parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE, help='Bus baud rate (default: 1000000)')
+    parser.add_argument('--timeout-ms', type=float,
+                       help=f'Reply window on top of the wire time (default: the port\'s tuned timeout '
+                            f'from config/bus_tuning.json, else {REPLY_TIMEOUT_MS:g})')
+    parser.add_argument('--stats-interval', type=float, default=0,
+                       help='Seconds between traffic lines, 0 to disable (default: 0)')
+
+    args = parser.parse_args()
+    buses = {name: port for name, port in (('leader', args.leader_port), ('follower', args.follower_port)) if port}
+    if not buses:
+        parser.error("give --leader-port and/or --follower-port")
+
+    print("🛰️  SO-101 Robot Arms Bus Daemon")
+    print("=" * 50)
+    daemon = BusDaemon(buses, args.socket, args.baudrate, args.timeout_ms,
+                       on_event=lambda message: print(f"🔌 {message}"))
+    try:
+        missing = daemon.open()
+    except Exception as e:
+        print(f"❌ Error starting bus daemon: {e}")
+        sys.exit(1)
+    for bus in daemon.buses:
+        absent = missing[bus.name]
+        note = f"⚠️  no reply from IDs {absent}" if absent else f"✅ IDs {bus.ids}"
+        print(f"{bus.name}: {bus.port} {note}")
+    print(f"Serving on {args.socket}")
+    print("Press Ctrl+C to stop")
+    print("=" * 50)
+
+    if args.stats_interval:
+        def report():
+            while daemon.server is not None:
+                time.sleep(args.stats_interval)
+                stats = daemon.stats()
+                line = '  '.join(f"{b['name']}: {b['transactions']} tx {b['timeouts']} timeouts "
+                                 f"{b['reconnects']} reconnects wait max {b['max_wait_ms']:.2f} ms"
+                                 + ('' if b['up'] else ' (down)') for b in stats['buses'])
+                print(f"clients {stats['clients']}  {line}")
+        threading.Thread(target=report, daemon=True).start()
+
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.close()
+        print("\n🛑 Bus daemon stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Bus Scheduler
+Priority and deadline ordering of transactions on one half-duplex Feetech bus
+
+Every transaction on a bus is classed as control > state > telemetry >
+config. Control transactions (the teleop read and goal write) run the
+moment they are issued. Everything else is queued with an optional
+deadline and packed into the idle time left in each control period: the
+scheduler estimates each packet's bus time from the baud rate, the packet
+and reply lengths, and a learned per-transaction turnaround, and only
+starts a transaction that will finish before the next tick. Transactions
+whose deadline passes in the queue are dropped and counted as misses.
+
+A scheduler is itself a raw-packet transport, so PacketJointBus and the
+FeetechRegisters helpers run on it directly at control priority; lower
+classes go through submit() and complete from the idle task.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+
+from feetech_protocol import STATUS_OVERHEAD, wire_time
+from so101_bus import DEFAULT_BAUDRATE
+
+PRIORITY_CONTROL, PRIORITY_STATE, PRIORITY_TELEMETRY, PRIORITY_CONFIG = range(4)
+PRIORITY_NAMES = ('control', 'state', 'telemetry', 'config')
+
+# Time left unused before the next tick so a slightly long transaction cannot delay it
+DEADLINE_MARGIN_S = 0.0005
+
+# First guess for the fixed cost of a transaction on top of its wire time (USB round trip)
+DEFAULT_TURNAROUND_S = 0.001
+
+def transaction_wire_time(packet_len, n_replies, reply_params, baudrate=DEFAULT_BAUDRATE):
+    """Seconds the request and every status reply occupy the bus (8N1)"""
+    return wire_time(packet_len + n_replies * (STATUS_OVERHEAD + reply_params), baudrate)
+
+class Transaction:
+    """
+    One queued packet; result() blocks until it ran, was dropped or failed.
+
+    callback(txn), when set, runs on the thread that finished it (the loop
+    thread for the idle task); elapsed is the bus time it took.
+    """
+
+    def __init__(self, packet, reply_ids, reply_params, priority, deadline, callback):
+        self.packet = packet
+        self.reply_ids = tuple(reply_ids)
+        self.reply_params = reply_params
+        self.priority = priority
+        self.deadline = deadline
+        self.callback = callback
+        self.replies = None
+        self.error = None
+        self.missed = False
+        self.elapsed = 0.0
+        self.submitted = time.perf_counter()
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def _finish(self):
+        self._done.set()
+        if self.callback is not None:
+            self.callback(self)
+
+    def result(self, timeout=None):
+        """{id: params}; raises ConnectionError if the transaction missed its deadline or failed"""
+        if not self._done.wait(timeout):
+            raise TimeoutError("Transaction still queued")
+        if self.missed:
+            raise ConnectionError("Transaction dropped: deadline passed before the bus was free")
+        if self.error is not None:
+            raise self.error
+        return self.replies
+
+class BusScheduler:
+    """
+    Orders and accounts every transaction on one bus.
+
+    transport is a raw-packet transport (FeetechSerial, possibly wrapping a
+    connected FeetechMotorsBus port). transact() runs immediately and is
+    meant for the loop thread; submit() may be called from any thread and
+    the work runs when the loop calls the scheduler as its idle task.
+    """
+
+    def __init__(self, transport, baudrate=None, turnaround_s=DEFAULT_TURNAROUND_S):
+        self.transport = transport
+        self.port = transport.port
+        self.status_errors = getattr(transport, 'status_errors', {})
+        self.baudrate = baudrate or getattr(transport, 'baudrate', DEFAULT_BAUDRATE)
+        self.turnaround = turnaround_s
+        self.started = time.perf_counter()
+        self.busy_s = 0.0
+        self.executed = [0] * len(PRIORITY_NAMES)
+        self.missed = [0] * len(PRIORITY_NAMES)
+        self.busy_by_class = [0.0] * len(PRIORITY_NAMES)
+        self.estimate_error_s = 0.0
+        self._queue = []
+        self._arrivals = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def corrupt_packets(self):
+        return getattr(self.transport, 'corrupt_packets', 0)
+
+    def estimate(self, packet_len, n_replies, reply_params):
+        """Expected bus time of a transaction: wire time plus the learned turnaround"""
+        return transaction_wire_time(packet_len, n_replies, reply_params, self.baudrate) + \
+            (self.turnaround if n_replies else 0.0)
+
+    def transact(self, packet, reply_ids=(), reply_params=0, timeout_ms=None, priority=PRIORITY_CONTROL):
+        """Run one transaction now and account for it"""
+        start = time.perf_counter()
+        try:
+            return self.transport.transact(packet, reply_ids, reply_params, timeout_ms)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._account(priority, len(packet), len(reply_ids), reply_params, elapsed)
+
+    def _account(self, priority, packet_len, n_replies, reply_params, elapsed):
+        self.busy_s += elapsed
+        self.busy_by_class[priority] += elapsed
+        self.executed[priority] += 1
+        if n_replies:
+            miss = elapsed - self.estimate(packet_len, n_replies, reply_params)
+            self.estimate_error_s += 0.05 * (abs(miss) - self.estimate_error_s)
+            # Learn the fixed cost per transaction (latency timer, servo return delay); it never goes negative
+            self.turnaround = max(0.0, self.turnaround + 0.05 * miss)
+
+    def submit(self, packet, reply_ids=(), reply_params=0, priority=PRIORITY_TELEMETRY, deadline=None,
+               callback=None):
+        """Queue a transaction; deadline is a perf_counter time after which it is dropped"""
+        if priority == PRIORITY_CONTROL:
+            raise ValueError("Control transactions run immediately, use transact()")
+        txn = Transaction(packet, reply_ids, reply_params, priority, deadline, callback)
+        with self._lock:
+            heapq.heappush(self._queue, (priority, deadline if deadline is not None else math.inf,
+                                         next(self._arrivals), txn))
+        return txn
+
+    @property
+    def queued(self):
+        return len(self._queue)
+
+    def __call__(self, deadline):
+        """Idle task: run queued work in priority then deadline order while it fits before `deadline`"""
+        with self._lock:
+            pending = sorted(self._queue)
+            self._queue.clear()
+        keep = []
+        for entry in pending:
+            txn = entry[3]
+            now = time.perf_counter()
+            if txn.deadline is not None and now > txn.deadline:
+                txn.missed = True
+                self.missed[txn.priority] += 1
+                txn._finish()
+                continue
+            cost = self.estimate(len(txn.packet), len(txn.reply_ids), txn.reply_params)
+            if now + cost > deadline - DEADLINE_MARGIN_S:
+                # Does not fit this period; smaller work further down the queue still may
+                keep.append(entry)
+                continue
+            try:
+                txn.replies = self.transact(txn.packet, txn.reply_ids, txn.reply_params, priority=txn.priority)
+            except Exception as e:
+                txn.error = e
+            txn.elapsed = time.perf_counter() - now
+            txn._finish()
+        if keep:
+            with self._lock:
+                for entry in keep:
+                    heapq.heappush(self._queue, entry)
+
+    def stats(self):
+        """Utilization (share of wall time the bus was busy), per-class counts and deadline misses"""
+        elapsed = time.perf_counter() - self.started
+        return {
+            'port': self.port,
+            'utilization': self.busy_s / elapsed if elapsed > 0 else 0.0,
+            'turnaround_ms': self.turnaround * 1000,
+            'queued': self.queued,
+            'classes': {
+                name: {'executed': self.executed[i], 'missed': self.missed[i],
+                       'busy_share': self.busy_by_class[i] / elapsed if elapsed > 0 else 0.0}
+                for i, name in enumerate(PRIORITY_NAMES)
+            },
+        }
+
+    def format_stats(self):
+        stats = self.stats()
+        classes = '  '.join(f"{name} {c['executed']}" + (f" ({c['missed']} missed)" if c['missed'] else '')
+                            for name, c in stats['classes'].items() if c['executed'] or c['missed'])
+        return (f"{stats['port']}: {stats['utilization'] * 100:.1f} % busy, "
+                f"turnaround {stats['turnaround_ms']:.2f} ms, {classes}")
+
+def chain(*tasks):
+    """One FixedRateLoop idle task running several in turn (e.g. one scheduler per bus)"""
+    tasks = [task for task in tasks if task is not None]
+
+    def run(deadline):
+        for task in tasks:
+            if time.perf_counter() >= deadline - DEADLINE_MARGIN_S:
+                return
+            task(deadline)
+    return run
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Bus Tuner
+Measure bus latency and throughput for each communication setting and pick the fastest reliable one
+
+Four knobs decide how fast one teleop tick can read and write an arm:
+the servo baud rate (Baud_Rate), the delay each servo waits before
+answering (Return_Delay_Time, 2 us units), the USB adapter's latency
+timer (Linux FTDI adapters default to 16 ms, which alone caps a
+read/write cycle near 60 Hz) and the host's reply timeout. The tuner
+tries every combination on one arm, measuring ping round trips, sync
+read rate and full read+write cycle rate, then tries shorter reply
+timeouts on the winner.
+
+Trial values are written with the EEPROM lock closed, so they are not
+saved in the servos, and everything is restored at exit. --apply writes
+the best combination with the lock open (the servos keep it across power
+cycles), sets the latency timer and records the result in
+config/bus_tuning.json.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from feetech_protocol import (
+    BAUDRATE_TABLE,
+    CONTROL_TABLE,
+    INST_PING,
+    encode_instruction,
+    encode_sync_read,
+    encode_sync_write,
+    to_bytes,
+)
+from feetech_serial import DEFAULT_BAUDRATE, REPLY_TIMEOUT_MS, TUNING_PATH, FeetechSerial
+
+DEFAULT_IDS = list(range(1, 7))
+DEFAULT_BAUDRATES = (1_000_000, 500_000)
+DEFAULT_RETURN_DELAYS = (0, 50, 250)        # register units of 2 us: 0, 100 us, 500 us
+DEFAULT_LATENCY_TIMERS = (16, 4, 1)         # ms, only where the adapter exposes one
+DEFAULT_TIMEOUTS_MS = (REPLY_TIMEOUT_MS, 10.0, 5.0, 3.0, 2.0)
+DEFAULT_CYCLES = 200
+
+RETURN_DELAY_UNIT_US = 2
+
+# Time the servos need to switch to a new baud rate before they answer again
+BAUD_SWITCH_S = 0.05
+
+# Linux usb-serial drivers (ftdi_sio) expose the adapter's latency timer here; CDC-ACM adapters have none
+LATENCY_TIMER_SYSFS = "/sys/bus/usb-serial/devices/{}/latency_timer"
+
+BAUD_CODES = {rate: code for code, rate in BAUDRATE_TABLE.items()}
+
+def latency_timer_path(port):
+    """sysfs file of the adapter latency timer behind a serial port, or None"""
+    path = LATENCY_TIMER_SYSFS.format(os.path.basename(os.path.realpath(port)))
+    return path if os.path.exists(path) else None
+
+def read_latency_timer(port):
+    path = latency_timer_path(port)
+    if path is None:
+        return None
+    with open(path) as f:
+        return int(f.read())
+
+def write_latency_timer(port, ms):
+    """Set the adapter latency timer (needs write access to sysfs, usually root or a udev rule)"""
+    with open(latency_timer_path(port), 'w') as f:
+        f.write(str(int(ms)))
+
+def udev_rule(ms):
+    """Line for /etc/udev/rules.d/ that sets the latency timer of every FTDI adapter at plug-in"""
+    return f'ACTION=="add", SUBSYSTEM=="usb-serial", DRIVER=="ftdi_sio", ATTR{{latency_timer}}="{int(ms)}"'
+
+class BusTuner:
+    """
+    Trial settings and measurements on one open arm.
+
+    The settings found when the tuner starts are kept and put back by
+    restore(); apply() makes the current trial permanent instead.
+    """
+
+    def __init__(self, bus, ids=DEFAULT_IDS, cycles=DEFAULT_CYCLES):
+        self.bus = bus
+        self.ids = list(ids)
+        self.cycles = cycles
+        missing = [id_ for id_ in self.ids if self.bus.ping(id_) is None]
+        if missing:
+            raise ConnectionError(f"Motors {missing} do not answer on {bus.port} at {bus.baudrate} baud")
+        delays = self.bus.sync_read('Return_Delay_Time', self.ids)
+        if len(delays) != len(self.ids):
+            raise ConnectionError(f"Failed to read Return_Delay_Time on {bus.port}")
+        goals = self.bus.sync_read('Goal_Position', self.ids)
+        if len(goals) != len(self.ids):
+            raise ConnectionError(f"Failed to read Goal_Position on {bus.port}")
+        locks = self.bus.sync_read('Lock', self.ids)
+        if len(locks) != len(self.ids):
+            raise ConnectionError(f"Failed to read Lock on {bus.port}")
+        self.original = {
+            'baudrate': bus.baudrate,
+            'return_delay': delays,
+            'latency_timer_ms': read_latency_timer(bus.port),
+            'lock': locks,
+        }
+        # Close the EEPROM lock before any trial write so trial values stay in RAM
+        self.bus.sync_write('Lock', {id_: 1 for id_ in self.ids})
+        self.return_delay = dict(delays)
+        self.latency_timer = self.original['latency_timer_ms']
+        # Rewriting the goals the servos already hold keeps the arm still during write measurements
+        addr, length = CONTROL_TABLE['Present_Position']
+        self._read_packet = encode_sync_read(addr, length, self.ids)
+        addr, length = CONTROL_TABLE['Goal_Position']
+        self._write_packet = encode_sync_write(addr, length, {id_: to_bytes(goals[id_], length) for id_ in self.ids})
+        self._ping_packet = encode_instruction(self.ids[0], INST_PING)
+
+    def set_baudrate(self, baudrate):
+        """Move the servos and the host to another baud rate; raises ConnectionError if a motor is lost"""
+        if baudrate == self.bus.baudrate:
+            return
+        if baudrate not in BAUD_CODES:
+            raise ValueError(f"Unsupported baudrate {baudrate}, expected one of {sorted(BAUD_CODES)}")
+        self.bus.sync_write('Baud_Rate', {id_: BAUD_CODES[baudrate] for id_ in self.ids})
+        time.sleep(BAUD_SWITCH_S)
+        self.bus.serial.baudrate = self.bus.baudrate = baudrate
+        self.bus.serial.reset_input_buffer()
+        missing = [id_ for id_ in self.ids if self.bus.ping(id_) is None]
+        if missing:
+            raise ConnectionError(f"Motors {missing} lost after switching to {baudrate} baud")
+
+    def set_return_delay(self, value):
+        """One Return_Delay_Time for every motor, or a {id: value} dict"""
+        values = value if isinstance(value, dict) else {id_: value for id_ in self.ids}
+        self.bus.sync_write('Return_Delay_Time', values)
+        self.return_delay = dict(values)
+
+    def set_latency_timer(self, ms):
+        if ms is None or ms == self.latency_timer:
+            return
+        write_latency_timer(self.bus.port, ms)
+        self.latency_timer = ms
+
+    def measure(self, timeout_ms=None):
+        """Ping round trip, sync read rate, read+write cycle rate and missed replies at the current settings"""
+        transact = self.bus.transact
+        first = self.ids[0]
+        n = len(self.ids)
+        missed = 0
+        pings = []
+        for _ in range(self.cycles):
+            start = time.perf_counter()
+            missed += first not in transact(self._ping_packet, (first,), 0, timeout_ms)
+            pings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for _ in range(self.cycles):
+            missed += n - len(transact(self._read_packet, self.ids, 2, timeout_ms))
+        read_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(self.cycles):
+            missed += n - len(transact(self._read_packet, self.ids, 2, timeout_ms))
+            transact(self._write_packet)
+        cycle_s = time.perf_counter() - start
+        pings.sort()
+        return {
+            'ping_ms': statistics.median(pings) * 1000,
+            'ping_p99_ms': pings[min(len(pings) - 1, int(len(pings) * 0.99))] * 1000,
+            'read_hz': self.cycles / read_s,
+            'cycle_hz': self.cycles / cycle_s,
+            'missed': missed,
+        }
+
+    def sweep(self, baudrates=DEFAULT_BAUDRATES, return_delays=DEFAULT_RETURN_DELAYS,
+              latency_timers=DEFAULT_LATENCY_TIMERS, on_result=None):
+        """Measure every combination; returns a list of {settings..., measurements...}"""
+        if self.latency_timer is None:
+            latency_timers = (None,)
+        results = []
+        for baudrate in baudrates:
+            try:
+                self.set_baudrate(baudrate)
+            except ConnectionError as e:
+                print(f"⚠️  {e}, skipping")
+                self.set_baudrate_back()
+                continue
+            for timer in latency_timers:
+                try:
+                    self.set_latency_timer(timer)
+                except OSError as e:
+                    print(f"⚠️  Cannot set latency timer to {timer} ms ({e}), skipping")
+                    continue
+                for delay in return_delays:
+                    self.set_return_delay(delay)
+                    result = {'baudrate': baudrate, 'return_delay': delay, 'latency_timer_ms': timer}
+                    result.update(self.measure())
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+        return results
+
+    def set_baudrate_back(self):
+        """After a failed switch: talk to the servos at the original rate again"""
+        self.bus.serial.baudrate = self.bus.baudrate = self.original['baudrate']
+        self.bus.serial.reset_input_buffer()
+
+    def tune_timeout(self, timeouts_ms=DEFAULT_TIMEOUTS_MS, on_result=None):
+        """Shortest reply timeout that still loses no reply at the current settings"""
+        best = None
+        for timeout_ms in sorted(timeouts_ms, reverse=True):
+            result = self.measure(timeout_ms)
+            result['timeout_ms'] = timeout_ms
+            if on_result is not None:
+                on_result(result)
+            if result['missed']:
+                break
+            best = timeout_ms
+        return best
+
+    def configure(self, settings):
+        """Switch to a sweep result's settings"""
+        self.set_baudrate(settings['baudrate'])
+        self.set_latency_timer(settings['latency_timer_ms'])
+        self.set_return_delay(settings['return_delay'])
+
+    def apply(self):
+        """Save the current servo settings in EEPROM; they become the ones restore() returns to"""
+        self.bus.sync_write('Lock', {id_: 0 for id_ in self.ids})
+        self.bus.sync_write('Return_Delay_Time', self.return_delay)
+        self.bus.sync_write('Baud_Rate', {id_: BAUD_CODES[self.bus.baudrate] for id_ in self.ids})
+        self.bus.sync_write('Lock', {id_: 1 for id_ in self.ids})
+        self.original = {
+            'baudrate': self.bus.baudrate,
+            'return_delay': dict(self.return_delay),
+            'latency_timer_ms': self.latency_timer,
+            'lock': self.original['lock'],
+        }
+
+    def restore(self):
+        """Put back the settings found at start (or the applied ones), then the original EEPROM lock"""
+        self.set_return_delay(self.original['return_delay'])
+        if self.original['latency_timer_ms'] is not None:
+            self.set_latency_timer(self.original['latency_timer_ms'])
+        self.set_baudrate(self.original['baudrate'])
+        self.bus.sync_write('Lock', self.original['lock'])
+
+def best_result(results):
+    """Fastest read+write cycle among the settings that lost no reply (fewest losses otherwise)"""
+    if not results:
+        return None
+    return min(results, key=lambda r: (r['missed'], -r['cycle_hz']))
+
+def format_result(result):
+    timer = f"{result['latency_timer_ms']:>3} ms" if result['latency_timer_ms'] is not None else '  n/a'
+    return (f"{result['baudrate']:>9,} baud  delay {result['return_delay'] * RETURN_DELAY_UNIT_US:>4} us  "
+            f"timer {timer}  ping {result['ping_ms']:6.2f} ms (p99 {result['ping_p99_ms']:6.2f})  "
+            f"read {result['read_hz']:7.1f} Hz  cycle {result['cycle_hz']:7.1f} Hz  missed {result['missed']}")
+
+def save_tuning(path, port, settings, timeout_ms, results):
+    """Record the applied settings per port, next to the measurements behind them"""
+    path = Path(path)
+    tuning = {}
+    if path.exists():
+        with open(path) as f:
+            tuning = json.load(f)
+    tuning[port] = {
+        'baudrate': settings['baudrate'],
+        'return_delay': settings['return_delay'],
+        'latency_timer_ms': settings['latency_timer_ms'],
+        'timeout_ms': timeout_ms,
+        'measured': {key: settings[key] for key in ('ping_ms', 'ping_p99_ms', 'read_hz', 'cycle_hz')},
+        'candidates': len(results),
+        'tuned': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(tuning, f, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description='Find the fastest reliable bus settings for one SO-101 arm')
+    parser.add_argument('--port', required=True, help='Serial port of the arm (e.g. COM4 or /dev/ttyUSB0)')
+    parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE,
+                       help=f'Current servo baud rate (default: {DEFAULT_BAUDRATE})')
+    parser.add_argument('--ids', type=int, nargs='+', default=DEFAULT_IDS, help='Motor IDs (default: 1-6)')
+    parser.add_argument('--baudrates', type=int, nargs='+', default=list(DEFAULT_BAUDRATES),
+                       help='Servo baud rates to try (default: 1000000 500000)')
+    parser.add_argument('--return-delays', type=int, nargs='+', default=list(DEFAULT_RETURN_DELAYS),
+                       help='Return_Delay_Time values to try, 2 us units (default: 0 50 250)')
+    parser.add_argument('--latency-timers', type=int, nargs='+', default=list(DEFAULT_LATENCY_TIMERS),
+                       help='Adapter latency timers to try in ms, Linux FTDI only (default: 16 4 1)')
+    parser.add_argument('--timeouts-ms', type=float, nargs='+', default=list(DEFAULT_TIMEOUTS_MS),
+                       help='Reply timeouts to try on the best settings (default: 34 10 5 3 2)')
+    parser.add_argument('--cycles', type=int, default=DEFAULT_CYCLES,
+                       help=f'Transactions per measurement (default: {DEFAULT_CYCLES})')
+    parser.add_argument('--apply', action='store_true',
+                       help='Keep the best settings (saved in the servos) and record them in the tuning file')
+    parser.add_argument('--output', default=TUNING_PATH,
+                       help='Tuning record written by --apply (default: config/bus_tuning.json)')
+
+    args = parser.parse_args()
+
+    print("🔧 SO-101 Bus Tuner")
+    print("=" * 50)
+    print(f"Port: {args.port}  Motors: {args.ids}")
+
+    # Trials start from the stock reply window, not a previously tuned one
+    with FeetechSerial(args.port, args.baudrate, REPLY_TIMEOUT_MS) as bus:
+        try:
+            tuner = BusTuner(bus, args.ids, args.cycles)
+        except ConnectionError as e:
+            print(f"❌ {e}")
+            return 1
+        timer = tuner.original['latency_timer_ms']
+        print(f"Adapter latency timer: {f'{timer} ms' if timer is not None else 'not adjustable on this port'}")
+        print("-" * 50)
+        try:
+            results = tuner.sweep(args.baudrates, args.return_delays, args.latency_timers,
+                                  on_result=lambda r: print(format_result(r)))
+            best = best_result(results)
+            if best is None:
+                print("❌ No setting could be measured")
+                return 1
+            tuner.configure(best)
+            print("-" * 50)
+            print("Reply timeouts on the best settings:")
+            timeout_ms = tuner.tune_timeout(
+                args.timeouts_ms,
+                on_result=lambda r: print(f"  {r['timeout_ms']:5.1f} ms  ping p99 {r['ping_p99_ms']:6.2f} ms  "
+                                          f"missed {r['missed']}"))
+            print("=" * 50)
+            print(f"🏆 Best: {format_result(best)}")
+            print(f"   Reply timeout: {f'{timeout_ms:g} ms' if timeout_ms else 'none of the candidates was loss-free'}")
+            if best['baudrate'] != DEFAULT_BAUDRATE:
+                print(f"⚠️  LeRobot's FeetechMotorsBus opens the arms at {DEFAULT_BAUDRATE} baud")
+            if args.apply:
+                tuner.apply()
+                save_tuning(args.output, args.port, best, timeout_ms, results)
+                print(f"✅ Applied and recorded in {args.output}")
+                if best['latency_timer_ms'] is not None:
+                    print("   The latency timer resets when the adapter is replugged; to keep it, add this udev rule:")
+                    print(f"   {udev_rule(best['latency_timer_ms'])}")
+            else:
+                print("Run again with --apply to keep these settings")
+        finally:
+            try:
+                tuner.restore()
+            except (ConnectionError, OSError) as e:
+                print(f"⚠️  Could not restore the original settings: {e}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Calibration Store
+Validated binary calibration cache with precomputed conversion coefficients, mmap-compatible layout
+
+Every launch used to find, parse and re-derive the calibration JSON files.
+The store compiles each file once into a fixed-layout binary record per
+joint (IDs, ranges, norm mode and the CompiledCalibration coefficients),
+keyed by arm type, id and source path and stamped with the source's
+mtime, size and SHA-256. A load whose source is unchanged reads the fixed-layout records
+straight into a numpy array without touching the JSON; an edited source (new mtime, or
+new content) is validated and recompiled. It also installs the repo's
+calibration files where LeRobot looks for them and warns before a tool
+falls back to the None.json calibration.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from calibration_tables import (
+    COEFFICIENTS,
+    DEFAULT_NORM_MODES,
+    DEGREES,
+    MAX_RES,
+    CompiledCalibration,
+    default_calibration_path,
+)
+from feetech_protocol import MAX_ID, SIGN_BITS
+
+CACHE_DIR = Path(os.getenv('SO101_CACHE', Path.home() / '.cache' / 'so101')).expanduser() / 'calibration'
+
+# Where LeRobot looks for calibration files (same environment variables as lerobot.constants)
+LEROBOT_CALIBRATION_DIR = Path(os.getenv(
+    'HF_LEROBOT_CALIBRATION',
+    Path(os.getenv('HF_LEROBOT_HOME', Path.home() / '.cache' / 'huggingface' / 'lerobot')).expanduser() / 'calibration',
+)).expanduser()
+
+REPO_CALIBRATION_DIR = Path(__file__).resolve().parent.parent / "calibration"
+
+# Calibration id LeRobot uses when none is given (it then reads None.json)
+FALLBACK_ID = 'None'
+
+# Bump when the record layout changes; older cache files are then recompiled
+FORMAT_VERSION = 1
+MAGIC = b'SO101CAL'
+
+# magic, format version, record count, source mtime_ns, source size, source SHA-256
+HEADER = struct.Struct('<8sIIqq32s')
+
+RECORD_DTYPE = np.dtype([
+    ('name', 'S32'),
+    ('id', '<i4'),
+    ('drive_mode', '<i4'),
+    ('homing_offset', '<i4'),
+    ('range_min', '<i4'),
+    ('range_max', '<i4'),
+    ('norm_mode', 'S16'),
+] + [(name, '<f8') for name in COEFFICIENTS])
+
+REQUIRED_KEYS = ('id', 'range_min', 'range_max')
+
+def validate_calibration(calibration, source='calibration'):
+    """Raise ValueError on a calibration that cannot drive an arm; returns warnings for suspicious values"""
+    if not isinstance(calibration, dict) or not calibration:
+        raise ValueError(f"{source}: expected a non-empty {{joint: {{...}}}} object")
+    warnings = []
+    seen = {}
+    for name, cal in calibration.items():
+        if not isinstance(cal, dict):
+            raise ValueError(f"{source}: joint '{name}' is not an object")
+        if len(name.encode()) > RECORD_DTYPE['name'].itemsize:
+            raise ValueError(f"{source}: joint name '{name}' is too long")
+        missing = [key for key in REQUIRED_KEYS if key not in cal]
+        if missing:
+            raise ValueError(f"{source}: joint '{name}' has no {', '.join(missing)}")
+        for key in ('id', 'drive_mode', 'homing_offset', 'range_min', 'range_max'):
+            if not isinstance(cal.get(key, 0), int) or isinstance(cal.get(key, 0), bool):
+                raise ValueError(f"{source}: joint '{name}' {key} must be an integer, got {cal[key]!r}")
+        if not 0 <= cal['id'] <= MAX_ID:
+            raise ValueError(f"{source}: joint '{name}' has motor ID {cal['id']} outside 0..{MAX_ID}")
+        if cal['id'] in seen:
+            raise ValueError(f"{source}: joints '{seen[cal['id']]}' and '{name}' share motor ID {cal['id']}")
+        seen[cal['id']] = name
+        if not 0 <= cal['range_min'] < cal['range_max'] <= MAX_RES:
+            raise ValueError(f"{source}: joint '{name}' range {cal['range_min']}..{cal['range_max']} "
+                             f"is not an increasing range within 0..{MAX_RES}")
+        if abs(cal.get('homing_offset', 0)) >= 1 << SIGN_BITS['Homing_Offset']:
+            warnings.append(f"joint '{name}' homing offset {cal['homing_offset']} does not fit the "
+                            f"Homing_Offset register (|offset| < {1 << SIGN_BITS['Homing_Offset']})")
+    return warnings
+
+def compile_records(calibration):
+    """One RECORD_DTYPE row per joint, coefficients computed for the default norm mode of each joint"""
+    names = list(calibration)
+    norm_modes = {name: DEFAULT_NORM_MODES.get(name, DEGREES) for name in names}
+    compiled = CompiledCalibration(calibration, norm_modes, names)
+    records = np.zeros(len(names), dtype=RECORD_DTYPE)
+    for i, name in enumerate(names):
+        cal = calibration[name]
+        records[i] = (name.encode(), cal['id'], cal.get('drive_mode', 0), cal.get('homing_offset', 0),
+                      cal['range_min'], cal['range_max'], compiled.norm_modes[i].encode(),
+                      *(getattr(compiled, field)[i] for field in COEFFICIENTS))
+    return records
+
+class StoredCalibration:
+    """
+    One arm's calibration as loaded from the store.
+
+    calibration is the usual {joint: {id, drive_mode, homing_offset,
+    range_min, range_max}} dict; compiled() returns a ready CompiledCalibration
+    built from the stored coefficients whenever the norm modes match.
+    """
+
+    def __init__(self, source, records, sha256, cached=False):
+        self.source = source
+        self.records = records
+        self.sha256 = sha256
+        self.cached = cached
+        self.joint_names = [name.decode() for name in records['name'].tolist()]
+        self._calibration = None
+
+    @property
+    def calibration(self):
+        if self._calibration is None:
+            self._calibration = {
+                name: {'id': id_, 'drive_mode': drive_mode, 'homing_offset': homing_offset,
+                       'range_min': range_min, 'range_max': range_max}
+                for name, id_, drive_mode, homing_offset, range_min, range_max in zip(
+                    self.joint_names, *(self.records[key].tolist() for key in
+                                        ('id', 'drive_mode', 'homing_offset', 'range_min', 'range_max')))
+            }
+        return self._calibration
+
+    @property
+    def warnings(self):
+        """Suspicious values (structural errors were already rejected when the file was compiled)"""
+        return validate_calibration(self.calibration, self.source)
+
+    def _rows(self, joint_names, ids):
+        """Record index per requested joint, matched by motor ID when ids is given, else by name"""
+        if ids is None:
+            missing = [name for name in joint_names if name not in self.joint_names]
+            if missing:
+                raise ValueError(f"No calibration entry for joints {missing} in {self.source}")
+            return [self.joint_names.index(name) for name in joint_names]
+        by_id = {int(id_): i for i, id_ in enumerate(self.records['id'])}
+        missing = [id_ for id_ in ids if id_ not in by_id]
+        if missing:
+            raise ValueError(f"No calibration entry for motor IDs {missing}")
+        return [by_id[id_] for id_ in ids]
+
+    def compiled(self, norm_modes=None, joint_names=None, ids=None):
+        """CompiledCalibration for joint_names (default: the file's joints), rows picked by motor ID if ids is given"""
+        joint_names = list(joint_names or self.joint_names)
+        rows = self.records[self._rows(joint_names, ids)]
+        norm_modes = norm_modes or DEFAULT_NORM_MODES
+        modes = [str(getattr(norm_modes[name], 'value', norm_modes[name])) for name in joint_names]
+        if modes != [mode.decode() for mode in rows['norm_mode']]:
+            # Other norm modes than the ones compiled in: derive the coefficients again
+            by_joint = {name: self.calibration[self.joint_names[i]]
+                        for name, i in zip(joint_names, self._rows(joint_names, ids))}
+            return CompiledCalibration(by_joint, norm_modes, joint_names)
+        return CompiledCalibration.from_coefficients(joint_names, modes, rows['id'], rows['homing_offset'],
+                                                     **{field: rows[field] for field in COEFFICIENTS})
+
+class CalibrationStore:
+    """Binary calibration cache in cache_dir, one file per arm type and calibration id"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._paths = {}
+
+    def cache_path(self, source):
+        """
+        <arm type>-<calibration id>-<path hash>.cal, e.g. so101_follower-follower_arm-3f2a9c1e.cal
+
+        The hash of the resolved source path keeps same-named files in
+        different trees (this repo's copy and LeRobot's) in separate entries.
+        """
+        path = self._paths.get(source)
+        if path is None:
+            name = Path(source)
+            digest = hashlib.sha256(str(name.resolve()).encode()).hexdigest()[:8]
+            path = self._paths[source] = self.cache_dir / f"{name.parent.name}-{name.stem}-{digest}.cal"
+        return path
+
+    def _read_cache(self, path):
+        """(mtime_ns, size, sha256, records) of a well-formed cache file, else None"""
+        try:
+            # A few hundred bytes: one read() is cheaper than setting up a map (open_mapped() maps it instead)
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < HEADER.size:
+            return None
+        magic, version, count, mtime_ns, size, sha256 = HEADER.unpack_from(data)
+        if magic != MAGIC or version != FORMAT_VERSION or len(data) != HEADER.size + count * RECORD_DTYPE.itemsize:
+            return None
+        return mtime_ns, size, sha256, np.frombuffer(data, RECORD_DTYPE, count, HEADER.size)
+
+    def _write_cache(self, path, stat, sha256, records):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(records), stat.st_mtime_ns, stat.st_size, sha256))
+                f.write(records.tobytes())
+            os.replace(tmp, path)
+        except OSError:
+            # A read-only cache only costs the fast path
+            pass
+
+    def load(self, source):
+        """StoredCalibration of a calibration JSON, from the cache when the source is unchanged"""
+        stat = os.stat(source)
+        path = self.cache_path(source)
+        cached = self._read_cache(path)
+        if cached is not None:
+            mtime_ns, size, sha256, records = cached
+            if mtime_ns == stat.st_mtime_ns and size == stat.st_size:
+                return StoredCalibration(source, records, sha256, cached=True)
+
+        with open(source, 'rb') as f:
+            data = f.read()
+        sha256 = hashlib.sha256(data).digest()
+        if cached is not None and cached[2] == sha256:
+            # Touched but not edited (checkout, copy): keep the records, refresh the stamp
+            records = cached[3]
+            self._write_cache(path, stat, sha256, records)
+            return StoredCalibration(source, records, sha256, cached=True)
+
+        try:
+            calibration = json.loads(data)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{source}: not valid JSON ({e})") from None
+        validate_calibration(calibration, source)
+        records = compile_records(calibration)
+        self._write_cache(path, stat, sha256, records)
+        return StoredCalibration(source, records, sha256)
+
+    def open_mapped(self, source):
+        """Read-only memory map of the records of an up-to-date cache file (compiled first if needed)"""
+        self.load(source)
+        return np.memmap(self.cache_path(source), RECORD_DTYPE, 'r', offset=HEADER.size)
+
+    def clear(self):
+        """Remove every cache file; returns how many were removed"""
+        removed = 0
+        for path in self.cache_dir.glob('*.cal'):
+            path.unlink()
+            removed += 1
+        return removed
+
+_store = None
+
+def default_store():
+    global _store
+    if _store is None:
+        _store = CalibrationStore()
+    return _store
+
+def load_calibration(path):
+    """Validated {joint: {...}} calibration of a JSON file through the default store"""
+    return default_store().load(path).calibration
+
+def load_stored(path):
+    """StoredCalibration of a JSON file through the default store"""
+    return default_store().load(path)
+
+def warn_if_fallback(kind, arm_id):
+    """Print a warning when no calibration id is given, so LeRobot will read None.json"""
+    if arm_id is not None and str(arm_id) != FALLBACK_ID:
+        return False
+    named = default_calibration_path(kind, f"{kind}_arm")
+    print(f"⚠️  No {kind} calibration id given: LeRobot will use {FALLBACK_ID}.json, a separate calibration "
+          f"from {named.name}. Pass --{kind}-id {named.stem} to use it.")
+    return True
+
+def lerobot_calibration_path(kind, arm_id):
+    """Where LeRobot reads the calibration of an arm"""
+    return default_calibration_path(kind, str(arm_id), LEROBOT_CALIBRATION_DIR)
+
+def install_calibration(kind, arm_id, force=False):
+    """
+    Copy this repo's calibration file of an arm into LeRobot's calibration directory.
+
+    Returns 'installed', 'up to date', 'differs' (an existing different file
+    is only replaced with force) or 'missing' (no such file in the repo).
+    """
+    source = default_calibration_path(kind, str(arm_id), REPO_CALIBRATION_DIR)
+    target = lerobot_calibration_path(kind, arm_id)
+    if not source.exists():
+        return 'missing'
+    if target.exists():
+        if target.read_bytes() == source.read_bytes():
+            return 'up to date'
+        if not force:
+            return 'differs'
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, target)
+    return 'installed'
+
+def repo_calibration_files():
+    return sorted(REPO_CALIBRATION_DIR.glob('*/*/*.json'))
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate, compile and install the calibration files')
+    parser.add_argument('paths', nargs='*', help='Calibration JSON files (default: every file under calibration/)')
+    parser.add_argument('--clear', action='store_true', help='Remove the compiled cache first')
+    parser.add_argument('--install', action='store_true',
+                       help=f'Copy the calibration files into LeRobot\'s directory ({LEROBOT_CALIBRATION_DIR})')
+    parser.add_argument('--force', action='store_true', help='With --install, replace files that differ')
+
+    args = parser.parse_args()
+
+    store = default_store()
+    print("📐 SO-101 Calibration Store")
+    print(f"Cache: {store.cache_dir}")
+    print("=" * 60)
+    if args.clear:
+        print(f"Removed {store.clear()} cached file(s)")
+
+    failed = 0
+    paths = [Path(p) for p in args.paths] or repo_calibration_files()
+    for path in paths:
+        try:
+            start = time.perf_counter()
+            stored = store.load(path)
+            elapsed = time.perf_counter() - start
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {e}")
+            failed += 1
+            continue
+        state = 'cached' if stored.cached else 'compiled'
+        print(f"✅ {path}: {len(stored.joint_names)} joints, sha256 {stored.sha256.hex()[:12]}, "
+              f"{state} in {elapsed * 1e6:.0f} us")
+        for warning in stored.warnings:
+            print(f"   ⚠️  {warning}")
+        if path.stem == FALLBACK_ID:
+            print("   ⚠️  Used by LeRobot only when no calibration id is given")
+
+    if args.install:
+        print("=" * 60)
+        for path in paths:
+            kind = 'leader' if 'leader' in path.parent.name else 'follower'
+            status = install_calibration(kind, path.stem, args.force)
+            icon = {'installed': '✅', 'up to date': '✅', 'differs': '⚠️ '}.get(status, '❌')
+            print(f"{icon} {lerobot_calibration_path(kind, path.stem)}: {status}"
+                  + (" (--force to replace)" if status == 'differs' else ''))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
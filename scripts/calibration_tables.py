@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Calibration Tables
+Compiles calibration JSON into vectorized raw <-> normalized conversions
+
+The math matches MotorsBus._normalize/_unnormalize in lerobot, but a whole
+joint vector is converted in one array operation instead of a per-joint loop.
+The per-tick affine form rounds differently from lerobot's expressions, so
+a goal can come out one tick lower where lerobot's int() lands just on an
+integer; the *_exact conversions repeat lerobot's float operations in the
+same order and agree with it tick for tick (used to build tables).
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from so101_bus import JOINT_NAMES
+
+RESOLUTION = 4096
+MAX_RES = RESOLUTION - 1
+
+# MotorNormMode values (MotorNormMode is a str enum, so its members compare equal to these)
+DEGREES = 'degrees'
+RANGE_0_100 = 'range_0_100'
+RANGE_M100_100 = 'range_m100_100'
+
+DEFAULT_NORM_MODES = {name: RANGE_0_100 if name == 'gripper' else DEGREES for name in JOINT_NAMES}
+
+# Per-joint conversion coefficients of a CompiledCalibration
+COEFFICIENTS = ('scale', 'offset', 'raw_lo', 'raw_hi', 'inv_scale', 'inv_offset', 'norm_lo', 'norm_hi')
+
+def load_calibration_json(path):
+    """Read a lerobot calibration file into {joint: {id, drive_mode, homing_offset, range_min, range_max}}"""
+    with open(path) as f:
+        return json.load(f)
+
+class CompiledCalibration:
+    """
+    Per-joint affine coefficients and a raw -> normalized lookup table.
+
+    to_normalized:  norm = clip(raw, raw_lo, raw_hi) * scale + offset
+    to_raw:         raw  = trunc(clip(norm, norm_lo, norm_hi) * inv_scale + inv_offset)
+
+    Degrees mode is not clipped (same as lerobot); drive_mode is folded into
+    the sign of the coefficients for the range modes.
+    """
+
+    def __init__(self, calibration, norm_modes=None, joint_names=JOINT_NAMES):
+        norm_modes = norm_modes or DEFAULT_NORM_MODES
+        self.joint_names = list(joint_names)
+        n = len(self.joint_names)
+
+        self.ids = np.empty(n, dtype=np.int32)
+        self.homing_offset = np.empty(n, dtype=np.int32)
+        self.scale = np.empty(n)
+        self.offset = np.empty(n)
+        self.raw_lo = np.empty(n)
+        self.raw_hi = np.empty(n)
+        self.inv_scale = np.empty(n)
+        self.inv_offset = np.empty(n)
+        self.norm_lo = np.empty(n)
+        self.norm_hi = np.empty(n)
+        self.norm_modes = []
+
+        for i, name in enumerate(self.joint_names):
+            cal = calibration[name]
+            min_, max_ = cal['range_min'], cal['range_max']
+            if max_ == min_:
+                raise ValueError(f"Invalid calibration for motor '{name}': min and max are equal.")
+            drive = bool(cal.get('drive_mode', 0))
+            span = max_ - min_
+            mode = str(getattr(norm_modes[name], 'value', norm_modes[name]))
+            self.norm_modes.append(mode)
+            self.ids[i] = cal['id']
+            self.homing_offset[i] = cal.get('homing_offset', 0)
+
+            if mode == DEGREES:
+                mid = (min_ + max_) / 2
+                self.scale[i], self.offset[i] = 360 / MAX_RES, -mid * 360 / MAX_RES
+                self.raw_lo[i], self.raw_hi[i] = -np.inf, np.inf
+                self.inv_scale[i], self.inv_offset[i] = MAX_RES / 360, mid
+                self.norm_lo[i], self.norm_hi[i] = -np.inf, np.inf
+            elif mode == RANGE_M100_100:
+                sign = -1.0 if drive else 1.0
+                self.scale[i] = sign * 200 / span
+                self.offset[i] = sign * (-min_ * 200 / span - 100)
+                self.raw_lo[i], self.raw_hi[i] = min_, max_
+                self.inv_scale[i] = sign * span / 200
+                self.inv_offset[i] = span / 2 + min_
+                self.norm_lo[i], self.norm_hi[i] = -100.0, 100.0
+            elif mode == RANGE_0_100:
+                if drive:
+                    self.scale[i], self.offset[i] = -100 / span, 100 + min_ * 100 / span
+                    self.inv_scale[i], self.inv_offset[i] = -span / 100, max_
+                else:
+                    self.scale[i], self.offset[i] = 100 / span, -min_ * 100 / span
+                    self.inv_scale[i], self.inv_offset[i] = span / 100, min_
+                self.raw_lo[i], self.raw_hi[i] = min_, max_
+                self.norm_lo[i], self.norm_hi[i] = 0.0, 100.0
+            else:
+                raise NotImplementedError(mode)
+
+        self._init_buffers()
+
+    def _init_buffers(self):
+        n = len(self.joint_names)
+        # Offsets of each joint's row in the flattened lookup table
+        self._lut_offsets = np.arange(n, dtype=np.intp) * RESOLUTION
+        self._lut_index = np.empty(n, dtype=np.intp)
+        self._work = np.empty(n)
+        self._lut = None
+
+    @classmethod
+    def from_coefficients(cls, joint_names, norm_modes, ids, homing_offset, **coefficients):
+        """Rebuild from precomputed per-joint coefficients (one array per name in COEFFICIENTS)"""
+        self = cls.__new__(cls)
+        self.joint_names = list(joint_names)
+        self.norm_modes = list(norm_modes)
+        self.ids = np.array(ids, dtype=np.int32)
+        self.homing_offset = np.array(homing_offset, dtype=np.int32)
+        for field in COEFFICIENTS:
+            setattr(self, field, np.array(coefficients[field], dtype=np.float64))
+        self._init_buffers()
+        return self
+
+    @classmethod
+    def from_file(cls, path, norm_modes=None, joint_names=JOINT_NAMES):
+        return cls(load_calibration_json(path), norm_modes, joint_names)
+
+    @classmethod
+    def from_bus(cls, bus, joint_names=JOINT_NAMES):
+        """Compile the calibration and norm modes a connected MotorsBus is using"""
+        calibration = {name: vars(cal) for name, cal in bus.calibration.items()}
+        norm_modes = {name: motor.norm_mode for name, motor in bus.motors.items()}
+        return cls(calibration, norm_modes, joint_names)
+
+    @property
+    def lut(self):
+        """(N, 4096) float table: raw tick -> normalized value, built on first use"""
+        if self._lut is None:
+            ticks = np.arange(RESOLUTION, dtype=np.float64)
+            clipped = np.clip(ticks[None, :], self.raw_lo[:, None], self.raw_hi[:, None])
+            self._lut = clipped * self.scale[:, None] + self.offset[:, None]
+        return self._lut
+
+    # np.maximum/np.minimum are used instead of np.clip: for 6-element vectors
+    # the per-call overhead dominates and np.clip costs about twice as much.
+
+    def to_normalized(self, raw, out=None):
+        """Raw ticks (N,) -> normalized values (N,) via the affine coefficients"""
+        out = np.empty(len(self.scale)) if out is None else out
+        np.maximum(raw, self.raw_lo, out=out)
+        np.minimum(out, self.raw_hi, out=out)
+        np.multiply(out, self.scale, out=out)
+        np.add(out, self.offset, out=out)
+        return out
+
+    def lookup(self, raw, out=None):
+        """Raw ticks (N,) in 0..4095 -> normalized values (N,) via the lookup table"""
+        out = np.empty(len(self.scale)) if out is None else out
+        np.add(raw, self._lut_offsets, out=self._lut_index)
+        np.take(self.lut.reshape(-1), self._lut_index, out=out)
+        return out
+
+    def _column(self, values, x):
+        """Per-joint coefficients shaped to broadcast against x (N,) or (N, K)"""
+        return values.reshape((-1,) + (1,) * (np.ndim(x) - 1))
+
+    def to_normalized_exact(self, raw):
+        """Raw ticks (N,) or (N, K) -> normalized, with MotorsBus._normalize's float operations (not for the hot path)"""
+        raw = np.asarray(raw, dtype=np.float64)
+        col = lambda values: self._column(values, raw)
+        modes = col(np.array(self.norm_modes))
+        min_, max_, mid = col(self.raw_lo), col(self.raw_hi), col(self.inv_offset)
+        drive = col(self.scale) < 0
+        with np.errstate(invalid='ignore'):
+            ratio = (np.clip(raw, min_, max_) - min_) / (max_ - min_)
+            m100 = ratio * 200 - 100
+            r100 = ratio * 100
+            return np.where(modes == RANGE_M100_100, np.where(drive, -m100, m100),
+                            np.where(modes == RANGE_0_100, np.where(drive, 100 - r100, r100),
+                                     (raw - mid) * 360 / MAX_RES))
+
+    def to_raw_exact(self, normalized):
+        """Normalized (N,) or (N, K) -> raw ticks, with MotorsBus._unnormalize's float operations and int() truncation"""
+        val = np.asarray(normalized, dtype=np.float64)
+        col = lambda values: self._column(values, val)
+        modes = col(np.array(self.norm_modes))
+        # Degrees mode keeps raw_lo/raw_hi at +-inf; only the range modes read them
+        is_range = modes != DEGREES
+        min_ = np.where(is_range, col(self.raw_lo), 0.0)
+        span = np.where(is_range, col(self.raw_hi), 1.0) - min_
+        drive = col(self.inv_scale) < 0
+        m100 = ((np.clip(np.where(drive, -val, val), -100.0, 100.0) + 100) / 200) * span + min_
+        r100 = (np.clip(np.where(drive, 100 - val, val), 0.0, 100.0) / 100) * span + min_
+        degrees = (val * MAX_RES / 360) + col(self.inv_offset)
+        goal = np.where(modes == RANGE_M100_100, m100, np.where(modes == RANGE_0_100, r100, degrees))
+        return np.trunc(goal).astype(np.int32)
+
+    def to_raw(self, normalized, out=None):
+        """
+        Normalized values (N,) -> raw goal ticks (N,), truncated toward zero like int().
+
+        Within one tick of MotorsBus._unnormalize: the affine form rounds
+        differently, so a goal lerobot computes as exactly n can come out
+        n - 1 (or the other way round). to_raw_exact() agrees exactly.
+        """
+        work = self._work
+        np.maximum(normalized, self.norm_lo, out=work)
+        np.minimum(work, self.norm_hi, out=work)
+        np.multiply(work, self.inv_scale, out=work)
+        np.add(work, self.inv_offset, out=work)
+        out = np.empty(len(self.scale), dtype=np.int32) if out is None else out
+        # float -> int casting truncates toward zero, like int()
+        np.copyto(out, work, casting='unsafe')
+        return out
+
+def normalize_reference(calibration, norm_modes, raw_by_joint):
+    """Per-joint Python loop with the same math as MotorsBus._normalize (baseline for checks/benchmarks)"""
+    normalized = {}
+    for name, val in raw_by_joint.items():
+        min_, max_ = calibration[name]['range_min'], calibration[name]['range_max']
+        drive_mode = calibration[name].get('drive_mode', 0)
+        mode = norm_modes[name]
+        bounded_val = min(max_, max(min_, val))
+        if mode == RANGE_M100_100:
+            norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
+            normalized[name] = -norm if drive_mode else norm
+        elif mode == RANGE_0_100:
+            norm = ((bounded_val - min_) / (max_ - min_)) * 100
+            normalized[name] = 100 - norm if drive_mode else norm
+        else:
+            mid = (min_ + max_) / 2
+            normalized[name] = (val - mid) * 360 / MAX_RES
+    return normalized
+
+def unnormalize_reference(calibration, norm_modes, norm_by_joint):
+    """Per-joint Python loop with the same math as MotorsBus._unnormalize"""
+    raw = {}
+    for name, val in norm_by_joint.items():
+        min_, max_ = calibration[name]['range_min'], calibration[name]['range_max']
+        drive_mode = calibration[name].get('drive_mode', 0)
+        mode = norm_modes[name]
+        if mode == RANGE_M100_100:
+            val = -val if drive_mode else val
+            bounded_val = min(100.0, max(-100.0, val))
+            raw[name] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
+        elif mode == RANGE_0_100:
+            val = 100 - val if drive_mode else val
+            bounded_val = min(100.0, max(0.0, val))
+            raw[name] = int((bounded_val / 100) * (max_ - min_) + min_)
+        else:
+            mid = (min_ + max_) / 2
+            raw[name] = int((val * MAX_RES / 360) + mid)
+    return raw
+
+def default_calibration_path(kind, arm_id, root=None):
+    """Path of a calibration file in this repo's calibration/ tree"""
+    root = Path(root) if root else Path(__file__).resolve().parent.parent / "calibration"
+    subdir = 'teleoperators/so101_leader' if kind == 'leader' else 'robots/so101_follower'
+    return root / subdir / f"{arm_id}.json"
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Fault Recovery
+Retries failed bus transactions inside the tick and reconnects a lost port in the background
+
+USB serial adapters drop replies, corrupt bytes and occasionally vanish
+under load. Restarting teleop for each glitch costs a full import and
+connect handshake. FaultRecovery sits between the teleop loop and the
+joint buses instead. A timed-out or corrupt transaction is retried while
+the tick still has time. A port that fails outright, or keeps failing for
+several ticks, is marked down, and a background thread reopens the same
+pyserial port and re-verifies every motor with a sync read. Meanwhile the
+loop keeps its schedule without touching the buses, and the follower
+servos hold their last goal. The arm rejoins on the next tick after
+verification.
+"""
+
+import threading
+import time
+
+from so101_bus import FAULT_CHECKSUM, FAULT_PORT_LOST, FAULT_TIMEOUT, classify_fault
+
+# Extra attempts of a failed transaction within one tick
+DEFAULT_RETRIES = 1
+
+# Consecutive failed ticks before a silent bus is treated as lost (50 ms at 100 Hz)
+LOST_AFTER_FAILED_TICKS = 5
+
+# Pause between reconnect attempts
+RECONNECT_INTERVAL_S = 0.01
+
+FAULT_KINDS = (FAULT_TIMEOUT, FAULT_CHECKSUM, FAULT_PORT_LOST)
+
+class ArmLink:
+    """
+    One arm's joint bus and the pyserial port behind it.
+
+    ser is reopened in place on reconnect, so every object sharing it (the
+    FeetechMotorsBus, a wrapped FeetechSerial, a BusScheduler) recovers
+    with it. Without ser (e.g. through the bus daemon, which owns the
+    port) reconnecting only waits for the verification read to succeed.
+    port_handler is the scservo_sdk PortHandler when the port belongs to a
+    FeetechMotorsBus.
+    """
+
+    def __init__(self, name, joints, ser=None, port_handler=None):
+        self.name = name
+        self.joints = joints
+        self.ser = ser
+        self.port_handler = port_handler
+        self.up = True
+        self.lost_at = None
+        self.failed_ticks = 0
+
+    def reopen(self):
+        ser = self.ser
+        if ser is None:
+            return
+        try:
+            ser.close()
+        except Exception:
+            pass
+        ser.open()
+        ser.reset_input_buffer()
+        # Non-blocking, the way scservo_sdk and FeetechSerial expect the port
+        ser.timeout = 0
+        if self.port_handler is not None:
+            # scservo_sdk leaves the port marked busy when a transfer raised halfway
+            self.port_handler.is_using = False
+
+    def verify(self):
+        """Every motor answers one position sync read"""
+        self.joints.read_positions()
+
+class FaultRecovery:
+    """
+    Fault counters and recovery for the arms of one teleop loop.
+
+    call(arm, fn, arg, deadline) runs one bus transaction and returns its
+    result, or None when it failed for this tick; the caller then skips
+    the rest of the tick. Exceptions that are not bus faults propagate.
+    Faults raised between ticks (idle tasks) go through report() or
+    guard() instead.
+    """
+
+    def __init__(self, arms, retries=DEFAULT_RETRIES, lost_after=LOST_AFTER_FAILED_TICKS,
+                 reconnect_interval=RECONNECT_INTERVAL_S, on_event=None):
+        self.arms = {arm.name: arm for arm in arms}
+        self.retries = retries
+        self.lost_after = lost_after
+        self.reconnect_interval = reconnect_interval
+        self.on_event = on_event
+        self.faults = dict.fromkeys(FAULT_KINDS, 0)
+        self.retried = 0
+        self.recovered_retries = 0
+        self.dropped_ticks = 0
+        self.idle_faults = 0
+        self.losses = 0
+        self.reconnects = 0
+        self.reconnect_attempts = 0
+        self.downtime_s = 0.0
+        self.longest_outage_s = 0.0
+        self.last_outage_s = 0.0
+        # Bumped on every reconnect so the loop can reset state that spans ticks (e.g. the predictor)
+        self.generation = 0
+        self.all_up = True
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = {}
+
+    def _event(self, message):
+        if self.on_event is not None:
+            self.on_event(message)
+
+    def call(self, name, fn, arg=None, deadline=None):
+        """fn(arg) on arm `name` with in-tick retries; None if the arm failed this tick"""
+        try:
+            result = fn(arg)
+        except Exception as e:
+            return self._retry(name, fn, arg, deadline, e)
+        arm = self.arms[name]
+        if arm.failed_ticks:
+            arm.failed_ticks = 0
+        return result
+
+    def _retry(self, name, fn, arg, deadline, error):
+        arm = self.arms[name]
+        for attempt in range(self.retries + 1):
+            kind = classify_fault(error)
+            if kind is None:
+                raise error
+            self.faults[kind] += 1
+            if kind == FAULT_PORT_LOST:
+                self.lose(name, error)
+                return None
+            if attempt == self.retries or (deadline is not None and time.perf_counter() >= deadline):
+                break
+            self.retried += 1
+            try:
+                result = fn(arg)
+            except Exception as e:
+                error = e
+                continue
+            self.recovered_retries += 1
+            arm.failed_ticks = 0
+            return result
+        self.dropped_ticks += 1
+        arm.failed_ticks += 1
+        if arm.failed_ticks >= self.lost_after:
+            self.lose(name, error)
+        return None
+
+    def report(self, name, error):
+        """
+        Count a fault raised outside call(), e.g. by an idle task, and reconnect a lost port.
+
+        name is the arm whose bus failed; with None every arm is reconnected,
+        since the failing port is unknown. Returns the fault class; errors
+        that are not bus faults are raised again.
+        """
+        kind = classify_fault(error)
+        if kind is None:
+            raise error
+        self.faults[kind] += 1
+        self.idle_faults += 1
+        if kind == FAULT_PORT_LOST:
+            for arm in (self.arms if name is None else (name,)):
+                self.lose(arm, error)
+        return kind
+
+    def guard(self, name, task):
+        """Idle task wrapper routing the bus faults task raises on arm `name` through report()"""
+        def run(deadline):
+            try:
+                task(deadline)
+            except Exception as e:
+                self.report(name, e)
+        return run
+
+    def lose(self, name, error=None):
+        """Mark an arm down and start reconnecting it in the background"""
+        arm = self.arms[name]
+        with self._lock:
+            if not arm.up:
+                return
+            arm.up = False
+            arm.lost_at = time.perf_counter()
+            self.all_up = False
+            self.losses += 1
+        self._event(f"{name} bus lost ({error}), reconnecting")
+        thread = threading.Thread(target=self._reconnect, args=(arm,), name=f"reconnect-{name}", daemon=True)
+        self._threads[name] = thread
+        thread.start()
+
+    def _reconnect(self, arm):
+        while not self._stop.is_set():
+            self.reconnect_attempts += 1
+            try:
+                arm.reopen()
+                arm.verify()
+            except Exception:
+                self._stop.wait(self.reconnect_interval)
+                continue
+            outage = time.perf_counter() - arm.lost_at
+            with self._lock:
+                arm.up = True
+                arm.failed_ticks = 0
+                self.reconnects += 1
+                self.downtime_s += outage
+                self.last_outage_s = outage
+                self.longest_outage_s = max(self.longest_outage_s, outage)
+                self.generation += 1
+                self.all_up = all(a.up for a in self.arms.values())
+            self._event(f"{arm.name} bus back after {outage * 1000:.0f} ms")
+            return
+
+    def close(self):
+        """Stop reconnect attempts still running"""
+        self._stop.set()
+        for thread in self._threads.values():
+            thread.join(timeout=1.0)
+
+    def summary(self):
+        down = sum(time.perf_counter() - a.lost_at for a in self.arms.values() if not a.up)
+        return {
+            'faults': dict(self.faults),
+            'retries': self.retried,
+            'recovered_retries': self.recovered_retries,
+            'dropped_ticks': self.dropped_ticks,
+            'idle_faults': self.idle_faults,
+            'losses': self.losses,
+            'reconnects': self.reconnects,
+            'reconnect_attempts': self.reconnect_attempts,
+            'downtime_s': self.downtime_s + down,
+            'longest_outage_s': self.longest_outage_s,
+            'down': [name for name, a in self.arms.items() if not a.up],
+        }
+
+def format_recovery(summary):
+    faults = ', '.join(f"{count} {kind}" for kind, count in summary['faults'].items())
+    text = (f"Bus faults: {faults} ({summary['idle_faults']} between ticks)\n"
+            f"Retries: {summary['retries']} ({summary['recovered_retries']} succeeded), "
+            f"dropped ticks: {summary['dropped_ticks']}\n"
+            f"Port losses: {summary['losses']}, reconnects: {summary['reconnects']} "
+            f"({summary['reconnect_attempts']} attempts), downtime {summary['downtime_s'] * 1000:.0f} ms "
+            f"(longest {summary['longest_outage_s'] * 1000:.0f} ms)")
+    if summary['down']:
+        text += f"\nStill down: {', '.join(summary['down'])}"
+    return text
+
+def print_event(message):
+    """Default on_event: one line per loss or reconnect, below the live status line"""
+    print(f"\n🔌 {message}")
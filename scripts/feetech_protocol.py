@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Feetech Protocol
+Dependency-free packet encoding/decoding for the STS3215 serial protocol (protocol 0)
+"""
+
+HEADER = b'\xff\xff'
+BROADCAST_ID = 0xFE
+MAX_ID = 0xFC
+
+INST_PING = 0x01
+INST_READ = 0x02
+INST_WRITE = 0x03
+INST_REG_WRITE = 0x04
+INST_ACTION = 0x05
+INST_SYNC_READ = 0x82
+INST_SYNC_WRITE = 0x83
+
+# Status packet error bits
+ERRBIT_VOLTAGE = 0x01
+ERRBIT_ANGLE = 0x02
+ERRBIT_OVERHEAT = 0x04
+ERRBIT_OVERELE = 0x08
+ERRBIT_OVERLOAD = 0x20
+
+STS3215_MODEL_NUMBER = 777
+
+# data_name: (address, size_byte) -- the STS/SMS series control table
+CONTROL_TABLE = {
+    'Firmware_Major_Version': (0, 1),
+    'Firmware_Minor_Version': (1, 1),
+    'Model_Number': (3, 2),
+    'ID': (5, 1),
+    'Baud_Rate': (6, 1),
+    'Return_Delay_Time': (7, 1),
+    'Response_Status_Level': (8, 1),
+    'Min_Position_Limit': (9, 2),
+    'Max_Position_Limit': (11, 2),
+    'Max_Temperature_Limit': (13, 1),
+    'Max_Voltage_Limit': (14, 1),
+    'Min_Voltage_Limit': (15, 1),
+    'Max_Torque_Limit': (16, 2),
+    'P_Coefficient': (21, 1),
+    'D_Coefficient': (22, 1),
+    'I_Coefficient': (23, 1),
+    'Homing_Offset': (31, 2),
+    'Operating_Mode': (33, 1),
+    'Torque_Enable': (40, 1),
+    'Acceleration': (41, 1),
+    'Goal_Position': (42, 2),
+    'Goal_Time': (44, 2),
+    'Goal_Velocity': (46, 2),
+    'Torque_Limit': (48, 2),
+    'Lock': (55, 1),
+    'Present_Position': (56, 2),
+    'Present_Velocity': (58, 2),
+    'Present_Load': (60, 2),
+    'Present_Voltage': (62, 1),
+    'Present_Temperature': (63, 1),
+    'Status': (65, 1),
+    'Moving': (66, 1),
+    'Present_Current': (69, 2),
+    'Maximum_Acceleration': (85, 1),
+}
+CONTROL_TABLE_SIZE = 86
+
+# Sign-magnitude bit of the signed registers
+SIGN_BITS = {
+    'Homing_Offset': 11,
+    'Goal_Position': 15,
+    'Goal_Velocity': 15,
+    'Present_Position': 15,
+    'Present_Velocity': 15,
+    'Present_Load': 10,
+}
+
+# Baud_Rate register value -> bits per second
+BAUDRATE_TABLE = {
+    0: 1_000_000,
+    1: 500_000,
+    2: 250_000,
+    3: 128_000,
+    4: 115_200,
+    5: 57_600,
+    6: 38_400,
+    7: 19_200,
+}
+
+# Status packet without parameters: FF FF ID LEN ERR CHK
+STATUS_OVERHEAD = 6
+
+def checksum(body):
+    """Feetech checksum over ID, LEN, INST/ERR and params"""
+    return ~sum(body) & 0xFF
+
+def encode_packet(id_, code, params=b''):
+    """Encode an instruction (code=INST_*) or status (code=error byte) packet"""
+    body = bytes((id_, len(params) + 2, code)) + bytes(params)
+    return HEADER + body + bytes((checksum(body),))
+
+def encode_instruction(id_, instruction, params=b''):
+    return encode_packet(id_, instruction, params)
+
+def encode_status(id_, error=0, params=b''):
+    return encode_packet(id_, error, params)
+
+def encode_sync_read(address, length, ids):
+    return encode_packet(BROADCAST_ID, INST_SYNC_READ, bytes((address, length, *ids)))
+
+def encode_sync_write(address, length, ids_data):
+    """ids_data: {motor_id: bytes of `length` bytes}"""
+    params = bytearray((address, length))
+    for id_, data in ids_data.items():
+        params.append(id_)
+        params += data
+    return encode_packet(BROADCAST_ID, INST_SYNC_WRITE, params)
+
+def encode_sign_magnitude(value, sign_bit):
+    return ((1 << sign_bit) | -value) if value < 0 else value
+
+def decode_sign_magnitude(value, sign_bit):
+    magnitude = value & ((1 << sign_bit) - 1)
+    return -magnitude if value & (1 << sign_bit) else magnitude
+
+def encode_register(data_name, value):
+    """Raw register value to write, sign-magnitude encoded where the register is signed"""
+    sign_bit = SIGN_BITS.get(data_name)
+    return encode_sign_magnitude(int(value), sign_bit) if sign_bit is not None else int(value)
+
+def decode_register(data_name, value):
+    """Register value as read, sign-magnitude decoded where the register is signed"""
+    sign_bit = SIGN_BITS.get(data_name)
+    return decode_sign_magnitude(value, sign_bit) if sign_bit is not None else value
+
+def to_bytes(value, length):
+    """Little-endian register bytes"""
+    return int(value).to_bytes(length, 'little')
+
+def from_bytes(data):
+    return int.from_bytes(data, 'little')
+
+def wire_time(n_bytes, baudrate):
+    """Seconds needed to shift n_bytes over the UART (8N1 = 10 bits per byte)"""
+    return n_bytes * 10.0 / baudrate
+
+class PacketParser:
+    """
+    Incremental parser for a Feetech byte stream.
+
+    feed() returns the complete packets found so far as (id, code, params)
+    tuples; garbage before a header and packets with a bad checksum are
+    dropped and counted.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.corrupt = 0
+
+    def feed(self, data):
+        self.buffer += data
+        packets = []
+        buf = self.buffer
+        while True:
+            start = buf.find(HEADER)
+            if start < 0:
+                # Keep a trailing 0xFF, it may be the first half of a header
+                del buf[:-1 if buf.endswith(b'\xff') else len(buf)]
+                break
+            if start:
+                del buf[:start]
+            # Consecutive 0xFF bytes: the header is the last pair before the ID
+            if len(buf) > 2 and buf[2] == 0xFF:
+                del buf[0]
+                continue
+            if len(buf) < 4:
+                break
+            total = buf[3] + 4
+            if buf[3] < 2:
+                self.corrupt += 1
+                del buf[:2]
+                continue
+            if len(buf) < total:
+                break
+            body = bytes(buf[2:total - 1])
+            if checksum(body) == buf[total - 1]:
+                packets.append((body[0], body[2], body[3:]))
+            else:
+                self.corrupt += 1
+            del buf[:total]
+        return packets
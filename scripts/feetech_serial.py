@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Feetech Serial Transport
+Minimal blocking Feetech access over pyserial, for tools that must start fast
+
+Only feetech_protocol and pyserial are imported (no numpy, no lerobot), so
+pinging a servo or dropping torque does not pay for the teleop stack.
+Values are raw register values with sign-magnitude decoding, like
+FeetechMotorsBus with normalize=False.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from feetech_protocol import (
+    CONTROL_TABLE,
+    INST_PING,
+    INST_READ,
+    INST_WRITE,
+    STATUS_OVERHEAD,
+    PacketParser,
+    decode_register,
+    encode_instruction,
+    encode_register,
+    encode_sync_read,
+    encode_sync_write,
+    from_bytes,
+    to_bytes,
+    wire_time,
+)
+
+DEFAULT_BAUDRATE = 1_000_000
+
+# Same reply window as scservo_sdk: twice the 16 ms USB latency timer plus 2 ms
+REPLY_TIMEOUT_MS = 2 * 16.0 + 2.0
+
+# Per-port settings recorded by bus_tuner.py --apply; a tuned reply timeout becomes the default
+TUNING_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config', 'bus_tuning.json')
+
+# Where bus_daemon.py listens; kept here so callers can name it without importing the daemon (Unix only)
+DEFAULT_SOCKET = os.environ.get('SO101_BUS_SOCKET', os.path.join(tempfile.gettempdir(), 'so101-bus.sock'))
+
+_tuning_cache = {}
+
+def load_tuning(path=TUNING_PATH):
+    """{port: settings} recorded by bus_tuner.py --apply; {} when nothing was tuned or the file is unreadable"""
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _tuning_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path) as f:
+            tuning = json.load(f)
+    except (OSError, ValueError):
+        tuning = {}
+    _tuning_cache[path] = (mtime, tuning)
+    return tuning
+
+def tuned_timeout_ms(port, path=TUNING_PATH):
+    """Reply timeout bus_tuner.py recorded for this port, REPLY_TIMEOUT_MS if it has none"""
+    return load_tuning(path).get(port, {}).get('timeout_ms') or REPLY_TIMEOUT_MS
+
+class FeetechRegisters:
+    """
+    Register access on top of a transact(packet, reply_ids, reply_params, timeout_ms) method.
+
+    Shared by every transport that moves raw Feetech packets (a local
+    serial port or the bus daemon); subclasses provide transact() and port.
+    """
+
+    def ping(self, id_, timeout_ms=None):
+        """Model number of a motor, or None if it does not answer"""
+        if id_ not in self.transact(encode_instruction(id_, INST_PING), (id_,), timeout_ms=timeout_ms):
+            return None
+        try:
+            return self.read('Model_Number', id_)
+        except ConnectionError:
+            return None
+
+    def read(self, data_name, id_):
+        addr, length = CONTROL_TABLE[data_name]
+        replies = self.transact(encode_instruction(id_, INST_READ, bytes((addr, length))), (id_,), length)
+        if id_ not in replies:
+            raise ConnectionError(f"Failed to read '{data_name}' on id_={id_} on {self.port}")
+        return decode_register(data_name, from_bytes(replies[id_]))
+
+    def write(self, data_name, id_, value):
+        addr, length = CONTROL_TABLE[data_name]
+        packet = encode_instruction(id_, INST_WRITE, bytes((addr,)) + to_bytes(encode_register(data_name, value), length))
+        if id_ not in self.transact(packet, (id_,)):
+            raise ConnectionError(f"Failed to write '{data_name}' on id_={id_} on {self.port}")
+
+    def sync_read(self, data_name, ids):
+        """{id: value} for the IDs that answered one sync read"""
+        addr, length = CONTROL_TABLE[data_name]
+        replies = self.transact(encode_sync_read(addr, length, ids), ids, length)
+        return {id_: decode_register(data_name, from_bytes(replies[id_])) for id_ in ids if id_ in replies}
+
+    def sync_write(self, data_name, values):
+        """Broadcast {id: value} in one packet (no status replies)"""
+        addr, length = CONTROL_TABLE[data_name]
+        self.transact(encode_sync_write(addr, length, {
+            id_: to_bytes(encode_register(data_name, value), length) for id_, value in values.items()
+        }))
+
+class FeetechSerial(FeetechRegisters):
+    """
+    One serial port speaking the Feetech protocol, one transaction at a time.
+
+    Without timeout_ms the port's tuned reply timeout from
+    config/bus_tuning.json is used, else REPLY_TIMEOUT_MS.
+    """
+
+    def __init__(self, port, baudrate=DEFAULT_BAUDRATE, timeout_ms=None):
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout_ms = tuned_timeout_ms(port) if timeout_ms is None else timeout_ms
+        self.serial = None
+        self.status_errors = {}
+        self._parser = PacketParser()
+        self._owned = True
+
+    @classmethod
+    def wrap(cls, ser, timeout_ms=None):
+        """Speak over an already open pyserial port (e.g. a FeetechMotorsBus port_handler.ser) without owning it"""
+        transport = cls(ser.port, ser.baudrate, timeout_ms)
+        transport.serial = ser
+        transport._owned = False
+        return transport
+
+    @property
+    def corrupt_packets(self):
+        """Replies dropped so far for a bad checksum or length"""
+        return self._parser.corrupt
+
+    def open(self):
+        import serial
+
+        self.serial = serial.Serial(self.port, self.baudrate, timeout=0)
+        self.serial.reset_input_buffer()
+        return self
+
+    def close(self):
+        if self.serial is not None:
+            if self._owned:
+                self.serial.close()
+            self.serial = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def transact(self, packet, reply_ids=(), reply_params=0, timeout_ms=None):
+        """Send one packet; returns {id: params} for reply_ids (missing IDs are left out on timeout)"""
+        if self.serial is None:
+            raise ConnectionError(f"{self.port} is not open")
+        self._parser.buffer.clear()
+        self.serial.reset_input_buffer()
+        self.serial.write(packet)
+        pending = set(reply_ids)
+        replies = {}
+        if not pending:
+            return replies
+        reply_bytes = len(pending) * (STATUS_OVERHEAD + reply_params)
+        deadline = time.perf_counter() + wire_time(len(packet) + reply_bytes, self.baudrate) + \
+            (self.timeout_ms if timeout_ms is None else timeout_ms) / 1000
+        ser = self.serial
+        try:
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                ser.timeout = remaining
+                data = ser.read(ser.in_waiting or 1)
+                for id_, code, params in self._parser.feed(data):
+                    if id_ in pending:
+                        if code:
+                            self.status_errors[id_] = code
+                        replies[id_] = params
+                        pending.discard(id_)
+        finally:
+            # Non-blocking again, the way scservo_sdk expects a shared port
+            ser.timeout = 0
+        return replies
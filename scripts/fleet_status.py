@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Fleet Status Board
+Shared-memory table where each teleop worker process publishes its live status
+
+One fixed-size row per leader/follower pair. A worker only ever writes its
+own row and the supervisor reads every row straight out of shared memory,
+so rendering the board costs no IPC round trips. Rows are guarded by a
+sequence counter (odd while a write is in progress) so a reader never
+shows a half-updated row.
+"""
+
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Latency stages published per pair (p50/p99)
+STATUS_STAGES = ('read', 'map', 'write')
+
+IDLE, CONNECTING, RUNNING, STOPPED, FAILED = range(5)
+STATE_NAMES = ('idle', 'connecting', 'running', 'stopped', 'failed')
+
+STATUS_DTYPE = np.dtype([
+    ('seq', '<u8'),
+    ('pid', '<i4'),
+    ('core', '<i4'),
+    ('state', '<i4'),
+    ('restarts', '<i4'),
+    ('ticks', '<u8'),
+    ('rate_hz', '<f8'),
+    ('jitter_ms', '<f8'),
+    ('overruns', '<u8'),
+    ('skipped', '<u8'),
+    ('faults', '<u8'),         # bus faults seen by the pair's FaultRecovery, across restarts
+    ('reconnects', '<u8'),
+    ('crashes', '<i4'),        # worker processes that died with an error
+    ('p50_ms', '<f4', (len(STATUS_STAGES),)),
+    ('p99_ms', '<f4', (len(STATUS_STAGES),)),
+    ('updated', '<f8'),        # time.time() of the last publish
+])
+
+# A running row not updated for this long is shown as stale
+STALE_AFTER_S = 3.0
+
+class FleetStatusBoard:
+    """
+    N status rows in a named shared memory block.
+
+    The supervisor creates the board (create=True) and unlinks it on close;
+    workers attach by name and publish into their own row.
+    """
+
+    def __init__(self, n_rows, name=None, create=False):
+        size = max(n_rows, 1) * STATUS_DTYPE.itemsize
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self._owner = create
+        self.name = self._shm.name
+        self.rows = np.ndarray((n_rows,), dtype=STATUS_DTYPE, buffer=self._shm.buf)
+        if create:
+            self.rows[:] = 0
+            self.rows['core'] = -1
+
+    @classmethod
+    def attach(cls, name, n_rows):
+        return cls(n_rows, name=name)
+
+    def close(self):
+        if self.rows is None:
+            return
+        self.rows = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def update(self, row, **fields):
+        """Write fields of one row (single writer per row)"""
+        rec = self.rows[row]
+        rec['seq'] += 1
+        for key, value in fields.items():
+            rec[key] = value
+        rec['updated'] = time.time()
+        rec['seq'] += 1
+
+    def publish_engine(self, row, engine, last, base=(0, 0)):
+        """
+        Publish a running engine's counters; `last` holds (ticks, time) of the previous publish.
+
+        base is the (faults, reconnects) of earlier runs of this row's
+        worker, to which the engine's FaultRecovery counters are added.
+        """
+        now = time.perf_counter()
+        stats = engine.stats
+        ticks = stats.count + 1 if stats.count else 0
+        prev_ticks, prev_time = last
+        rate = (ticks - prev_ticks) / (now - prev_time) if now > prev_time else 0.0
+        latency = engine.latency
+        faults, reconnects = base
+        recovery = engine.recovery
+        if recovery is not None:
+            faults += sum(recovery.faults.values())
+            reconnects += recovery.reconnects
+        self.update(row, state=RUNNING, ticks=ticks, rate_hz=rate, jitter_ms=stats.jitter * 1000,
+                    overruns=stats.overruns, skipped=stats.skipped, faults=faults, reconnects=reconnects,
+                    p50_ms=[latency[s].percentile(50) / 1000 for s in STATUS_STAGES],
+                    p99_ms=[latency[s].percentile(99) / 1000 for s in STATUS_STAGES])
+        return ticks, now
+
+    def snapshot(self, retries=10):
+        """Consistent copy of every row (rows mid-write are re-read)"""
+        out = self.rows.copy()
+        for i in range(len(out)):
+            for _ in range(retries):
+                seq = out[i]['seq']
+                if seq % 2 == 0 and self.rows[i]['seq'] == seq:
+                    break
+                out[i] = self.rows[i]
+        return out
+
+def render(snapshot, names):
+    """Board as text lines, one per pair"""
+    now = time.time()
+    stages = '/'.join(STATUS_STAGES)
+    lines = [f"{'pair':<12} {'state':<10} {'pid':>7} {'core':>4} {'Hz':>7} {'jitter':>7} {'overrun':>7} "
+             f"{'faults':>6} {'reconn':>6} {'crash':>5} {'restart':>7}  p50|p99 ms {stages}"]
+    for name, row in zip(names, snapshot):
+        state = STATE_NAMES[row['state']]
+        if row['state'] == RUNNING and now - row['updated'] > STALE_AFTER_S:
+            state = 'stale'
+        p50 = '/'.join(f"{v:.2f}" for v in row['p50_ms'])
+        p99 = '/'.join(f"{v:.2f}" for v in row['p99_ms'])
+        lines.append(f"{name:<12} {state:<10} {row['pid']:>7} {row['core']:>4} {row['rate_hz']:>7.1f} "
+                     f"{row['jitter_ms']:>7.3f} {row['overruns']:>7} {row['faults']:>6} {row['reconnects']:>6} "
+                     f"{row['crashes']:>5} {row['restarts']:>7}  "
+                     f"{p50} | {p99}")
+    return lines
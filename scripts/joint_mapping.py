@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Joint Mapping
+Precomputed leader raw ticks -> follower goal ticks transform with ID remapping
+
+config/joint_mapping.json says which motor ID drives each physical joint on
+each arm, so a swapped arm (e.g. wrist_roll/gripper on IDs 6/5) is fixed by
+editing the mapping instead of recalibrating. Calibration entries follow the
+motor ID, not the joint name they were saved under.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from calibration_store import StoredCalibration, load_stored
+from calibration_tables import RESOLUTION, CompiledCalibration
+from so101_bus import DEFAULT_MOTOR_IDS, JOINT_NAMES
+
+DEFAULT_MAPPING_PATH = Path(__file__).resolve().parent.parent / "config" / "joint_mapping.json"
+
+def load_mapping(path=None):
+    """Read {'leader': {joint: motor_id}, 'follower': {joint: motor_id}}, identity if the file is missing"""
+    path = Path(path) if path else DEFAULT_MAPPING_PATH
+    if not path.exists():
+        return {'leader': dict(DEFAULT_MOTOR_IDS), 'follower': dict(DEFAULT_MOTOR_IDS)}
+    with open(path) as f:
+        mapping = json.load(f)
+    for arm in ('leader', 'follower'):
+        ids = mapping.get(arm, DEFAULT_MOTOR_IDS)
+        if len(set(ids.values())) != len(ids):
+            raise ValueError(f"Duplicate motor IDs in the {arm} mapping of {path}: {ids}")
+        mapping[arm] = ids
+    return mapping
+
+def save_arm_mapping(arm, joint_ids, path=None):
+    """Replace one arm's {joint: motor_id} table in the mapping file, keeping the other arm"""
+    path = Path(path) if path else DEFAULT_MAPPING_PATH
+    mapping = load_mapping(path)
+    mapping[arm] = {joint: int(joint_ids[joint]) for joint in JOINT_NAMES}
+    with open(path, 'w') as f:
+        json.dump(mapping, f, indent=2)
+        f.write('\n')
+
+def _calibration_by_joint(calibration, motor_ids, joint_names):
+    """Re-key a calibration dict by physical joint using the motor ID of each entry"""
+    by_id = {cal['id']: cal for cal in calibration.values()}
+    missing = [motor_ids[j] for j in joint_names if motor_ids[j] not in by_id]
+    if missing:
+        raise ValueError(f"No calibration entry for motor IDs {missing}")
+    return {joint: by_id[motor_ids[joint]] for joint in joint_names}
+
+def _compile(calibration, motor_ids, norm_modes, joint_names):
+    """CompiledCalibration in physical joint order; a StoredCalibration brings its coefficients precomputed"""
+    if isinstance(calibration, StoredCalibration):
+        return calibration.compiled(norm_modes, joint_names, [motor_ids[j] for j in joint_names])
+    return CompiledCalibration(_calibration_by_joint(calibration, motor_ids, joint_names), norm_modes, joint_names)
+
+class JointMapping:
+    """
+    Leader raw ticks -> follower goal ticks for every physical joint.
+
+    The two-step leader normalize / follower unnormalize is collapsed into
+    one per-joint table of 4096 goal ticks, so a tick is a single gather;
+    the table is built with lerobot's own float operations and matches its
+    goals exactly. apply_float() is the equivalent fused affine for
+    non-integer input (e.g. filtered or extrapolated leader positions); it
+    rounds differently and can be one tick off where the goal falls on an
+    integer.
+
+    Each calibration is a {joint: {...}} dict or a calibration_store
+    StoredCalibration, whose precomputed coefficients are used as they are.
+    """
+
+    def __init__(self, leader_calibration, follower_calibration, leader_ids=None, follower_ids=None,
+                 norm_modes=None, joint_names=JOINT_NAMES):
+        self.joint_names = list(joint_names)
+        leader_ids = leader_ids or DEFAULT_MOTOR_IDS
+        follower_ids = follower_ids or DEFAULT_MOTOR_IDS
+        self.leader_ids = [leader_ids[j] for j in self.joint_names]
+        self.follower_ids = [follower_ids[j] for j in self.joint_names]
+
+        self.leader = _compile(leader_calibration, leader_ids, norm_modes, self.joint_names)
+        self.follower = _compile(follower_calibration, follower_ids, norm_modes, self.joint_names)
+
+        leader, follower = self.leader, self.follower
+
+        # Exact table: lerobot's normalize/unnormalize float operations, per raw tick
+        ticks = np.broadcast_to(np.arange(RESOLUTION, dtype=np.float64), (len(self.joint_names), RESOLUTION))
+        self.table = follower.to_raw_exact(leader.to_normalized_exact(ticks)).reshape(-1)
+
+        # Fused affine: goal = trunc(clip(raw, lo, hi) * gain + bias)
+        self.gain = leader.scale * follower.inv_scale
+        self.bias = leader.offset * follower.inv_scale + follower.inv_offset
+        with np.errstate(invalid='ignore'):
+            bound_a = (follower.norm_lo - leader.offset) / leader.scale
+            bound_b = (follower.norm_hi - leader.offset) / leader.scale
+        self.raw_lo = np.maximum(leader.raw_lo, np.minimum(bound_a, bound_b))
+        self.raw_hi = np.minimum(leader.raw_hi, np.maximum(bound_a, bound_b))
+
+        n = len(self.joint_names)
+        # Flat table index bounds of each joint's row
+        self._offsets = np.arange(n, dtype=np.intp) * RESOLUTION
+        self._row_last = self._offsets + RESOLUTION - 1
+        self._index = np.empty(n, dtype=np.intp)
+        self._work = np.empty(n)
+
+    @classmethod
+    def from_files(cls, leader_path, follower_path, mapping_path=None, norm_modes=None, joint_names=JOINT_NAMES):
+        mapping = load_mapping(mapping_path)
+        # Validated and precompiled by the calibration store; the JSON is only parsed after it changes
+        return cls(load_stored(leader_path), load_stored(follower_path),
+                   mapping['leader'], mapping['follower'], norm_modes, joint_names)
+
+    @classmethod
+    def from_buses(cls, leader_bus, follower_bus, mapping_path=None, joint_names=JOINT_NAMES):
+        """Build from the calibration and norm modes already loaded on two MotorsBus instances"""
+        mapping = load_mapping(mapping_path)
+        norm_modes = {name: motor.norm_mode for name, motor in follower_bus.motors.items()}
+        return cls({n: vars(c) for n, c in leader_bus.calibration.items()},
+                   {n: vars(c) for n, c in follower_bus.calibration.items()},
+                   mapping['leader'], mapping['follower'], norm_modes, joint_names)
+
+    def apply(self, raw, out=None):
+        """Leader raw ticks (N,) -> follower goal ticks (N,) through the precomputed table"""
+        out = np.empty(len(self._offsets), dtype=np.int32) if out is None else out
+        index = self._index
+        np.add(raw, self._offsets, out=index)
+        np.maximum(index, self._offsets, out=index)
+        np.minimum(index, self._row_last, out=index)
+        np.take(self.table, index, out=out)
+        return out
+
+    def apply_float(self, raw, out=None):
+        """Same transform for float leader positions, via the fused affine coefficients (within one tick)"""
+        out = np.empty(len(self._offsets), dtype=np.int32) if out is None else out
+        work = self._work
+        np.maximum(raw, self.raw_lo, out=work)
+        np.minimum(work, self.raw_hi, out=work)
+        np.multiply(work, self.gain, out=work)
+        np.add(work, self.bias, out=work)
+        np.copyto(out, work, casting='unsafe')
+        return out
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Latency Histograms
+Preallocated HDR-style (log-linear) histograms for hot-path timing
+"""
+
+import json
+
+# 2**SUB_BUCKET_BITS linear sub-buckets per power of two (~3% worst-case error)
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKET_COUNT = SUB_BUCKET_COUNT >> 1
+
+# Values are recorded in microseconds, clamped to 10 s
+MAX_VALUE_US = 10_000_000
+
+def _bucket_index(value):
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKET_COUNT + (shift - 1) * HALF_SUB_BUCKET_COUNT + (value >> shift) - HALF_SUB_BUCKET_COUNT
+
+def _bucket_bounds(index):
+    """Return the [low, high) value range covered by a bucket"""
+    if index < SUB_BUCKET_COUNT:
+        return index, index + 1
+    shift, offset = divmod(index - SUB_BUCKET_COUNT, HALF_SUB_BUCKET_COUNT)
+    shift += 1
+    low = (offset + HALF_SUB_BUCKET_COUNT) << shift
+    return low, low + (1 << shift)
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram; record() only touches preallocated slots"""
+
+    def __init__(self, max_value=MAX_VALUE_US):
+        self.max_value = max_value
+        self.counts = [0] * (_bucket_index(max_value) + 1)
+        self.reset()
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.min = self.max_value
+        self.max = 0
+
+    def record(self, value):
+        """Record one sample in microseconds"""
+        if value < 0:
+            value = 0
+        elif value > self.max_value:
+            value = self.max_value
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def record_ns(self, value_ns):
+        self.record(value_ns // 1000)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct):
+        """Upper bound (us) of the bucket holding the pct-th percentile"""
+        if not self.count:
+            return 0
+        target = max(1, round(self.count * pct / 100.0))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(_bucket_bounds(index)[1] - 1, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'min_us': self.min if self.count else 0,
+            'mean_us': round(self.mean, 1),
+            'p50_us': self.percentile(50),
+            'p90_us': self.percentile(90),
+            'p99_us': self.percentile(99),
+            'p999_us': self.percentile(99.9),
+            'max_us': self.max,
+            # Sparse [low_us, high_us, count] triples of the non-empty buckets
+            'buckets': [[*_bucket_bounds(i), c] for i, c in enumerate(self.counts) if c],
+        }
+
+def format_line(histograms):
+    """One-line live summary: p50/p99 in ms for every stage"""
+    parts = []
+    for stage, hist in histograms.items():
+        parts.append(f"{stage} {hist.percentile(50) / 1000:.2f}/{hist.percentile(99) / 1000:.2f}")
+    return "p50/p99 ms | " + " | ".join(parts)
+
+def dump_json(path, histograms, extra=None):
+    """Write every stage histogram (plus optional run metadata) as JSON"""
+    data = {'stages': {stage: hist.to_dict() for stage, hist in histograms.items()}}
+    if extra:
+        data.update(extra)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=4)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Leader Predictor
+One-Euro filter plus extrapolation of the leader joint vector, to hide the read -> write -> servo lag
+
+The follower reaches a goal one pipeline latency after the leader was
+sampled (bus read, mapping, bus write, then the servo's own response).
+LeaderPredictor sits between the leader read and JointMapping.apply_float:
+it smooths the tick-level noise of the leader positions with a One-Euro
+filter (heavy smoothing at rest, little lag when moving fast) and
+extrapolates the filtered position by that latency with a constant
+velocity or constant acceleration model. Every step is an in-place array
+operation over all joints; nothing is allocated per tick.
+"""
+
+import math
+
+import numpy as np
+
+# One-Euro knobs: cutoff at rest (Hz), cutoff increase per tick/s of speed, derivative cutoff (Hz)
+DEFAULT_MIN_CUTOFF = 1.0
+DEFAULT_BETA = 0.1
+DEFAULT_D_CUTOFF = 10.0
+
+# Extrapolation models
+MODES = ('none', 'velocity', 'acceleration')
+DEFAULT_MODE = 'velocity'
+
+# Servo response on top of the measured read -> write time (the STS3215 starts moving ~1 control cycle later)
+DEFAULT_SERVO_LAG_S = 0.005
+
+# Never extrapolate further than this, whatever the measured latency
+MAX_LEAD_S = 0.05
+
+# Ticks of history the velocity is measured over (longer = less noise, more lag)
+DEFAULT_VELOCITY_WINDOW = 3
+
+# Smoothing of the measured pipeline latency
+LATENCY_EWMA = 0.05
+
+class LeaderPredictor:
+    """
+    Filter and extrapolate leader raw positions, vectorized over joints.
+
+    update(raw, t) takes the raw tick vector sampled at perf_counter time
+    t and returns the predicted position (float ticks) lead seconds later.
+    lead is lead_s when given, else the measured pipeline latency (fed by
+    observe_pipeline()) plus servo_lag_s, capped at MAX_LEAD_S.
+    """
+
+    def __init__(self, n_joints, min_cutoff=DEFAULT_MIN_CUTOFF, beta=DEFAULT_BETA, d_cutoff=DEFAULT_D_CUTOFF,
+                 mode=DEFAULT_MODE, lead_s=None, servo_lag_s=DEFAULT_SERVO_LAG_S,
+                 velocity_window=DEFAULT_VELOCITY_WINDOW):
+        if mode not in MODES:
+            raise ValueError(f"Unknown prediction mode '{mode}', expected one of {MODES}")
+        if min_cutoff <= 0:
+            raise ValueError("min_cutoff must be positive")
+        if velocity_window < 1:
+            raise ValueError("velocity_window must be at least 1 tick")
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.mode = mode
+        self.lead_s = lead_s
+        self.servo_lag_s = servo_lag_s
+        self.pipeline_s = 0.0
+        # Ring of the last velocity_window + 1 raw vectors and their times
+        self.history = np.zeros((velocity_window + 1, n_joints))
+        self.times = np.zeros(velocity_window + 1)
+        self.count = 0
+        # Filter state and per-tick work buffers
+        self.position = np.zeros(n_joints)
+        self.velocity = np.zeros(n_joints)
+        self.acceleration = np.zeros(n_joints)
+        self.prediction = np.zeros(n_joints)
+        self._dv = np.zeros(n_joints)
+        self._alpha = np.zeros(n_joints)
+        self._work = np.zeros(n_joints)
+
+    @property
+    def lead(self):
+        """Seconds the output is extrapolated ahead of the sample"""
+        if self.mode == 'none':
+            return 0.0
+        lead = self.lead_s if self.lead_s is not None else self.pipeline_s + self.servo_lag_s
+        return min(lead, MAX_LEAD_S)
+
+    def reset(self):
+        self.count = 0
+        self.velocity.fill(0.0)
+        self.acceleration.fill(0.0)
+
+    def observe_pipeline(self, seconds):
+        """Feed one measured sample -> goal written latency"""
+        if self.pipeline_s == 0.0:
+            self.pipeline_s = seconds
+        else:
+            self.pipeline_s += LATENCY_EWMA * (seconds - self.pipeline_s)
+
+    def update(self, raw, t, out=None):
+        """Raw leader ticks sampled at time t -> predicted float ticks (out, or an internal buffer)"""
+        out = self.prediction if out is None else out
+        size = len(self.times)
+        slot = self.count % size
+        np.copyto(self.history[slot], raw)
+        self.times[slot] = t
+        self.count += 1
+        if self.count == 1:
+            np.copyto(self.position, self.history[slot])
+            np.copyto(out, self.position)
+            return out
+
+        previous_t = self.times[(slot - 1) % size]
+        dt = t - previous_t
+        if dt <= 0:
+            np.copyto(out, self.position)
+            return out
+
+        # Velocity over the oldest vector still in the window, low-passed at d_cutoff
+        oldest = (slot - min(self.count - 1, size - 1)) % size
+        work = self._work
+        np.subtract(self.history[slot], self.history[oldest], out=work)
+        work /= t - self.times[oldest]
+        a_d = _alpha(self.d_cutoff, dt)
+        dv = self._dv
+        np.subtract(work, self.velocity, out=dv)
+        dv *= a_d
+        self.velocity += dv
+        if self.mode == 'acceleration':
+            # dv is the velocity change of this tick; low-pass it as an acceleration
+            dv /= dt
+            dv -= self.acceleration
+            dv *= a_d
+            self.acceleration += dv
+
+        # One-Euro: the position cutoff rises with speed
+        alpha = self._alpha
+        np.abs(self.velocity, out=alpha)
+        alpha *= self.beta
+        alpha += self.min_cutoff
+        # alpha = 1 / (1 + tau / dt) with tau = 1 / (2 pi cutoff)
+        alpha *= 2 * math.pi * dt
+        _one_euro_alpha(alpha)
+        np.subtract(self.history[slot], self.position, out=work)
+        work *= alpha
+        self.position += work
+
+        lead = self.lead
+        np.multiply(self.velocity, lead, out=work)
+        np.add(self.position, work, out=out)
+        if self.mode == 'acceleration':
+            np.multiply(self.acceleration, 0.5 * lead * lead, out=work)
+            out += work
+        return out
+
+def _alpha(cutoff, dt):
+    """Exponential smoothing factor of a first-order low-pass at cutoff Hz sampled every dt"""
+    r = 2 * math.pi * cutoff * dt
+    return r / (r + 1.0)
+
+def _one_euro_alpha(r):
+    """In place r -> r / (r + 1), where r = 2 pi cutoff dt"""
+    np.reciprocal(r, out=r)
+    r += 1.0
+    np.reciprocal(r, out=r)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Motion Primitives
+Closed-loop "move and wait": write goals, then poll until every joint arrives or stalls
+
+Instead of sleeping a fixed time after a goal write, move_and_settle polls
+Present_Position of every joint with one sync read per poll, as fast as
+the bus answers, and returns as soon as all moved joints are within
+tolerance. A joint that stops making progress is reported as stalled right
+away instead of costing the whole timeout.
+"""
+
+import time
+
+import numpy as np
+
+# Ticks from the goal that count as arrived (4096 ticks per turn, 20 ~ 1.8 degrees)
+SETTLE_TOLERANCE = 20
+
+# Upper bound for a whole move; a joint still travelling at the deadline is reported as timed out
+SETTLE_TIMEOUT_S = 3.0
+
+# A joint outside tolerance that moves less than STALL_TICKS over STALL_WINDOW_S is stalled
+STALL_WINDOW_S = 0.3
+STALL_TICKS = 5
+
+# Consecutive failed polls tolerated before the bus error is raised
+MAX_POLL_ERRORS = 3
+
+class SettleResult:
+    """Outcome and timing of one move_and_settle call"""
+
+    def __init__(self, joint_names, moved, goals, start_positions):
+        self.joint_names = joint_names
+        self.moved = moved
+        self.goals = goals
+        self.start_positions = start_positions
+        self.positions = start_positions.copy()
+        self.settle_times = {}
+        self.stalled = []
+        self.timed_out = []
+        self.elapsed = 0.0
+        self.polls = 0
+        self.poll_errors = 0
+        self.write_time = 0.0
+
+    @property
+    def settled(self):
+        """True when every moved joint reached its goal"""
+        return not self.stalled and not self.timed_out
+
+    @property
+    def errors(self):
+        """Goal minus final position of every joint, in ticks"""
+        return self.goals - self.positions
+
+    def error(self, joint_name):
+        return int(self.errors[self.joint_names.index(joint_name)])
+
+    @property
+    def poll_rate(self):
+        return self.polls / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        """One line report: outcome, per-joint settle times and the poll rate"""
+        parts = [f"{name} {self.settle_times[name] * 1000:.0f} ms" for name in self.moved if name in self.settle_times]
+        parts += [f"{name} STALLED ({self.error(name):+d})" for name in self.stalled]
+        parts += [f"{name} TIMEOUT ({self.error(name):+d})" for name in self.timed_out]
+        status = "✅ settled" if self.settled else "⚠️  not settled"
+        return (f"{status} in {self.elapsed * 1000:.0f} ms ({self.polls} polls, {self.poll_rate:.0f} Hz): "
+                f"{', '.join(parts)}")
+
+def move_and_settle(joints, goals, tolerance=SETTLE_TOLERANCE, timeout=SETTLE_TIMEOUT_S,
+                    stall_window=STALL_WINDOW_S, stall_ticks=STALL_TICKS, start_positions=None):
+    """
+    Write goals and wait until the moved joints are within tolerance.
+
+    joints is a JointBus (or PacketJointBus). goals is either a full goal
+    vector (raw ticks, one per joint) or a {joint_name: goal} dict; joints
+    left out of the dict are held at their current position. Returns a
+    SettleResult; nothing is raised for stalled or timed out joints.
+    """
+    names = joints.joint_names
+    if start_positions is None:
+        start_positions = joints.read_positions()
+    start_positions = np.asarray(start_positions, dtype=np.int32)
+    if isinstance(goals, dict):
+        unknown = [name for name in goals if name not in names]
+        if unknown:
+            raise ValueError(f"Unknown joints {unknown}, expected some of {names}")
+        target = start_positions.copy()
+        for name, goal in goals.items():
+            target[names.index(name)] = goal
+        moved = [name for name in names if name in goals]
+    else:
+        target = np.asarray(goals, dtype=np.int32)
+        if len(target) != len(names):
+            raise ValueError(f"Expected {len(names)} goals, got {len(target)}")
+        moved = list(names)
+
+    result = SettleResult(names, moved, target, start_positions)
+    start = time.perf_counter()
+    joints.write_goals(target)
+    result.write_time = time.perf_counter() - start
+
+    pending = {names.index(name): name for name in moved}
+    # Position of every pending joint at the start of its current stall window
+    anchor = {i: (start, int(start_positions[i])) for i in pending}
+    positions = result.positions
+    deadline = start + timeout
+    failed = 0
+    while pending:
+        try:
+            joints.read_positions(positions)
+            failed = 0
+        except ConnectionError:
+            # A lost reply costs one poll, not the move
+            failed += 1
+            result.poll_errors += 1
+            if failed > MAX_POLL_ERRORS:
+                raise
+            continue
+        now = time.perf_counter()
+        result.polls += 1
+        for i, name in list(pending.items()):
+            pos = int(positions[i])
+            if abs(int(target[i]) - pos) <= tolerance:
+                result.settle_times[name] = now - start
+                del pending[i]
+                continue
+            since, anchor_pos = anchor[i]
+            if abs(pos - anchor_pos) >= stall_ticks:
+                anchor[i] = (now, pos)
+            elif now - since >= stall_window:
+                result.stalled.append(name)
+                del pending[i]
+        if now >= deadline:
+            result.timed_out.extend(pending.values())
+            break
+
+    result.elapsed = time.perf_counter() - start
+    return result
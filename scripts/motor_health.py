@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Motor Health Telemetry
+Temperature, supply voltage, load and error status of every motor, sampled in the loop's idle bus time
+
+Present_Load, Present_Voltage, Present_Temperature and Status are one
+6-byte register block, so one sync read samples a whole arm (or a chunk of
+it). HealthSampler is installed as a FixedRateLoop idle task: after each
+tick it issues sync reads only while their measured cost fits both the
+per-tick bus budget and the time left before the next deadline, so the
+control rate is never reduced. With a BusScheduler per arm the reads are
+queued at telemetry priority instead, and the scheduler runs what fits
+before the tick's deadline and drops the rest as deadline misses. Rolling per-motor stats and threshold
+alerts are kept for live alert lines and the end-of-run report.
+"""
+
+import time
+from functools import partial
+
+import numpy as np
+
+from bus_scheduler import PRIORITY_TELEMETRY
+from feetech_protocol import (
+    CONTROL_TABLE,
+    ERRBIT_ANGLE,
+    ERRBIT_OVERELE,
+    ERRBIT_OVERHEAT,
+    ERRBIT_OVERLOAD,
+    ERRBIT_VOLTAGE,
+    SIGN_BITS,
+    STATUS_OVERHEAD,
+    decode_sign_magnitude,
+    encode_sync_read,
+    wire_time,
+)
+from so101_bus import DEFAULT_BAUDRATE, FAULT_TIMEOUT, BusError
+
+# Present_Load (2) .. Status (1): load, voltage, temperature, one unused byte, status
+HEALTH_ADDRESS = CONTROL_TABLE['Present_Load'][0]
+HEALTH_LENGTH = CONTROL_TABLE['Status'][0] + 1 - HEALTH_ADDRESS
+
+# Bus time per tick the sampler may spend, and the margin it leaves before the next deadline
+DEFAULT_BUDGET_MS = 1.0
+DEADLINE_MARGIN_S = 0.0005
+
+# Samples per motor kept for the rolling stats
+DEFAULT_WINDOW = 50
+
+# Alert thresholds for the 12 V STS3215 arms (Max_Temperature_Limit defaults to 70 C)
+TEMP_WARN_C = 55
+VOLTAGE_LOW_V = 11.0
+VOLTAGE_HIGH_V = 13.5
+LOAD_WARN_PCT = 70.0       # rolling mean of |Present_Load|, % of stall torque
+
+# An alert clears once the value is back this far inside the threshold
+HYSTERESIS = {'temperature': 3, 'voltage_low': 0.3, 'voltage_high': 0.3, 'load': 10.0}
+
+ERROR_BITS = {
+    ERRBIT_VOLTAGE: 'voltage',
+    ERRBIT_ANGLE: 'angle',
+    ERRBIT_OVERHEAT: 'overheat',
+    ERRBIT_OVERELE: 'overcurrent',
+    ERRBIT_OVERLOAD: 'overload',
+}
+
+def decode_errors(status):
+    return [name for bit, name in ERROR_BITS.items() if status & bit]
+
+class HealthSampler:
+    """
+    Budgeted background health reads over one or more arms.
+
+    arms maps an arm name to its JointBus (or PacketJointBus). Motors are
+    read in chunks of at most chunk_size per sync read; chunks are visited
+    round robin so every motor is refreshed at the same rate. A chunk whose
+    measured cost exceeds the budget is split in half until it fits.
+    on_error(arm, error), when set, is told about every failed read (e.g.
+    FaultRecovery.report, so a lost port is reconnected). schedulers maps
+    an arm to the BusScheduler of its bus; reads are then submitted with
+    the idle deadline and complete when the scheduler runs as the next
+    idle task.
+    """
+
+    def __init__(self, arms, budget_ms=DEFAULT_BUDGET_MS, window=DEFAULT_WINDOW, chunk_size=None,
+                 baudrate=DEFAULT_BAUDRATE, on_alert=None, on_error=None, schedulers=None):
+        self.budget = budget_ms / 1000
+        self.on_alert = on_alert
+        self.on_error = on_error
+        self.schedulers = schedulers
+        self.labels = []
+        self.chunks = []
+        for arm, joints in arms.items():
+            size = chunk_size or len(joints.ids)
+            for start in range(0, len(joints.ids), size):
+                ids = joints.ids[start:start + size]
+                rows = list(range(len(self.labels), len(self.labels) + len(ids)))
+                self.labels.extend(f"{arm}/{joints.joint_names[start + k]}" for k in range(len(ids)))
+                # First cost guess: the wire time twice over; replaced by measurements after the first read
+                guess = 2 * wire_time(8 + len(ids) + len(ids) * (STATUS_OVERHEAD + HEALTH_LENGTH), baudrate)
+                self.chunks.append(self._chunk(arm, joints, ids, rows, guess))
+        n = len(self.labels)
+        self.window = window
+        self.temperature = np.zeros((n, window), dtype=np.float32)
+        self.voltage = np.zeros((n, window), dtype=np.float32)
+        self.load = np.zeros((n, window), dtype=np.float32)
+        self.status = np.zeros(n, dtype=np.int32)
+        self.samples = np.zeros(n, dtype=np.int64)
+        self.alerts = {}
+        self.reads = 0
+        self.read_errors = 0
+        self.skipped = 0
+        self.over_budget = 0
+        self.missed = 0
+        self.bus_time = 0.0
+        self._next = 0
+
+    @staticmethod
+    def _chunk(arm, joints, ids, rows, cost):
+        return {'arm': arm, 'joints': joints, 'ids': ids, 'rows': rows, 'cost': cost,
+                'packet': encode_sync_read(HEALTH_ADDRESS, HEALTH_LENGTH, ids), 'pending': None}
+
+    def __call__(self, deadline):
+        """FixedRateLoop idle task: sample while the budget and the deadline allow"""
+        spent = 0.0
+        read = 0
+        for _ in range(len(self.chunks)):
+            chunk = self.chunks[self._next]
+            if chunk['cost'] > self.budget:
+                # Never fits: read fewer motors per transaction, or give up on a lone motor
+                if len(chunk['ids']) > 1:
+                    self._split(self._next)
+                    continue
+                # Let the estimate decay so a one-off slow read does not exclude the motor for good
+                self.over_budget += 1
+                chunk['cost'] *= 0.8
+                self._next = (self._next + 1) % len(self.chunks)
+                continue
+            now = time.perf_counter()
+            if spent + chunk['cost'] > self.budget:
+                break
+            if self.schedulers is not None:
+                # The scheduler decides what still fits before the deadline
+                if chunk['pending'] is not None and not chunk['pending'].done:
+                    break
+                chunk['pending'] = self.schedulers[chunk['arm']].submit(
+                    chunk['packet'], chunk['ids'], HEALTH_LENGTH, PRIORITY_TELEMETRY, deadline,
+                    partial(self._finish, chunk))
+                spent += chunk['cost']
+                read += 1
+                self._next = (self._next + 1) % len(self.chunks)
+                continue
+            if now + chunk['cost'] > deadline - DEADLINE_MARGIN_S:
+                break
+            try:
+                data = chunk['joints'].read_block(HEALTH_ADDRESS, HEALTH_LENGTH, chunk['ids'])
+            except (ConnectionError, OSError) as e:
+                # Telemetry is best effort: a lost reply or a failing port must never stop the control loop
+                self.read_errors += 1
+                data = None
+                if self.on_error is not None:
+                    self.on_error(chunk['arm'], e)
+            cost = time.perf_counter() - now
+            spent += cost
+            read += 1
+            # Slow-moving cost estimate; a single slow read should not starve sampling for long
+            chunk['cost'] += 0.2 * (cost - chunk['cost'])
+            self._next = (self._next + 1) % len(self.chunks)
+            if data is not None:
+                self._store(chunk, data)
+        if not read:
+            self.skipped += 1
+        if self.schedulers is None:
+            self.bus_time += spent
+
+    def _finish(self, chunk, txn):
+        """Transaction callback of a scheduled read"""
+        chunk['pending'] = None
+        if txn.missed:
+            self.missed += 1
+            return
+        self.bus_time += txn.elapsed
+        chunk['cost'] += 0.2 * (txn.elapsed - chunk['cost'])
+        error = txn.error
+        if error is None and len(txn.replies) != len(chunk['ids']):
+            missing = [id_ for id_ in chunk['ids'] if id_ not in txn.replies]
+            port = self.schedulers[chunk['arm']].port
+            error = BusError(f"Failed to sync read joints {missing} on {port}", FAULT_TIMEOUT)
+        if error is None:
+            self._store(chunk, txn.replies)
+            return
+        self.read_errors += 1
+        if self.on_error is not None:
+            self.on_error(chunk['arm'], error)
+
+    def _split(self, index):
+        """Replace a chunk by its two halves, each guessed at half the measured cost"""
+        chunk = self.chunks[index]
+        half = len(chunk['ids']) // 2
+        self.chunks[index:index + 1] = [
+            self._chunk(chunk['arm'], chunk['joints'], chunk['ids'][:half], chunk['rows'][:half], chunk['cost'] / 2),
+            self._chunk(chunk['arm'], chunk['joints'], chunk['ids'][half:], chunk['rows'][half:], chunk['cost'] / 2),
+        ]
+
+    def _store(self, chunk, data):
+        self.reads += 1
+        load_bit = SIGN_BITS['Present_Load']
+        for id_, row in zip(chunk['ids'], chunk['rows']):
+            d = data[id_]
+            slot = self.samples[row] % self.window
+            self.load[row, slot] = abs(decode_sign_magnitude(d[0] | d[1] << 8, load_bit)) / 10
+            self.voltage[row, slot] = d[2] / 10
+            self.temperature[row, slot] = d[3]
+            self.status[row] = d[5]
+            self.samples[row] += 1
+            self._check(row)
+
+    def _filled(self, values, row):
+        return values[row, :min(self.samples[row], self.window)]
+
+    def _check(self, row):
+        temperature = self.temperature[row, (self.samples[row] - 1) % self.window]
+        voltage = self.voltage[row, (self.samples[row] - 1) % self.window]
+        load = float(self._filled(self.load, row).mean())
+        self._set_alert(row, 'temperature', temperature >= TEMP_WARN_C,
+                        temperature < TEMP_WARN_C - HYSTERESIS['temperature'], f"{temperature:.0f} °C")
+        self._set_alert(row, 'voltage_low', voltage <= VOLTAGE_LOW_V,
+                        voltage > VOLTAGE_LOW_V + HYSTERESIS['voltage_low'], f"{voltage:.1f} V")
+        self._set_alert(row, 'voltage_high', voltage >= VOLTAGE_HIGH_V,
+                        voltage < VOLTAGE_HIGH_V - HYSTERESIS['voltage_high'], f"{voltage:.1f} V")
+        self._set_alert(row, 'load', load >= LOAD_WARN_PCT,
+                        load < LOAD_WARN_PCT - HYSTERESIS['load'], f"{load:.0f} % mean load")
+        errors = decode_errors(self.status[row])
+        self._set_alert(row, 'status', bool(errors), not errors, ', '.join(errors))
+
+    def _set_alert(self, row, kind, raised, cleared, detail):
+        key = (self.labels[row], kind)
+        if raised and key not in self.alerts:
+            self.alerts[key] = detail
+            if self.on_alert is not None:
+                self.on_alert(self.labels[row], kind, detail, True)
+        elif cleared and key in self.alerts:
+            del self.alerts[key]
+            if self.on_alert is not None:
+                self.on_alert(self.labels[row], kind, detail, False)
+
+    def stats(self):
+        """Rolling {label: {...}} per motor (None for motors not sampled yet)"""
+        out = {}
+        for row, label in enumerate(self.labels):
+            if not self.samples[row]:
+                out[label] = None
+                continue
+            temperature = self._filled(self.temperature, row)
+            voltage = self._filled(self.voltage, row)
+            load = self._filled(self.load, row)
+            out[label] = {
+                'samples': int(self.samples[row]),
+                'temperature_c': float(temperature[(self.samples[row] - 1) % self.window]),
+                'temperature_max_c': float(temperature.max()),
+                'voltage_v': float(voltage[(self.samples[row] - 1) % self.window]),
+                'voltage_min_v': float(voltage.min()),
+                'load_mean_pct': float(load.mean()),
+                'load_max_pct': float(load.max()),
+                'errors': decode_errors(self.status[row]),
+            }
+        return out
+
+    def summary(self, elapsed=None):
+        """Sampler counters; bus share is the fraction of elapsed time spent on health reads"""
+        out = {'reads': self.reads, 'read_errors': self.read_errors, 'skipped_ticks': self.skipped,
+               'over_budget': self.over_budget, 'missed': self.missed, 'chunks': len(self.chunks), 'bus_time_s': self.bus_time, 'active_alerts': len(self.alerts)}
+        if elapsed:
+            out['bus_share'] = self.bus_time / elapsed
+        return out
+
+    def format_report(self):
+        """Per-motor table for the end of a run"""
+        lines = [f"{'motor':<22} {'samples':>7} {'temp':>6} {'max':>5} {'volt':>6} {'min':>5} "
+                 f"{'load%':>6} {'max':>5}  errors"]
+        for label, s in self.stats().items():
+            if s is None:
+                lines.append(f"{label:<22} {'-':>7}")
+                continue
+            lines.append(f"{label:<22} {s['samples']:>7} {s['temperature_c']:>5.0f}C {s['temperature_max_c']:>4.0f}C "
+                         f"{s['voltage_v']:>5.1f}V {s['voltage_min_v']:>4.1f}V {s['load_mean_pct']:>6.1f} "
+                         f"{s['load_max_pct']:>5.1f}  {', '.join(s['errors']) or '-'}")
+        return lines
+
+def print_alert(label, kind, detail, raised):
+    """Default on_alert: one line per alert change, below the live status line"""
+    print(f"\n{'⚠️ ' if raised else '✅'} {label}: {kind} {'alert' if raised else 'cleared'} ({detail})")
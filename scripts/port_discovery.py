@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Port Discovery
+Find which serial port is the leader and which the follower, all ports probed at once
+
+USB serial numbering changes with every replug (COM3/COM4 on Windows,
+/dev/ttyUSB* or /dev/ttyACM* on Linux). Each candidate port gets its own
+worker that sends one sync read of the EEPROM block holding the model
+number, position limits and homing offset of every expected motor, so a
+port answers (or times out) within a single short reply window. The
+limits and offsets LeRobot writes during calibration are then matched
+against calibration/*/leader_arm.json and follower_arm.json to tell the
+arms apart.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+from feetech_protocol import CONTROL_TABLE, SIGN_BITS, decode_sign_magnitude, encode_sync_read, from_bytes
+from feetech_serial import DEFAULT_BAUDRATE, FeetechSerial
+
+DEFAULT_IDS = list(range(1, 7))
+
+# Same layout as calibration_tables.default_calibration_path, without its numpy import (keeps so101 discover fast)
+CALIBRATION_DIRS = {
+    'leader': Path(__file__).resolve().parent.parent / "calibration" / "teleoperators" / "so101_leader",
+    'follower': Path(__file__).resolve().parent.parent / "calibration" / "robots" / "so101_follower",
+}
+
+# Reply window per probe; a present arm answers well inside it
+PROBE_TIMEOUT_MS = 20.0
+
+# EEPROM fields compared with the calibration files (register, calibration key)
+FINGERPRINT_FIELDS = (
+    ('Homing_Offset', 'homing_offset'),
+    ('Min_Position_Limit', 'range_min'),
+    ('Max_Position_Limit', 'range_max'),
+)
+
+# A joint matches when every field is within this many ticks of the calibration file
+MATCH_TOLERANCE = 2
+
+# One block from Model_Number to the end of Homing_Offset
+_BLOCK_START = CONTROL_TABLE['Model_Number'][0]
+_BLOCK_LENGTH = CONTROL_TABLE['Homing_Offset'][0] + CONTROL_TABLE['Homing_Offset'][1] - _BLOCK_START
+
+def candidate_ports():
+    """USB serial ports (ports without a USB vendor ID, like legacy /dev/ttyS*, are skipped)"""
+    from serial.tools import list_ports
+
+    return sorted(p.device for p in list_ports.comports() if p.vid is not None)
+
+def _field(params, data_name):
+    addr, length = CONTROL_TABLE[data_name]
+    value = from_bytes(params[addr - _BLOCK_START:addr - _BLOCK_START + length])
+    sign_bit = SIGN_BITS.get(data_name)
+    return decode_sign_magnitude(value, sign_bit) if sign_bit is not None else value
+
+def probe_port(port, ids=DEFAULT_IDS, baudrate=DEFAULT_BAUDRATE, timeout_ms=PROBE_TIMEOUT_MS):
+    """{id: {'model': ..., 'homing_offset': ..., 'range_min': ..., 'range_max': ...}} of the motors on a port"""
+    with FeetechSerial(port, baudrate, timeout_ms) as bus:
+        replies = bus.transact(encode_sync_read(_BLOCK_START, _BLOCK_LENGTH, ids), ids, _BLOCK_LENGTH)
+        # Some firmware stops a sync read at the first absent ID; on a port with an arm, ping whoever did not answer
+        for id_ in ids:
+            if replies and id_ not in replies and bus.ping(id_, timeout_ms) is not None:
+                replies.update(bus.transact(encode_sync_read(_BLOCK_START, _BLOCK_LENGTH, (id_,)), (id_,),
+                                            _BLOCK_LENGTH))
+    motors = {}
+    for id_, params in replies.items():
+        motors[id_] = {'model': _field(params, 'Model_Number')}
+        for data_name, key in FINGERPRINT_FIELDS:
+            motors[id_][key] = _field(params, data_name)
+    return motors
+
+def _storable(data_name, value):
+    """Whether a calibration value fits its register (offsets beyond the sign-magnitude range never reach EEPROM)"""
+    sign_bit = SIGN_BITS.get(data_name)
+    return sign_bit is None or abs(value) < (1 << sign_bit)
+
+def fingerprint_score(motors, calibration):
+    """Joints of a calibration file whose motor is present with matching EEPROM values"""
+    matched = 0
+    for joint in calibration.values():
+        motor = motors.get(joint['id'])
+        if motor is not None and all(abs(motor[key] - joint[key]) <= MATCH_TOLERANCE
+                                     for data_name, key in FINGERPRINT_FIELDS
+                                     if _storable(data_name, joint[key])):
+            matched += 1
+    return matched
+
+class Discovery:
+    """Probe results per port and the resulting leader/follower assignment"""
+
+    def __init__(self, probes, scores, elapsed):
+        self.probes = probes
+        self.scores = scores
+        self.elapsed = elapsed
+        self.assignment = _assign(scores)
+
+    @property
+    def leader(self):
+        return self.assignment.get('leader')
+
+    @property
+    def follower(self):
+        return self.assignment.get('follower')
+
+    def arms(self):
+        """Ports that answered with at least one motor"""
+        return [port for port, motors in self.probes.items() if isinstance(motors, dict) and motors]
+
+def _assign(scores):
+    """Best (role, port) pairs first; each port and role used once, a role needs at least one matching joint"""
+    pairs = sorted(((score, role, port) for port, by_role in scores.items() for role, score in by_role.items()),
+                   reverse=True)
+    assignment = {}
+    used = set()
+    for score, role, port in pairs:
+        if score and role not in assignment and port not in used:
+            assignment[role] = port
+            used.add(port)
+    return assignment
+
+def discover(ports=None, ids=DEFAULT_IDS, baudrate=DEFAULT_BAUDRATE, timeout_ms=PROBE_TIMEOUT_MS,
+             leader_id='leader_arm', follower_id='follower_arm'):
+    """Probe every port in parallel and match each against the leader and follower calibration files"""
+    calibrations = {}
+    for role, arm_id in (('leader', leader_id), ('follower', follower_id)):
+        with open(CALIBRATION_DIRS[role] / f"{arm_id}.json") as f:
+            calibrations[role] = json.load(f)
+    ports = candidate_ports() if ports is None else list(ports)
+
+    probes = {}
+    start = time.perf_counter()
+
+    def probe(port):
+        try:
+            probes[port] = probe_port(port, ids, baudrate, timeout_ms)
+        except Exception as e:
+            probes[port] = e
+
+    # One worker per port: total time is one reply window, not one per port
+    threads = [threading.Thread(target=probe, args=(port,), daemon=True) for port in ports]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    scores = {
+        port: {role: fingerprint_score(motors, calibration) for role, calibration in calibrations.items()}
+        for port, motors in probes.items() if isinstance(motors, dict) and motors
+    }
+    return Discovery(probes, scores, elapsed)
+
+def resolve_ports(leader_port=None, follower_port=None, **kwargs):
+    """Fill in the missing leader/follower port by discovery; raises ConnectionError if an arm is not found"""
+    if leader_port and follower_port:
+        return leader_port, follower_port
+    discovery = discover(**kwargs)
+    leader_port = leader_port or discovery.leader
+    follower_port = follower_port or discovery.follower
+    missing = [role for role, port in (('leader', leader_port), ('follower', follower_port)) if not port]
+    if missing:
+        raise ConnectionError(f"Could not identify the {' and '.join(missing)} arm "
+                              f"(ports with motors: {discovery.arms() or 'none'})")
+    return leader_port, follower_port
+
+def print_discovery(discovery):
+    for port, motors in sorted(discovery.probes.items()):
+        if isinstance(motors, Exception):
+            print(f"❌ {port}: {motors}")
+        elif not motors:
+            print(f"⚪ {port}: no motors answered")
+        else:
+            scores = ', '.join(f"{role} {score}/{len(motors)}" for role, score in discovery.scores[port].items())
+            print(f"✅ {port}: IDs {sorted(motors)} - calibration match {scores}")
+    print(f"Leader: {discovery.leader or 'not found'}")
+    print(f"Follower: {discovery.follower or 'not found'}")
+    print(f"Probed {len(discovery.probes)} port(s) in {discovery.elapsed * 1000:.0f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='Identify the leader and follower arm ports')
+    parser.add_argument('ports', nargs='*', help='Ports to probe (default: every USB serial port)')
+    parser.add_argument('--ids', type=int, nargs='+', default=DEFAULT_IDS, help='Motor IDs (default: 1-6)')
+    parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE,
+                       help=f'Bus baud rate (default: {DEFAULT_BAUDRATE})')
+    parser.add_argument('--timeout-ms', type=float, default=PROBE_TIMEOUT_MS,
+                       help=f'Reply window per port (default: {PROBE_TIMEOUT_MS:g})')
+    parser.add_argument('--leader-id', default='leader_arm', help='Leader calibration id (default: leader_arm)')
+    parser.add_argument('--follower-id', default='follower_arm', help='Follower calibration id (default: follower_arm)')
+
+    args = parser.parse_args()
+
+    print("🔍 SO-101 Port Discovery")
+    print("=" * 50)
+    discovery = discover(args.ports or None, args.ids, args.baudrate, args.timeout_ms, args.leader_id,
+                         args.follower_id)
+    print_discovery(discovery)
+    return 0 if discovery.leader and discovery.follower else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
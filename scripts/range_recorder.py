@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Range-of-Motion Recorder
+Streams every joint position at full bus rate while the arm is swept by hand, keeping exact extremes
+
+MotorsBus.record_ranges_of_motion() polls the motors one read at a time
+between display refreshes, so a fast sweep can pass a joint's true end
+stop between two samples. RangeRecorder sync-reads all joints in one
+transaction, back to back, and folds each sample into preallocated
+running min/max and position histograms. The live display is redrawn at
+a fixed low rate so it never slows sampling, and pressing Enter (or
+Ctrl+C) stops the capture without blocking the read loop.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+
+import numpy as np
+
+from calibration_tables import RESOLUTION
+from so101_bus import JOINT_NAMES
+
+# Position histogram resolution per joint (4096 ticks / 64 bins = 64 ticks, ~5.6 degrees per bin)
+DEFAULT_BINS = 64
+
+# Live display refresh rate
+DISPLAY_INTERVAL_S = 0.1
+
+# A joint that moved less than this is reported as not swept (1024 ticks = 90 degrees)
+MIN_SPAN_TICKS = 1024
+
+# Consecutive failed reads tolerated before the bus error is raised
+MAX_READ_ERRORS = 10
+
+BAR_WIDTH = 32
+
+class RangeRecorder:
+    """
+    Running per-joint min/max and position histograms from back-to-back sync reads.
+
+    joints is a JointBus or PacketJointBus. update() takes one sample;
+    run() samples until stop() (from any thread), Enter, Ctrl+C or the
+    duration, refreshing the live display every display_interval.
+    """
+
+    def __init__(self, joints, bins=DEFAULT_BINS, display_interval=DISPLAY_INTERVAL_S):
+        if RESOLUTION % bins:
+            raise ValueError(f"bins must divide {RESOLUTION}")
+        self.joints = joints
+        self.joint_names = list(joints.joint_names)
+        n = len(self.joint_names)
+        self.bins = bins
+        self.display_interval = display_interval
+        self.position = np.zeros(n, dtype=np.int32)
+        self.mins = np.full(n, np.iinfo(np.int32).max, dtype=np.int32)
+        self.maxs = np.full(n, np.iinfo(np.int32).min, dtype=np.int32)
+        self.histogram = np.zeros((n, bins), dtype=np.int64)
+        self.samples = 0
+        self.read_errors = 0
+        self.elapsed = 0.0
+        self._bin_shift = (RESOLUTION // bins).bit_length() - 1
+        self._row_offsets = np.arange(n, dtype=np.intp) * bins
+        self._index = np.zeros(n, dtype=np.intp)
+        self._flat_histogram = self.histogram.reshape(-1)
+        self._stop = threading.Event()
+        self._display_lines = 0
+
+    def stop(self):
+        self._stop.set()
+
+    def update(self):
+        """Read every joint once and fold the sample in"""
+        pos = self.joints.read_positions(self.position)
+        np.minimum(self.mins, pos, out=self.mins)
+        np.maximum(self.maxs, pos, out=self.maxs)
+        index = self._index
+        np.clip(pos, 0, RESOLUTION - 1, out=index)
+        np.right_shift(index, self._bin_shift, out=index)
+        index += self._row_offsets
+        # One distinct bin per joint, so fancy-index increment counts every joint
+        self._flat_histogram[index] += 1
+        self.samples += 1
+
+    @property
+    def rate(self):
+        return self.samples / self.elapsed if self.elapsed > 0 else 0.0
+
+    def ranges(self):
+        """({joint: range_min}, {joint: range_max}) like MotorsBus.record_ranges_of_motion()"""
+        if not self.samples:
+            raise ConnectionError("No position was recorded")
+        return ({name: int(v) for name, v in zip(self.joint_names, self.mins)},
+                {name: int(v) for name, v in zip(self.joint_names, self.maxs)})
+
+    def unswept(self, min_span=MIN_SPAN_TICKS):
+        """Joints that travelled less than min_span ticks"""
+        if not self.samples:
+            return list(self.joint_names)
+        return [name for name, lo, hi in zip(self.joint_names, self.mins, self.maxs) if hi - lo < min_span]
+
+    def coverage(self):
+        """Per joint: fraction of the histogram bins between min and max that were visited"""
+        out = {}
+        for i, name in enumerate(self.joint_names):
+            if not self.samples:
+                out[name] = 0.0
+                continue
+            lo = max(0, int(self.mins[i])) >> self._bin_shift
+            hi = min(RESOLUTION - 1, int(self.maxs[i])) >> self._bin_shift
+            row = self.histogram[i, lo:hi + 1]
+            out[name] = float(np.count_nonzero(row)) / len(row)
+        return out
+
+    def _wait_for_enter(self):
+        try:
+            sys.stdin.readline()
+        except (OSError, ValueError):
+            return
+        self.stop()
+
+    def run(self, duration=None, display=True):
+        """Sample until stopped; returns the number of samples"""
+        self._stop.clear()
+        if display and sys.stdin is not None and sys.stdin.isatty():
+            threading.Thread(target=self._wait_for_enter, daemon=True).start()
+        start = time.perf_counter()
+        end = start + duration if duration else float('inf')
+        next_display = start
+        failed = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.update()
+                    failed = 0
+                except ConnectionError:
+                    # A lost reply costs one sample; a dead bus still ends the capture
+                    self.read_errors += 1
+                    failed += 1
+                    if failed > MAX_READ_ERRORS:
+                        raise
+                now = time.perf_counter()
+                self.elapsed = now - start
+                if now >= end:
+                    break
+                if display and now >= next_display:
+                    self._draw()
+                    next_display = now + self.display_interval
+        except KeyboardInterrupt:
+            pass
+        self.elapsed = time.perf_counter() - start
+        if display:
+            self._draw()
+        return self.samples
+
+    def _draw(self):
+        lines = [f"📈 {self.samples} samples, {self.rate:.0f} Hz, {self.read_errors} read errors "
+                 f"- move every joint end to end, Enter to stop"]
+        scale = BAR_WIDTH / RESOLUTION
+        for i, name in enumerate(self.joint_names):
+            if not self.samples:
+                lines.append(f"{name:<14} -")
+                continue
+            lo, hi, pos = int(self.mins[i]), int(self.maxs[i]), int(self.position[i])
+            bar = [' '] * BAR_WIDTH
+            for k in range(max(0, int(lo * scale)), min(BAR_WIDTH, int(hi * scale) + 1)):
+                bar[k] = '='
+            bar[min(BAR_WIDTH - 1, max(0, int(pos * scale)))] = '|'
+            lines.append(f"{name:<14} {lo:>5} [{''.join(bar)}] {hi:<5} now {pos:>5}  span {hi - lo:>5}")
+        # Move back over the previous frame and redraw it in place
+        if self._display_lines:
+            sys.stdout.write(f"\x1b[{self._display_lines}F")
+        sys.stdout.write('\n'.join(line + '\x1b[K' for line in lines) + '\n')
+        sys.stdout.flush()
+        self._display_lines = len(lines)
+
+def update_calibration_file(path, range_mins, range_maxes):
+    """Write recorded ranges into an existing calibration JSON, keeping IDs and homing offsets"""
+    with open(path) as f:
+        calibration = json.load(f)
+    missing = [name for name in range_mins if name not in calibration]
+    if missing:
+        raise ValueError(f"{path} has no entry for {missing}")
+    for name in range_mins:
+        calibration[name]['range_min'] = range_mins[name]
+        calibration[name]['range_max'] = range_maxes[name]
+    with open(path, 'w') as f:
+        json.dump(calibration, f, indent=4)
+
+def main():
+    from feetech_serial import FeetechSerial
+    from so101_bus import PacketJointBus
+
+    parser = argparse.ArgumentParser(description='Record joint ranges of motion at full bus rate')
+    parser.add_argument('--port', required=True, help='Arm port (e.g. COM4)')
+    parser.add_argument('--ids', type=int, nargs=len(JOINT_NAMES), default=list(range(1, len(JOINT_NAMES) + 1)),
+                       help='Motor ID of each joint in joint order (default: 1 2 3 4 5 6)')
+    parser.add_argument('--duration', type=float, help='Stop after this many seconds (default: Enter)')
+    parser.add_argument('--update', metavar='CALIBRATION_JSON',
+                       help='Write the recorded range_min/range_max into this calibration file')
+    parser.add_argument('--keep-torque', action='store_true',
+                       help='Do not disable torque first (the joints must be moved by hand)')
+
+    args = parser.parse_args()
+
+    print("📏 SO-101 Range-of-Motion Recorder")
+    print("=" * 50)
+    with FeetechSerial(args.port) as bus:
+        if not args.keep_torque:
+            bus.sync_write('Torque_Enable', {id_: 0 for id_ in args.ids})
+        recorder = RangeRecorder(PacketJointBus(bus, JOINT_NAMES, args.ids))
+        recorder.run(args.duration)
+
+    print("=" * 50)
+    print(f"{recorder.samples} samples in {recorder.elapsed:.1f} s ({recorder.rate:.0f} Hz)")
+    range_mins, range_maxes = recorder.ranges()
+    coverage = recorder.coverage()
+    for name in JOINT_NAMES:
+        print(f"{name:<14} {range_mins[name]:>5} .. {range_maxes[name]:<5} "
+              f"({range_maxes[name] - range_mins[name]} ticks, {coverage[name] * 100:.0f} % of the span visited)")
+    unswept = recorder.unswept()
+    if unswept:
+        print(f"⚠️  Barely moved: {', '.join(unswept)} - sweep them end to end and record again")
+    if args.update:
+        update_calibration_file(args.update, range_mins, range_maxes)
+        print(f"✅ Ranges written to {args.update}")
+    return 1 if unswept else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Replay Engine
+Stream a recorded trajectory (.trj) to the follower on the fixed-rate scheduler
+
+The trajectory is memory-mapped and a background thread touches the pages
+ahead of the playback cursor, so a cold file never stalls a tick on disk I/O.
+"""
+
+import mmap
+import sys
+import threading
+import time
+
+import numpy as np
+
+from so101_bus import JointBus
+from teleop_engine import DEFAULT_RATE_HZ, FixedRateLoop
+
+STAGES = ('sample', 'write', 'slack')
+
+# Seconds to blend from the current goal to the trajectory after start, seek and loop wrap
+DEFAULT_LEAD_IN_S = 2.0
+
+# Trajectory seconds kept resident ahead of the playback cursor
+PREFETCH_AHEAD_S = 5.0
+PREFETCH_INTERVAL_S = 0.05
+
+class Prefetcher(threading.Thread):
+    """Keep the pages of the next PREFETCH_AHEAD_S of a memory-mapped trajectory resident"""
+
+    def __init__(self, records, times, ahead_s=PREFETCH_AHEAD_S):
+        super().__init__(daemon=True)
+        self._bytes = records.view(np.ndarray).reshape(-1).view(np.uint8)
+        self._itemsize = records.dtype.itemsize
+        self._times = times
+        self.ahead_s = ahead_s
+        self.cursor = 0
+        self.pages_touched = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def seek(self, index):
+        self.cursor = index
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def run(self):
+        done = -1
+        while not self._stop.is_set():
+            lo = self.cursor
+            hi = int(np.searchsorted(self._times, self._times[lo] + self.ahead_s, 'right'))
+            if lo < done <= hi:
+                lo = done
+            if lo < hi:
+                # Reading one byte per page faults the range in
+                chunk = self._bytes[lo * self._itemsize:hi * self._itemsize:mmap.PAGESIZE]
+                int(chunk.sum())
+                self.pages_touched += len(chunk)
+                done = hi
+            self._wake.wait(PREFETCH_INTERVAL_S)
+            self._wake.clear()
+
+class ReplayEngine(FixedRateLoop):
+    """
+    Play recorded follower goals back at any rate and speed.
+
+    Playback time advances at `speed` trajectory seconds per wall second,
+    goals are linearly interpolated between recorded ticks (or held, with
+    interpolate=False), and playback can loop over [start, end] or seek.
+    Every jump in the trajectory (start, seek, loop wrap) is blended in
+    from the current goal over lead_in seconds.
+    """
+
+    def __init__(self, follower, trajectory, rate_hz=DEFAULT_RATE_HZ, speed=1.0, start=0.0, end=None,
+                 loop=False, interpolate=True, lead_in=DEFAULT_LEAD_IN_S, status_interval=None,
+                 follower_ids=None, prefetch=True):
+        super().__init__(rate_hz, status_interval, STAGES)
+        if speed <= 0:
+            raise ValueError("Replay speed must be positive")
+        if len(trajectory) < 2:
+            raise ValueError("Trajectory needs at least two records")
+
+        self.follower = follower
+        self.trajectory = trajectory
+        if trajectory.count > trajectory.capacity:
+            records = trajectory.ordered()  # live ring that has wrapped: copy it in order
+        else:
+            records = trajectory.records[:len(trajectory)]
+        # Strided views into the mapping: nothing is loaded until a tick or the prefetcher touches it
+        self._times = records['t'].view(np.ndarray)
+        self._goals = records['goal'].view(np.ndarray)
+        self._t_first = float(self._times[0])
+        self.joint_names = trajectory.joint_names
+        self.follower_joints = JointBus(follower.bus, self.joint_names, ids=follower_ids)
+
+        self.duration = float(self._times[-1]) - self._t_first
+        self.start = min(max(start, 0.0), self.duration)
+        self.end = self.duration if end is None else min(max(end, self.start), self.duration)
+        self.speed = speed
+        self.loop = loop
+        self.interpolate = interpolate
+        self.lead_in = lead_in
+        self.loops = 0
+        self.finished = False
+
+        n = len(self.joint_names)
+        self._work = np.zeros(n)
+        self._blend_from = np.zeros(n)
+        self._out = np.zeros(n, dtype=np.int32)
+        self.position = self.start
+        self._anchor_position = self.start
+        self._anchor_time = None
+        self._blend_start = None
+        self._pending_seek = None
+
+        self.prefetcher = Prefetcher(records, self._times) if prefetch else None
+
+    def seek(self, position):
+        """Jump to a trajectory time in seconds (thread-safe, applied on the next tick)"""
+        self._pending_seek = min(max(position, self.start), self.end)
+
+    def _sample(self, position):
+        """Goal vector (float, into the work buffer) at a trajectory time"""
+        times, goals, work = self._times, self._goals, self._work
+        t = position + self._t_first
+        j = int(np.searchsorted(times, t, 'right'))
+        if j >= len(times):
+            np.copyto(work, goals[-1])
+        elif not self.interpolate or j == 0:
+            np.copyto(work, goals[max(j - 1, 0)])
+        else:
+            t0, t1 = times[j - 1], times[j]
+            alpha = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+            np.subtract(goals[j], goals[j - 1], out=work)
+            work *= alpha
+            work += goals[j - 1]
+        if self.prefetcher is not None:
+            self.prefetcher.cursor = max(j - 1, 0)
+        return work
+
+    def _jump(self, position, now):
+        """Restart the playback clock at position, blending in from the last goal sent"""
+        self.position = self._anchor_position = position
+        self._anchor_time = now
+        if self.lead_in > 0:
+            np.copyto(self._blend_from, self._out)
+            self._blend_start = now
+        if self.prefetcher is not None:
+            self.prefetcher.seek(int(np.searchsorted(self._times, position + self._t_first)))
+
+    def tick(self):
+        perf_ns = time.perf_counter_ns
+        t0 = perf_ns()
+        now = time.perf_counter()
+
+        if self._anchor_time is None:
+            # First tick: blend in from where the follower actually is
+            self.follower_joints.read_positions(self._out)
+            self._jump(self.start, now)
+        elif self._pending_seek is not None:
+            position, self._pending_seek = self._pending_seek, None
+            self._jump(position, now)
+
+        if self._blend_start is None:
+            self.position = self._anchor_position + (now - self._anchor_time) * self.speed
+            if self.position >= self.end:
+                if self.loop:
+                    self.loops += 1
+                    self._jump(self.start, now)
+                else:
+                    self.position = self.end
+                    self.finished = True
+                    self.stop()
+
+        target = self._sample(self.position)
+        if self._blend_start is not None:
+            # Lead-in: the playback clock is held while easing from the last goal
+            alpha = (now - self._blend_start) / self.lead_in
+            if alpha >= 1.0:
+                self._blend_start = None
+                self._anchor_time = now
+            else:
+                target -= self._blend_from
+                target *= alpha
+                target += self._blend_from
+
+        np.rint(target, out=target)
+        np.copyto(self._out, target, casting='unsafe')
+        t1 = perf_ns()
+        self.follower_joints.write_goals(self._out)
+        t2 = perf_ns()
+
+        self.latency['sample'].record_ns(t1 - t0)
+        self.latency['write'].record_ns(t2 - t1)
+
+    def _print_status(self):
+        sys.stdout.write(f"\r{self.stats.rate:6.1f} Hz | {self.position:7.2f}/{self.end:.2f} s"
+                         f" x{self.speed:g} | loops {self.loops}   ")
+        sys.stdout.flush()
+
+    def run(self, duration=None):
+        if self.prefetcher is not None and not self.prefetcher.is_alive():
+            self.prefetcher.start()
+        try:
+            return super().run(duration)
+        finally:
+            if self.prefetcher is not None:
+                self.prefetcher.stop()
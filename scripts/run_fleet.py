@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Fleet Supervisor
+Run several leader/follower pairs from one host, one pinned process per pair
+
+Every pair's teleop loop runs in its own process (no shared GIL) pinned to
+its own core, and publishes rate, latency and fault counters into a shared
+memory status board that the supervisor renders in place. Bus faults are
+retried and lost ports reconnected inside each worker (FaultRecovery, as
+in run_teleop.py); a worker that still dies is restarted.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+from fleet_status import CONNECTING, FAILED, STOPPED, FleetStatusBoard, render
+from teleop_engine import DEFAULT_RATE_HZ
+
+DEFAULT_FLEET_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config', 'fleet.json')
+
+# Seconds between board refreshes (and worker publishes)
+DEFAULT_STATUS_INTERVAL = 0.5
+
+def load_fleet_config(path):
+    """Read {'rate': hz, 'pairs': [{'name', 'leader_port', 'follower_port', 'retries', ...}]} and fill in defaults"""
+    with open(path) as f:
+        config = json.load(f)
+    pairs = config.get('pairs', [])
+    if not pairs:
+        raise ValueError(f"No pairs listed in {path}")
+    ports = [port for pair in pairs for port in (pair['leader_port'], pair['follower_port'])]
+    if len(set(ports)) != len(ports):
+        raise ValueError(f"A port is used by more than one pair in {path}")
+    for i, pair in enumerate(pairs):
+        pair.setdefault('name', f"pair{i + 1}")
+        pair.setdefault('rate', config.get('rate', DEFAULT_RATE_HZ))
+    return pairs
+
+def available_cores():
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def assign_cores(n_pairs):
+    """One core per pair, leaving the first core to the supervisor when there are enough"""
+    cores = available_cores()
+    reserve = 1 if len(cores) > n_pairs else 0
+    return [cores[(i + reserve) % len(cores)] for i in range(n_pairs)]
+
+def pin_to_core(core):
+    """Pin the calling process to one core; psutil is used where os.sched_setaffinity is missing"""
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, {core})
+        return True
+    try:
+        import psutil
+        psutil.Process().cpu_affinity([core])
+        return True
+    except (ImportError, AttributeError, OSError):
+        return False
+
+def pair_worker(pair, board_name, n_rows, row, core, stop_event, status_interval):
+    """Process entry point: connect one pair and run its teleop loop, publishing into the board"""
+    from fault_recovery import DEFAULT_RETRIES, FaultRecovery
+    from joint_mapping import JointMapping
+    from run_teleop import arm_links, connect_arms
+    from teleop_engine import TeleopEngine
+
+    board = FleetStatusBoard.attach(board_name, n_rows)
+    # Counters of earlier runs of this pair; the new worker's add to them
+    base = (int(board.rows[row]['faults']), int(board.rows[row]['reconnects']))
+    crashes = int(board.rows[row]['crashes'])
+    pinned = core is not None and pin_to_core(core)
+    board.update(row, pid=os.getpid(), core=core if pinned else -1, state=CONNECTING)
+
+    leader = follower = recovery = None
+    try:
+        leader, follower = connect_arms(pair['leader_port'], pair['follower_port'],
+                                        pair.get('leader_id'), pair.get('follower_id'))
+        mapping = JointMapping.from_buses(leader.bus, follower.bus, pair.get('mapping'))
+        engine = TeleopEngine(leader, follower, rate_hz=pair['rate'], status_interval=status_interval,
+                              mapping=mapping)
+        # Events are not printed: the board is redrawn in place, its counters show them
+        engine.recovery = recovery = FaultRecovery(arm_links(engine, leader, follower),
+                                                   pair.get('retries', DEFAULT_RETRIES))
+        last = [0, time.perf_counter()]
+
+        def publish():
+            last[:] = board.publish_engine(row, engine, last, base)
+
+        engine.status_callback = publish
+        threading.Thread(target=lambda: (stop_event.wait(), engine.stop()), daemon=True).start()
+        engine.run(pair.get('duration'))
+        publish()
+        board.update(row, state=STOPPED)
+    except KeyboardInterrupt:
+        board.update(row, state=STOPPED)
+    except Exception as e:
+        board.update(row, state=FAILED, crashes=crashes + 1)
+        sys.stderr.write(f"❌ {pair['name']}: {e}\n")
+        sys.exit(1)
+    finally:
+        if recovery is not None:
+            recovery.close()
+        for device in (follower, leader):
+            if device is not None:
+                try:
+                    device.disconnect()
+                except Exception:
+                    pass
+        board.close()
+
+class FleetSupervisor:
+    """
+    Start one worker process per pair, restart failed ones and render the board.
+
+    Workers are spawned (not forked) so every pair gets a fresh interpreter
+    on every platform. A worker that exits with an error is restarted after
+    restart_delay seconds, at most max_restarts times.
+    """
+
+    def __init__(self, pairs, status_interval=DEFAULT_STATUS_INTERVAL, max_restarts=3, restart_delay=2.0, pin=True):
+        self.pairs = pairs
+        self.names = [pair['name'] for pair in pairs]
+        self.status_interval = status_interval
+        self.max_restarts = max_restarts
+        self.restart_delay = restart_delay
+        self.cores = assign_cores(len(pairs)) if pin else [None] * len(pairs)
+        self.ctx = multiprocessing.get_context('spawn')
+        self.stop_event = self.ctx.Event()
+        self.board = None
+        self.processes = [None] * len(pairs)
+        self._exited_at = [None] * len(pairs)
+        self._drawn = 0
+
+    def _start_worker(self, row):
+        process = self.ctx.Process(
+            target=pair_worker, name=f"so101-{self.names[row]}",
+            args=(self.pairs[row], self.board.name, len(self.pairs), row, self.cores[row],
+                  self.stop_event, self.status_interval),
+        )
+        process.start()
+        self.processes[row] = process
+        self._exited_at[row] = None
+
+    def start(self):
+        self.board = FleetStatusBoard(len(self.pairs), create=True)
+        for row in range(len(self.pairs)):
+            self._start_worker(row)
+
+    def _check_workers(self):
+        """Restart workers that died with an error; returns True while any pair is still active"""
+        active = False
+        now = time.perf_counter()
+        for row, process in enumerate(self.processes):
+            if process.is_alive():
+                active = True
+                continue
+            if process.exitcode == 0 or self.stop_event.is_set():
+                continue
+            if self.board.rows[row]['state'] != FAILED:
+                # Died without reporting (e.g. killed): count it here, the worker is gone
+                self.board.update(row, state=FAILED, crashes=self.board.rows[row]['crashes'] + 1)
+            restarts = int(self.board.rows[row]['restarts'])
+            if restarts >= self.max_restarts:
+                continue
+            active = True
+            if self._exited_at[row] is None:
+                self._exited_at[row] = now
+            elif now - self._exited_at[row] >= self.restart_delay:
+                self.board.update(row, restarts=restarts + 1)
+                self._start_worker(row)
+        return active
+
+    def _render(self):
+        lines = render(self.board.snapshot(), self.names)
+        if self._drawn:
+            # Redraw the board in place
+            sys.stdout.write(f"\033[{self._drawn}F")
+        sys.stdout.write("\n".join(f"{line}\033[K" for line in lines) + "\n")
+        sys.stdout.flush()
+        self._drawn = len(lines)
+
+    def stop(self, timeout=5.0):
+        self.stop_event.set()
+        for process in self.processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+    def run(self, duration=None):
+        """Supervise until every pair stops, Ctrl+C or the duration elapses; returns the final board"""
+        self.start()
+        end = time.perf_counter() + duration if duration else None
+        try:
+            while self._check_workers():
+                self._render()
+                if end is not None and time.perf_counter() >= end:
+                    break
+                time.sleep(self.status_interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            snapshot = self.board.snapshot()
+            self._render()
+            self.board.close()
+        return snapshot
+
+def main():
+    parser = argparse.ArgumentParser(description='Run several SO-101 teleop pairs, one pinned process per pair')
+    parser.add_argument('--config', default=DEFAULT_FLEET_CONFIG, help='Fleet JSON (default: config/fleet.json)')
+    parser.add_argument('--duration', type=float, help='Duration in seconds (default: unlimited)')
+    parser.add_argument('--status-interval', type=float, default=DEFAULT_STATUS_INTERVAL,
+                       help=f'Seconds between board refreshes (default: {DEFAULT_STATUS_INTERVAL})')
+    parser.add_argument('--max-restarts', type=int, default=3, help='Restarts per failed pair (default: 3)')
+    parser.add_argument('--no-pin', action='store_true', help='Do not pin workers to cores')
+
+    args = parser.parse_args()
+    pairs = load_fleet_config(args.config)
+
+    print("🤖 SO-101 Robot Arms Fleet Supervisor")
+    print("=" * 50)
+    for pair in pairs:
+        print(f"{pair['name']}: leader {pair['leader_port']} -> follower {pair['follower_port']} @ {pair['rate']} Hz")
+    print("=" * 50)
+    print("Press Ctrl+C to stop every pair\n")
+
+    supervisor = FleetSupervisor(pairs, args.status_interval, args.max_restarts, pin=not args.no_pin)
+    snapshot = supervisor.run(args.duration)
+
+    total = sum(float(row['rate_hz']) for row in snapshot if row['ticks'])
+    print(f"\n🛑 Fleet stopped. Last aggregate rate: {total:.1f} Hz across {len(pairs)} pairs")
+    if any(row['state'] == FAILED for row in snapshot):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Replay Launcher
+Play a recorded teleop session (.trj) back on the follower arm, no leader needed
+"""
+
+import argparse
+import sys
+
+from joint_mapping import DEFAULT_MAPPING_PATH, load_mapping
+from latency_histogram import dump_json
+from replay_engine import DEFAULT_LEAD_IN_S, ReplayEngine
+from teleop_engine import DEFAULT_RATE_HZ, format_summary
+from trajectory_recorder import TrajectoryReader
+
+def connect_follower(follower_port, follower_id=None):
+    from lerobot.robots.so101_follower.so101_follower import SO101Follower
+    from lerobot.robots.so101_follower.config_so101_follower import SO101FollowerConfig
+
+    follower = SO101Follower(SO101FollowerConfig(port=follower_port, id=follower_id))
+    follower.connect()
+    return follower
+
+def run_replay(path, follower_port='COM4', follower_id=None, rate=DEFAULT_RATE_HZ, speed=1.0, start=0.0, end=None,
+               loop=False, interpolate=True, lead_in=DEFAULT_LEAD_IN_S, duration=None, mapping_path=None,
+               status_interval=1.0, latency_json=None):
+    """Replay a trajectory file on the follower with the given playback options"""
+
+    trajectory = TrajectoryReader(path)
+    follower_ids = load_mapping(mapping_path)['follower']
+
+    print("📼 SO-101 Robot Arms Trajectory Replay")
+    print("=" * 50)
+    print(f"Trajectory: {path} ({len(trajectory)} ticks, recorded at {trajectory.rate_hz:g} Hz)")
+    print(f"Follower Arm: {follower_port}")
+    print(f"Playback Rate: {rate} Hz, speed x{speed:g}, {'interpolated' if interpolate else 'sample and hold'}")
+    print(f"Loop: {'yes' if loop else 'no'}")
+    print("=" * 50)
+
+    try:
+        print("Connecting follower...")
+        follower = connect_follower(follower_port, follower_id)
+    except Exception as e:
+        print(f"❌ Error running replay: {e}")
+        sys.exit(1)
+
+    try:
+        engine = ReplayEngine(follower, trajectory, rate_hz=rate, speed=speed, start=start, end=end, loop=loop,
+                              interpolate=interpolate, lead_in=lead_in, status_interval=status_interval,
+                              follower_ids=[follower_ids[name] for name in trajectory.joint_names])
+        print(f"Replaying {engine.start:.2f}-{engine.end:.2f} s (lead-in {lead_in:g} s)")
+        print("\nPress Ctrl+C to stop replay")
+        print("-" * 50)
+        summary = engine.run(duration)
+        print("\n✅ Replay finished." if engine.finished else "\n🛑 Replay stopped.")
+        print(format_summary(summary))
+        if engine.prefetcher is not None:
+            print(f"Prefetched pages: {engine.prefetcher.pages_touched}")
+        if latency_json:
+            dump_json(latency_json, engine.latency, {'summary': summary})
+            print(f"Latency histograms written to {latency_json}")
+    except Exception as e:
+        print(f"❌ Error running replay: {e}")
+        sys.exit(1)
+    finally:
+        follower.disconnect()
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded trajectory on the SO-101 follower arm')
+    parser.add_argument('path', help='Trajectory file recorded with run_teleop.py --record')
+    parser.add_argument('--follower-port', default='COM4', help='Follower arm port (default: COM4)')
+    parser.add_argument('--follower-id', help='Follower calibration id (default: none)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_HZ,
+                       help=f'Playback loop rate in Hz, may exceed the recorded rate (default: {DEFAULT_RATE_HZ})')
+    parser.add_argument('--speed', type=float, default=1.0, help='Time scale, 0.5 = half speed (default: 1.0)')
+    parser.add_argument('--start', type=float, default=0.0, help='Start at this trajectory time in seconds')
+    parser.add_argument('--end', type=float, help='Stop (or loop) at this trajectory time in seconds')
+    parser.add_argument('--loop', action='store_true', help='Loop between --start and --end until stopped')
+    parser.add_argument('--no-interpolate', action='store_true', help='Hold each recorded goal instead of interpolating')
+    parser.add_argument('--lead-in', type=float, default=DEFAULT_LEAD_IN_S,
+                       help=f'Seconds to ease into the trajectory on start and loop (default: {DEFAULT_LEAD_IN_S})')
+    parser.add_argument('--duration', type=float, help='Stop after this many seconds (default: end of trajectory)')
+    parser.add_argument('--mapping', default=str(DEFAULT_MAPPING_PATH),
+                       help='Joint -> motor ID mapping JSON (default: config/joint_mapping.json)')
+    parser.add_argument('--status-interval', type=float, default=1.0,
+                       help='Seconds between live status lines, 0 to disable (default: 1.0)')
+    parser.add_argument('--latency-json', help='Write per-stage latency histograms to this JSON file at exit')
+
+    args = parser.parse_args()
+    run_replay(args.path, args.follower_port, args.follower_id, args.rate, args.speed, args.start, args.end,
+               args.loop, not args.no_interpolate, args.lead_in, args.duration, args.mapping,
+               args.status_interval, args.latency_json)
+
+if __name__ == "__main__":
+    main()
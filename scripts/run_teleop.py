@@ -7,71 +7,287 @@ Easy-to-use script to start teleoperation
 import argparse
 import subprocess
 import sys
-import time
-import signal
-import os
 
-def run_teleoperation(leader_port='COM3', follower_port='COM4', duration=None):
+from bus_scheduler import BusScheduler, chain
+from bus_tuner import read_latency_timer
+from calibration_store import install_calibration, lerobot_calibration_path, warn_if_fallback
+from calibration_tables import default_calibration_path
+from fault_recovery import DEFAULT_RETRIES, ArmLink, FaultRecovery, format_recovery, print_event
+from feetech_serial import DEFAULT_SOCKET, FeetechSerial, load_tuning
+from joint_mapping import DEFAULT_MAPPING_PATH, JointMapping
+from latency_histogram import dump_json
+from leader_predictor import DEFAULT_BETA, DEFAULT_MIN_CUTOFF, MODES, LeaderPredictor
+from motor_health import DEFAULT_BUDGET_MS, HealthSampler, print_alert
+from port_discovery import resolve_ports
+from so101_bus import PacketJointBus
+from teleop_engine import DEFAULT_RATE_HZ, TeleopEngine, format_summary
+from trajectory_recorder import TrajectoryRecorder
+
+def prepare_calibration(leader_id=None, follower_id=None):
+    """Warn about the None.json fallback and give LeRobot this repo's calibration files it does not have yet"""
+    for kind, arm_id in (('leader', leader_id), ('follower', follower_id)):
+        warn_if_fallback(kind, arm_id)
+        status = install_calibration(kind, arm_id)
+        if status == 'installed':
+            print(f"📐 Installed {kind} calibration {lerobot_calibration_path(kind, arm_id)}")
+        elif status == 'differs':
+            print(f"⚠️  {lerobot_calibration_path(kind, arm_id)} differs from this repo's copy "
+                  f"(python scripts/calibration_store.py --install --force to replace it)")
+
+def report_tuning(ports):
+    """Show the bus_tuner.py settings recorded for these ports and warn when the adapter lost its latency timer"""
+    tuning = load_tuning()
+    for port in ports:
+        settings = tuning.get(port)
+        if not settings:
+            continue
+        timeout = f"{settings['timeout_ms']:g} ms" if settings.get('timeout_ms') else "default"
+        print(f"Bus Tuning: {port} at {settings['baudrate']:,} baud, reply timeout {timeout}")
+        tuned_timer = settings.get('latency_timer_ms')
+        try:
+            timer = read_latency_timer(port)
+        except (OSError, ValueError):
+            timer = None
+        if tuned_timer is not None and timer is not None and timer > tuned_timer:
+            print(f"⚠️  {port} latency timer is {timer} ms, tuned to {tuned_timer} ms "
+                  f"(reset by a replug? see the udev rule from bus_tuner.py --apply)")
+
+def connect_arms(leader_port, follower_port, leader_id=None, follower_id=None):
+    """Create and connect the leader and follower devices"""
+    from lerobot.teleoperators.so101_leader.so101_leader import SO101Leader
+    from lerobot.teleoperators.so101_leader.config_so101_leader import SO101LeaderConfig
+    from lerobot.robots.so101_follower.so101_follower import SO101Follower
+    from lerobot.robots.so101_follower.config_so101_follower import SO101FollowerConfig
+
+    leader = SO101Leader(SO101LeaderConfig(port=leader_port, id=leader_id))
+    follower = SO101Follower(SO101FollowerConfig(port=follower_port, id=follower_id))
+    leader.connect()
+    try:
+        follower.connect()
+    except Exception:
+        leader.disconnect()
+        raise
+    return leader, follower
+
+def connect_daemon(socket_path, leader_id=None, follower_id=None, mapping_path=None):
+    """Attach to a running bus daemon at control priority; calibration comes from this repo's files"""
+    from bus_daemon import PRIORITY_CONTROL, BusClient
+
+    client = BusClient(socket_path, priority=PRIORITY_CONTROL)
+    try:
+        mapping = JointMapping.from_files(default_calibration_path('leader', str(leader_id)),
+                                          default_calibration_path('follower', str(follower_id)), mapping_path)
+        leader_joints = PacketJointBus(client.bus('leader'), mapping.joint_names, ids=mapping.leader_ids)
+        follower_joints = PacketJointBus(client.bus('follower'), mapping.joint_names, ids=mapping.follower_ids)
+    except Exception:
+        client.close()
+        raise
+    return client, mapping, leader_joints, follower_joints
+
+def schedule_arms(leader, follower, mapping):
+    """One BusScheduler per connected arm, sharing the port FeetechMotorsBus already opened"""
+    schedulers = {}
+    joints = {}
+    for arm, device, ids in (('leader', leader, mapping.leader_ids), ('follower', follower, mapping.follower_ids)):
+        ser = device.bus.port_handler.ser
+        scheduler = BusScheduler(FeetechSerial.wrap(ser), ser.baudrate)
+        schedulers[arm] = scheduler
+        joints[arm] = PacketJointBus(scheduler, mapping.joint_names, ids=ids)
+    return schedulers, joints
+
+def arm_links(engine, leader=None, follower=None):
+    """ArmLink per arm for fault recovery; through the bus daemon there is no local port to reopen"""
+    links = []
+    for arm, device, joints in (('leader', leader, engine.leader_joints), ('follower', follower, engine.follower_joints)):
+        if device is None:
+            links.append(ArmLink(arm, joints))
+        else:
+            port_handler = device.bus.port_handler
+            links.append(ArmLink(arm, joints, port_handler.ser, port_handler))
+    return links
+
+def run_teleoperation(leader_port='COM3', follower_port='COM4', *, duration=None, rate=DEFAULT_RATE_HZ,
+                      leader_id=None, follower_id=None, status_interval=1.0, latency_json=None,
+                      mapping_path=None, record_path=None, record_seconds=600, daemon_socket=None,
+                      health=False, health_budget_ms=DEFAULT_BUDGET_MS, schedule=False, predict=None,
+                      filter_min_cutoff=DEFAULT_MIN_CUTOFF, filter_beta=DEFAULT_BETA, predict_lead_ms=None,
+                      recover=True, retries=DEFAULT_RETRIES):
     """Run teleoperation with specified parameters"""
     
     print("🎮 SO-101 Robot Arms Teleoperation Launcher")
     print("=" * 50)
-    print(f"Leader Arm: {leader_port}")
-    print(f"Follower Arm: {follower_port}")
+    if daemon_socket:
+        print(f"Bus Daemon: {daemon_socket}")
+    else:
+        print(f"Leader Arm: {leader_port}")
+        print(f"Follower Arm: {follower_port}")
+        report_tuning((leader_port, follower_port))
+    print(f"Target Rate: {rate} Hz")
     if duration:
         print(f"Duration: {duration} seconds")
     else:
         print("Duration: Unlimited")
+    if record_path:
+        print(f"Recording: {record_path}")
+    if health:
+        print(f"Health Telemetry: up to {health_budget_ms:g} ms of idle bus time per tick")
+    if schedule and daemon_socket:
+        print("Bus Scheduler: handled by the bus daemon")
+        schedule = False
+    elif schedule:
+        print("Bus Scheduler: control first, telemetry queued with each tick's deadline into idle bus time")
+    if predict:
+        lead = f"{predict_lead_ms:g} ms" if predict_lead_ms is not None else "measured latency"
+        print(f"Leader Predictor: One-Euro filter (min cutoff {filter_min_cutoff:g} Hz, beta {filter_beta:g}), "
+              f"{predict} extrapolation by {lead}")
+    if recover:
+        print(f"Fault Recovery: up to {retries} retries per failed transaction, lost ports reopened in the background")
     print("=" * 50)
     
-    # Build command
-    cmd = [
-        'python', '-m', 'lerobot.teleoperate',
-        '--teleop.type=so101_leader',
-        f'--teleop.port={leader_port}',
-        '--robot.type=so101_follower',
-        f'--robot.port={follower_port}'
-    ]
-    
-    if duration:
-        cmd.append(f'--teleop_time_s={duration}')
-    
-    print(f"Starting teleoperation...")
-    print(f"Command: {' '.join(cmd)}")
+    try:
+        print("Connecting arms...")
+        leader = follower = client = None
+        if daemon_socket:
+            for kind, arm_id in (('leader', leader_id), ('follower', follower_id)):
+                warn_if_fallback(kind, arm_id)
+            client, mapping, leader_joints, follower_joints = connect_daemon(daemon_socket, leader_id, follower_id,
+                                                                             mapping_path)
+        else:
+            prepare_calibration(leader_id, follower_id)
+            leader, follower = connect_arms(leader_port, follower_port, leader_id, follower_id)
+            mapping = leader_joints = follower_joints = None
+    except Exception as e:
+        print(f"❌ Error running teleoperation: {e}")
+        sys.exit(1)
+
+    print("Starting teleoperation...")
     print("\nPress Ctrl+C to stop teleoperation")
     print("-" * 50)
-    
+
+    recorder = None
+    recovery = None
+    schedulers = {}
     try:
-        # Run teleoperation
-        process = subprocess.Popen(cmd)
-        
-        if duration:
-            print(f"Teleoperation will run for {duration} seconds...")
-            time.sleep(duration)
-            process.terminate()
-            print("Teleoperation completed!")
-        else:
-            # Wait for user to stop
-            process.wait()
-            
-    except KeyboardInterrupt:
-        print("\n🛑 Stopping teleoperation...")
-        if 'process' in locals():
-            process.terminate()
-            process.wait()
-        print("Teleoperation stopped.")
+        if mapping is None:
+            mapping = JointMapping.from_buses(leader.bus, follower.bus, mapping_path)
+        if schedule:
+            schedulers, joints = schedule_arms(leader, follower, mapping)
+            leader_joints, follower_joints = joints['leader'], joints['follower']
+        if record_path:
+            # Live ring buffer next to the output; other processes can attach to it while recording
+            recorder = TrajectoryRecorder(f"{record_path}.ring", int(rate * record_seconds), mapping.joint_names, rate)
+        predictor = None
+        if predict:
+            predictor = LeaderPredictor(len(mapping.joint_names), filter_min_cutoff, filter_beta, mode=predict,
+                                        lead_s=predict_lead_ms / 1000 if predict_lead_ms is not None else None)
+        engine = TeleopEngine(leader, follower, rate_hz=rate, status_interval=status_interval, mapping=mapping,
+                              recorder=recorder, leader_joints=leader_joints, follower_joints=follower_joints,
+                              predictor=predictor)
+        if recover:
+            recovery = FaultRecovery(arm_links(engine, leader, follower), retries, on_event=print_event)
+            engine.recovery = recovery
+        sampler = None
+        if health:
+            # With schedulers the reads are queued as telemetry and run by the scheduler idle tasks below
+            arms = {'leader': engine.leader_joints, 'follower': engine.follower_joints}
+            sampler = HealthSampler(arms, budget_ms=health_budget_ms, on_alert=print_alert,
+                                    on_error=recovery.report if recovery is not None else None,
+                                    schedulers=schedulers or None)
+        idle_tasks = list(schedulers.values())
+        if recovery is not None:
+            idle_tasks = [recovery.guard(arm, scheduler) for arm, scheduler in schedulers.items()]
+        if idle_tasks or sampler is not None:
+            # The sampler queues its reads before the schedulers run them
+            engine.idle_task = chain(sampler, *idle_tasks)
+        summary = engine.run(duration)
+        print("\n🛑 Teleoperation stopped.")
+        print(format_summary(summary))
+        if health:
+            print("\n".join(sampler.format_report()))
+            counters = sampler.summary(summary['elapsed_s'])
+            print(f"Health reads: {counters['reads']} ({counters['read_errors']} failed), "
+                  f"{counters['bus_share'] * 100:.1f} % of bus time, {counters['skipped_ticks']} ticks without room"
+                  + (f", {counters['missed']} missed their deadline" if schedulers else ''))
+        for scheduler in schedulers.values():
+            print(f"Bus {scheduler.format_stats()}")
+        if recovery is not None:
+            print(format_recovery(recovery.summary()))
+        if predictor is not None:
+            print(f"Leader prediction: {predictor.lead * 1000:.1f} ms ahead "
+                  f"(measured read -> write {predictor.pipeline_s * 1000:.1f} ms)")
+        if latency_json:
+            dump_json(latency_json, engine.latency, {'summary': summary})
+            print(f"Latency histograms written to {latency_json}")
     except Exception as e:
         print(f"❌ Error running teleoperation: {e}")
         sys.exit(1)
+    finally:
+        if recovery is not None:
+            recovery.close()
+        if recorder is not None:
+            count = min(recorder.count, recorder.capacity)
+            recorder.close(compact_path=record_path, remove=True)
+            print(f"📼 {count} ticks written to {record_path}")
+        if client is not None:
+            client.close()
+        else:
+            follower.disconnect()
+            leader.disconnect()
 
 def main():
     parser = argparse.ArgumentParser(description='Launch SO-101 robot arms teleoperation')
     parser.add_argument('--leader-port', default='COM3', help='Leader arm port (default: COM3)')
     parser.add_argument('--follower-port', default='COM4', help='Follower arm port (default: COM4)')
-    parser.add_argument('--duration', type=int, help='Duration in seconds (default: unlimited)')
+    parser.add_argument('--duration', type=float, help='Duration in seconds (default: unlimited)')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE_HZ,
+                       help=f'Target loop rate in Hz (default: {DEFAULT_RATE_HZ})')
+    parser.add_argument('--leader-id', help='Leader calibration id (default: none)')
+    parser.add_argument('--follower-id', help='Follower calibration id (default: none)')
+    parser.add_argument('--status-interval', type=float, default=1.0,
+                       help='Seconds between live latency lines, 0 to disable (default: 1.0)')
+    parser.add_argument('--latency-json', help='Write per-stage latency histograms to this JSON file at exit')
+    parser.add_argument('--mapping', default=str(DEFAULT_MAPPING_PATH),
+                       help='Joint -> motor ID mapping JSON (default: config/joint_mapping.json)')
+    parser.add_argument('--record', help='Record leader/follower joint trajectories to this .trj file')
+    parser.add_argument('--record-seconds', type=float, default=600,
+                       help='Ring buffer length in seconds; older ticks are overwritten (default: 600)')
+    parser.add_argument('--daemon', nargs='?', const=DEFAULT_SOCKET, metavar='SOCKET',
+                       help='Share the ports through a running bus_daemon.py instead of opening them '
+                            f'(default socket: {DEFAULT_SOCKET})')
+    parser.add_argument('--health', action='store_true',
+                       help='Sample motor temperature/voltage/load/errors in idle bus time and alert on thresholds')
+    parser.add_argument('--health-budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                       help=f'Bus time per tick the health sampler may use (default: {DEFAULT_BUDGET_MS:g})')
+    parser.add_argument('--schedule', action='store_true',
+                       help='Run control traffic first and pack other bus traffic into the idle time of each tick')
+    parser.add_argument('--predict', nargs='?', const='velocity', choices=MODES,
+                       help='Filter the leader (One-Euro) and extrapolate it by the pipeline latency '
+                            '(default model: velocity; none = filter only)')
+    parser.add_argument('--filter-min-cutoff', type=float, default=DEFAULT_MIN_CUTOFF,
+                       help=f'One-Euro cutoff at rest in Hz, lower = smoother (default: {DEFAULT_MIN_CUTOFF:g})')
+    parser.add_argument('--filter-beta', type=float, default=DEFAULT_BETA,
+                       help=f'One-Euro cutoff increase per tick/s of speed, higher = less lag (default: {DEFAULT_BETA:g})')
+    parser.add_argument('--predict-lead-ms', type=float,
+                       help='Extrapolate this far ahead instead of the measured latency plus servo lag')
+    parser.add_argument('--no-recover', dest='recover', action='store_false',
+                       help='Stop on the first bus error instead of retrying and reconnecting in the loop')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                       help=f'Retries of a failed transaction within one tick (default: {DEFAULT_RETRIES})')
+    parser.add_argument('--discover', action='store_true',
+                       help='Find the leader and follower ports by their stored calibration instead of --*-port')
     parser.add_argument('--test-first', action='store_true', help='Test connections before starting')
     
     args = parser.parse_args()
+
+    if args.discover:
+        print("🔍 Identifying leader and follower ports...")
+        try:
+            args.leader_port, args.follower_port = resolve_ports(leader_id=args.leader_id or 'leader_arm',
+                                                                 follower_id=args.follower_id or 'follower_arm')
+        except ConnectionError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ Leader on {args.leader_port}, follower on {args.follower_port}")
     
     # Test connections first if requested
     if args.test_first:
@@ -90,7 +306,14 @@ def main():
             sys.exit(1)
     
     # Run teleoperation
-    run_teleoperation(args.leader_port, args.follower_port, args.duration)
+    run_teleoperation(leader_port=args.leader_port, follower_port=args.follower_port, duration=args.duration,
+                      rate=args.rate, leader_id=args.leader_id, follower_id=args.follower_id,
+                      status_interval=args.status_interval, latency_json=args.latency_json,
+                      mapping_path=args.mapping, record_path=args.record, record_seconds=args.record_seconds,
+                      daemon_socket=args.daemon, health=args.health, health_budget_ms=args.health_budget_ms,
+                      schedule=args.schedule, predict=args.predict, filter_min_cutoff=args.filter_min_cutoff,
+                      filter_beta=args.filter_beta, predict_lead_ms=args.predict_lead_ms, recover=args.recover,
+                      retries=args.retries)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
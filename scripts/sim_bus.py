@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Simulated Bus
+Feetech STS3215 servos behind a Linux pseudo-terminal, for hardware-free benchmarking
+
+FeetechMotorsBus (or any serial client) connects to the printed /dev/pts/N
+path exactly as it would to a USB adapter.
+"""
+
+import argparse
+import os
+import random
+import select
+import termios
+import threading
+import time
+import tty
+
+from feetech_protocol import (
+    BAUDRATE_TABLE,
+    BROADCAST_ID,
+    CONTROL_TABLE,
+    CONTROL_TABLE_SIZE,
+    ERRBIT_OVERLOAD,
+    INST_ACTION,
+    INST_PING,
+    INST_READ,
+    INST_REG_WRITE,
+    INST_SYNC_READ,
+    INST_SYNC_WRITE,
+    INST_WRITE,
+    SIGN_BITS,
+    STS3215_MODEL_NUMBER,
+    PacketParser,
+    decode_sign_magnitude,
+    encode_sign_magnitude,
+    encode_status,
+    from_bytes,
+    to_bytes,
+    wire_time,
+)
+
+DEFAULT_IDS = range(1, 7)
+DEFAULT_BAUDRATE = 1_000_000
+
+# Servo dynamics: top speed in ticks/s and load reported per tick of position error
+MAX_SPEED_TICKS = 3400.0
+LOAD_PER_TICK = 2.0
+RESOLUTION = 4096
+
+# Return_Delay_Time register unit
+RETURN_DELAY_UNIT_S = 2e-6
+
+# EEPROM/SRAM defaults written into every simulated servo
+REGISTER_DEFAULTS = {
+    'Firmware_Major_Version': 3,
+    'Firmware_Minor_Version': 10,
+    'Model_Number': STS3215_MODEL_NUMBER,
+    'Baud_Rate': 0,
+    'Return_Delay_Time': 0,
+    'Min_Position_Limit': 0,
+    'Max_Position_Limit': RESOLUTION - 1,
+    'Max_Temperature_Limit': 70,
+    'Max_Voltage_Limit': 140,
+    'Min_Voltage_Limit': 40,
+    'Max_Torque_Limit': 1000,
+    'P_Coefficient': 32,
+    'Acceleration': 254,
+    'Torque_Limit': 1000,
+    'Present_Voltage': 120,
+    'Present_Temperature': 30,
+    'Maximum_Acceleration': 254,
+}
+
+_HOST_BAUDRATES = {
+    getattr(termios, f'B{rate}'): rate for rate in BAUDRATE_TABLE.values() if hasattr(termios, f'B{rate}')
+}
+
+def _wait(seconds):
+    """Sleep with sub-millisecond precision"""
+    deadline = time.perf_counter() + seconds
+    if seconds > 0.002:
+        time.sleep(seconds - 0.001)
+    while time.perf_counter() < deadline:
+        pass
+
+class SimServo:
+    """Register file plus a first-order position model for one STS3215"""
+
+    def __init__(self, motor_id, position=RESOLUTION // 2, stuck=False):
+        self.memory = bytearray(CONTROL_TABLE_SIZE)
+        for name, value in REGISTER_DEFAULTS.items():
+            self._set(name, value)
+        self._set('ID', motor_id)
+        self.position = float(position)
+        self.goal = float(position)
+        self.velocity = 0.0
+        self.stuck = stuck
+        self.error = 0
+        self._last_update = time.perf_counter()
+        self._pending = None
+        self._publish()
+
+    @property
+    def id(self):
+        return self.memory[CONTROL_TABLE['ID'][0]]
+
+    @property
+    def baudrate(self):
+        return BAUDRATE_TABLE.get(self.memory[CONTROL_TABLE['Baud_Rate'][0]], DEFAULT_BAUDRATE)
+
+    @property
+    def return_delay(self):
+        return self.memory[CONTROL_TABLE['Return_Delay_Time'][0]] * RETURN_DELAY_UNIT_S
+
+    def _set(self, name, value):
+        addr, length = CONTROL_TABLE[name]
+        if name in SIGN_BITS:
+            value = encode_sign_magnitude(int(value), SIGN_BITS[name])
+        self.memory[addr:addr + length] = to_bytes(value, length)
+
+    def _get(self, name):
+        addr, length = CONTROL_TABLE[name]
+        value = from_bytes(self.memory[addr:addr + length])
+        if name in SIGN_BITS:
+            value = decode_sign_magnitude(value, SIGN_BITS[name])
+        return value
+
+    def _publish(self):
+        # Present_Position = Actual_Position - Homing_Offset
+        homing = self._get('Homing_Offset')
+        error = self.goal - self.position
+        self._set('Present_Position', round(self.position) - homing)
+        self._set('Present_Velocity', round(self.velocity))
+        self._set('Present_Load', max(-1000, min(1000, round(error * LOAD_PER_TICK))))
+        moving = abs(error) > 1 and self._get('Torque_Enable') and not self.stuck
+        self._set('Moving', 1 if moving else 0)
+
+    def update(self, now):
+        dt = now - self._last_update
+        self._last_update = now
+        if self._get('Torque_Enable') and not self.stuck:
+            step = max(-MAX_SPEED_TICKS * dt, min(MAX_SPEED_TICKS * dt, self.goal - self.position))
+            self.position += step
+            self.velocity = step / dt if dt > 0 else 0.0
+        else:
+            self.velocity = 0.0
+        self._publish()
+
+    def read(self, addr, length, now):
+        self.update(now)
+        return bytes(self.memory[addr:addr + length])
+
+    def write(self, addr, data, now):
+        self.update(now)
+        self.memory[addr:addr + len(data)] = data
+        goal_addr = CONTROL_TABLE['Goal_Position'][0]
+        if addr <= goal_addr < addr + len(data):
+            goal = self._get('Goal_Position') + self._get('Homing_Offset')
+            self.goal = float(max(0, min(RESOLUTION - 1, goal)))
+        self._publish()
+
+    def reg_write(self, addr, data):
+        self._pending = (addr, bytes(data))
+
+    def action(self, now):
+        if self._pending:
+            self.write(*self._pending, now)
+            self._pending = None
+
+class SimBus:
+    """
+    A set of simulated servos served over a pseudo-terminal.
+
+    Every reply is delayed by the request and reply wire time at the
+    servo's baudrate, its Return_Delay_Time and the extra per-packet
+    latency. Faults: drop_rate skips replies, corrupt_rate breaks their
+    checksum, stuck_ids never move and error_ids flag an overload error.
+    """
+
+    def __init__(self, ids=DEFAULT_IDS, latency=0.0, drop_rate=0.0, corrupt_rate=0.0,
+                 stuck_ids=(), error_ids=(), positions=None, seed=None, link=None):
+        positions = positions or {}
+        self.servos = {
+            id_: SimServo(id_, positions.get(id_, RESOLUTION // 2), stuck=id_ in stuck_ids) for id_ in ids
+        }
+        for id_ in error_ids:
+            if id_ in self.servos:
+                self.servos[id_].error = ERRBIT_OVERLOAD
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.corrupt_rate = corrupt_rate
+        self.link = link
+        self.rng = random.Random(seed)
+        self.stats = {'packets': 0, 'replies': 0, 'dropped': 0, 'corrupted': 0, 'bad_packets': 0}
+        self.port = None
+        self._parser = PacketParser()
+        self._master = self._slave = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Create the pty and start serving; returns the port path"""
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        if self.link:
+            if os.path.islink(self.link):
+                os.unlink(self.link)
+            os.symlink(self.port, self.link)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name=f'sim-bus-{self.port}', daemon=True)
+        self._thread.start()
+        return self.link or self.port
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+        if self.link and os.path.islink(self.link):
+            os.unlink(self.link)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _host_baudrate(self):
+        """Baudrate the client configured on the pty, when it is a standard one"""
+        try:
+            return _HOST_BAUDRATES.get(termios.tcgetattr(self._master)[5])
+        except termios.error:
+            return None
+
+    def _serve(self):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([self._master], [], [], 0.05)
+            if not ready:
+                continue
+            try:
+                data = os.read(self._master, 4096)
+            except OSError:
+                continue
+            for packet in self._parser.feed(data):
+                self.stats['packets'] += 1
+                self._handle(*packet)
+            self.stats['bad_packets'] = self._parser.corrupt
+
+    def _reply(self, servo, request_len, params=b''):
+        if self.rng.random() < self.drop_rate:
+            self.stats['dropped'] += 1
+            return
+        packet = bytearray(encode_status(servo.id, servo.error, params))
+        if self.rng.random() < self.corrupt_rate:
+            packet[-1] ^= 0xFF
+            self.stats['corrupted'] += 1
+        baudrate = servo.baudrate
+        _wait(wire_time(request_len, baudrate) + servo.return_delay + self.latency
+              + wire_time(len(packet), baudrate))
+        os.write(self._master, packet)
+        self.stats['replies'] += 1
+
+    def _listening(self, ids):
+        """Servos addressed by ids that can hear the host at its current baudrate"""
+        host_baudrate = self._host_baudrate()
+        return [
+            self.servos[id_] for id_ in ids
+            if id_ in self.servos and (host_baudrate is None or self.servos[id_].baudrate == host_baudrate)
+        ]
+
+    def _handle(self, id_, instruction, params):
+        now = time.perf_counter()
+        request_len = len(params) + 6
+        targets = self._listening(sorted(self.servos) if id_ == BROADCAST_ID else [id_])
+        broadcast = id_ == BROADCAST_ID
+
+        if instruction == INST_PING:
+            for servo in targets:
+                self._reply(servo, request_len)
+        elif instruction == INST_READ and not broadcast:
+            for servo in targets:
+                self._reply(servo, request_len, servo.read(params[0], params[1], now))
+        elif instruction in (INST_WRITE, INST_REG_WRITE):
+            for servo in targets:
+                if instruction == INST_WRITE:
+                    servo.write(params[0], params[1:], now)
+                else:
+                    servo.reg_write(params[0], params[1:])
+                if not broadcast:
+                    self._reply(servo, request_len)
+        elif instruction == INST_ACTION:
+            for servo in targets:
+                servo.action(now)
+        elif instruction == INST_SYNC_READ:
+            addr, length = params[0], params[1]
+            for servo in self._listening(params[2:]):
+                self._reply(servo, request_len, servo.read(addr, length, now))
+                # Only the first reply waits for the request to clear the wire
+                request_len = 0
+        elif instruction == INST_SYNC_WRITE:
+            addr, length = params[0], params[1]
+            for offset in range(2, len(params), length + 1):
+                for servo in self._listening([params[offset]]):
+                    servo.write(addr, params[offset + 1:offset + 1 + length], now)
+        # Any ID change re-keys the servo table
+        for key, servo in list(self.servos.items()):
+            if servo.id != key:
+                self.servos[servo.id] = self.servos.pop(key)
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve simulated SO-101 Feetech servos on pseudo-terminals')
+    parser.add_argument('--link', action='append', default=[],
+                       help='Symlink path for a bus (repeat for several buses, e.g. /tmp/so101_leader)')
+    parser.add_argument('--ids', type=int, nargs='+', default=list(DEFAULT_IDS), help='Motor IDs (default: 1-6)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Extra latency per reply packet')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='Probability of dropping a reply')
+    parser.add_argument('--corrupt-rate', type=float, default=0.0, help='Probability of a bad reply checksum')
+    parser.add_argument('--stuck-ids', type=int, nargs='*', default=[], help='Motors that never move')
+    parser.add_argument('--error-ids', type=int, nargs='*', default=[], help='Motors reporting an overload error')
+    parser.add_argument('--seed', type=int, help='Random seed for fault injection')
+
+    args = parser.parse_args()
+
+    buses = [
+        SimBus(args.ids, latency=args.latency_ms / 1000, drop_rate=args.drop_rate,
+               corrupt_rate=args.corrupt_rate, stuck_ids=args.stuck_ids, error_ids=args.error_ids,
+               seed=args.seed, link=link)
+        for link in (args.link or [None])
+    ]
+
+    print("🧪 SO-101 Simulated Feetech Bus")
+    print("=" * 50)
+    for bus in buses:
+        print(f"Serving motors {args.ids} on {bus.start()}")
+    print("Press Ctrl+C to stop")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for bus in buses:
+            bus.stop()
+            print(f"{bus.port}: {bus.stats}")
+
+if __name__ == "__main__":
+    main()
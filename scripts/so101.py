@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Command Line
+One entry point for the everyday arm chores: scan, discover, ping, torque, teleop, calibrate
+
+Serial-only subcommands (scan, discover, ping, torque) talk to the servos through
+feetech_serial (or a running bus daemon with --daemon) and never import
+lerobot or numpy, so they start in tens of milliseconds. teleop and
+calibrate import the LeRobot stack on demand.
+"""
+
+import argparse
+import contextlib
+import sys
+import threading
+
+# Motor IDs on a default-wired SO-101 arm
+DEFAULT_IDS = list(range(1, 7))
+
+# Default ports per arm (the same defaults as run_teleop.py)
+DEFAULT_PORTS = {'leader': 'COM3', 'follower': 'COM4'}
+
+def _parse_ids(text):
+    """'1-6' or '1,3,5' -> [ids]"""
+    ids = []
+    for part in text.split(','):
+        lo, _, hi = part.partition('-')
+        ids.extend(range(int(lo), int(hi or lo) + 1))
+    return ids
+
+@contextlib.contextmanager
+def _open_bus(args):
+    """The serial port itself, or the same bus shared through a running bus daemon (--daemon)"""
+    if args.daemon is None:
+        from feetech_serial import FeetechSerial
+
+        with FeetechSerial(args.port, args.baudrate) as bus:
+            yield bus
+        return
+
+    from bus_daemon import DEFAULT_SOCKET, BusClient
+
+    with BusClient(args.daemon or DEFAULT_SOCKET) as client:
+        yield client.bus(args.port)
+
+def cmd_scan(args):
+    from feetech_serial import FeetechSerial
+    # Per-ID window sized from the adapter latency timer, the same one discover_motors() sweeps with
+    from so101_bus import sweep_ping_timeout
+
+    if args.ports:
+        ports = args.ports
+    else:
+        from serial.tools import list_ports
+        ports = sorted(p.device for p in list_ports.comports())
+    if not ports:
+        print("❌ No serial ports found")
+        return 1
+
+    print(f"🔍 Scanning {len(ports)} port(s) for IDs {args.ids[0]}-{args.ids[-1]} at {args.baudrate} baud...")
+    found = {}
+
+    def scan(port):
+        try:
+            timeout_ms = sweep_ping_timeout(port)
+            with FeetechSerial(port, args.baudrate) as bus:
+                found[port] = {id_: model for id_ in args.ids
+                               if (model := bus.ping(id_, timeout_ms=timeout_ms)) is not None}
+        except Exception as e:
+            found[port] = e
+
+    # Ports are independent: scan them all at once
+    threads = [threading.Thread(target=scan, args=(port,)) for port in ports]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for port in ports:
+        result = found.get(port)
+        if isinstance(result, Exception):
+            print(f"❌ {port}: {result}")
+        elif result:
+            print(f"✅ {port}: {len(result)} motor(s) - IDs {sorted(result)}")
+        else:
+            print(f"⚪ {port}: no motors answered")
+    return 0 if any(isinstance(r, dict) and r for r in found.values()) else 1
+
+def cmd_discover(args):
+    from port_discovery import discover, print_discovery
+
+    print("🔍 Identifying leader and follower ports...")
+    discovery = discover(args.ports or None, args.ids, args.baudrate, leader_id=args.leader_id,
+                         follower_id=args.follower_id)
+    print_discovery(discovery)
+    return 0 if discovery.leader and discovery.follower else 1
+
+def cmd_ping(args):
+    print(f"📡 Pinging IDs {args.ids} on {args.port}")
+    failed = 0
+    with _open_bus(args) as bus:
+        positions = bus.sync_read('Present_Position', args.ids)
+        for id_ in args.ids:
+            model = bus.ping(id_)
+            if model is None:
+                print(f"❌ Motor ID {id_} - no reply")
+                failed += 1
+                continue
+            pos = positions.get(id_)
+            extra = ''
+            if args.verbose:
+                extra = (f", {bus.read('Present_Voltage', id_) / 10:.1f} V"
+                         f", {bus.read('Present_Temperature', id_)} °C"
+                         f", torque {'on' if bus.read('Torque_Enable', id_) else 'off'}")
+            print(f"✅ Motor ID {id_} - model {model}, position {pos if pos is not None else '?'}{extra}")
+    return 1 if failed else 0
+
+def cmd_torque(args):
+    enable = args.state == 'on'
+    with _open_bus(args) as bus:
+        # Same order as FeetechMotorsBus: torque first, then the EEPROM lock
+        bus.sync_write('Torque_Enable', {id_: int(enable) for id_ in args.ids})
+        bus.sync_write('Lock', {id_: int(enable) for id_ in args.ids})
+        state = bus.sync_read('Torque_Enable', args.ids)
+
+    wrong = [id_ for id_ in args.ids if state.get(id_) != int(enable)]
+    if wrong:
+        print(f"❌ Torque {args.state} not confirmed on IDs {wrong}")
+        return 1
+    print(f"✅ Torque {args.state.upper()} on IDs {args.ids} ({args.port})")
+    if not enable:
+        print("All listed motors are loose and can be moved by hand.")
+    return 0
+
+def cmd_teleop(args):
+    import run_teleop
+
+    sys.argv = ['run_teleop.py', *args.teleop_args]
+    run_teleop.main()
+    return 0
+
+def cmd_calibrate(args):
+    import runpy
+
+    port = args.port or DEFAULT_PORTS[args.arm]
+    if args.arm == 'leader':
+        argv = ['--teleop.type=so101_leader', f'--teleop.port={port}', f'--teleop.id={args.id}']
+    else:
+        argv = ['--robot.type=so101_follower', f'--robot.port={port}', f'--robot.id={args.id}']
+    sys.argv = ['lerobot.calibrate', *argv]
+    runpy.run_module('lerobot.calibrate', run_name='__main__', alter_sys=True)
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='so101', description='SO-101 robot arms command line')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def serial_options(p, port=True):
+        if port:
+            p.add_argument('--port', default=DEFAULT_PORTS['follower'], help='Arm port (default: COM4)')
+        p.add_argument('--ids', type=_parse_ids, default=DEFAULT_IDS, help='Motor IDs, e.g. 1-6 or 1,3,5 (default: 1-6)')
+        p.add_argument('--baudrate', type=int, default=1_000_000, help='Bus baud rate (default: 1000000)')
+        if port:
+            p.add_argument('--daemon', nargs='?', const='', metavar='SOCKET',
+                           help='Go through a running bus_daemon.py; --port is then a bus name or port')
+
+    p = sub.add_parser('scan', help='Find serial ports and the motor IDs answering on each')
+    p.add_argument('ports', nargs='*', help='Ports to scan (default: every serial port)')
+    serial_options(p, port=False)
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser('discover', help='Tell the leader and follower ports apart by their stored calibration')
+    p.add_argument('ports', nargs='*', help='Ports to probe (default: every USB serial port)')
+    serial_options(p, port=False)
+    p.add_argument('--leader-id', default='leader_arm', help='Leader calibration id (default: leader_arm)')
+    p.add_argument('--follower-id', default='follower_arm', help='Follower calibration id (default: follower_arm)')
+    p.set_defaults(func=cmd_discover)
+
+    p = sub.add_parser('ping', help='Ping motors and print model and position')
+    serial_options(p)
+    p.add_argument('-v', '--verbose', action='store_true', help='Also read voltage, temperature and torque state')
+    p.set_defaults(func=cmd_ping)
+
+    p = sub.add_parser('torque', help='Enable or disable torque')
+    p.add_argument('state', choices=('on', 'off'))
+    serial_options(p)
+    p.set_defaults(func=cmd_torque)
+
+    # Every teleop option (including --help) is left for run_teleop.py to parse
+    p = sub.add_parser('teleop', help='Run teleoperation (options are passed to run_teleop.py)', add_help=False)
+    p.set_defaults(func=cmd_teleop)
+
+    p = sub.add_parser('calibrate', help='Calibrate an arm with lerobot.calibrate')
+    p.add_argument('arm', choices=('leader', 'follower'))
+    p.add_argument('--port', help='Arm port (default: COM3 for leader, COM4 for follower)')
+    p.add_argument('--id', help='Calibration id (default: my_awesome_<arm>_arm)')
+    p.set_defaults(func=cmd_calibrate)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'teleop':
+        args.teleop_args = extra
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command == 'calibrate' and not args.id:
+        args.id = f"my_awesome_{args.arm}_arm"
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"❌ {args.command} failed: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Bus Helpers
+Shared motor layout, single-connection discovery and bulk joint access for the Feetech bus
+"""
+
+import logging
+
+import numpy as np
+
+from feetech_protocol import (
+    CONTROL_TABLE,
+    SIGN_BITS,
+    decode_sign_magnitude,
+    encode_sign_magnitude,
+    encode_sync_read,
+    encode_sync_write,
+)
+
+try:
+    # pyserial lets termios errors through on POSIX (e.g. flushing a port whose adapter vanished)
+    from termios import error as _TermiosError
+except ImportError:
+    _TermiosError = OSError
+
+logger = logging.getLogger(__name__)
+
+# Joint order used by every tool in this repo (index == position in joint vectors)
+JOINT_NAMES = ['shoulder_pan', 'shoulder_lift', 'elbow_flex', 'wrist_flex', 'wrist_roll', 'gripper']
+
+# Expected SO-101 wiring: joint name -> motor ID
+DEFAULT_MOTOR_IDS = {name: i + 1 for i, name in enumerate(JOINT_NAMES)}
+
+MOTOR_MODEL = 'sts3215'
+DEFAULT_BAUDRATE = 1_000_000
+MAX_MOTOR_ID = 253
+
+# Present_Position, Present_Velocity and Present_Load are contiguous: one 6-byte sync read
+STATE_FIELDS = ('position', 'velocity', 'load')
+STATE_ADDRESS = CONTROL_TABLE['Present_Position'][0]
+STATE_LENGTH = 6
+POSITION_ADDRESS, POSITION_LENGTH = CONTROL_TABLE['Present_Position']
+GOAL_ADDRESS, GOAL_LENGTH = CONTROL_TABLE['Goal_Position']
+
+# Bus fault classes (BusError.kind): a missing reply, a reply with a bad checksum, or the port itself failing
+FAULT_TIMEOUT = 'timeout'
+FAULT_CHECKSUM = 'checksum'
+FAULT_PORT_LOST = 'port_lost'
+
+# Per-ID reply window used by the fallback sweep when the USB adapter latency
+# timer cannot be read; must cover it (16 ms by default on Linux FTDI) or
+# replies arrive too late. 253 IDs at 20 ms is ~5 s per baudrate, so only
+# the broadcast ping meets the sub-second discovery budget with this window
+SWEEP_PING_TIMEOUT_MS = 20.0
+
+# Margin added to twice the latency timer for the sweep window (as REPLY_TIMEOUT_MS does)
+SWEEP_PING_MARGIN_MS = 2.0
+
+
+class BusError(ConnectionError):
+    """A failed joint transaction; kind is FAULT_TIMEOUT, FAULT_CHECKSUM or FAULT_PORT_LOST"""
+
+    def __init__(self, message, kind=FAULT_TIMEOUT):
+        super().__init__(message)
+        self.kind = kind
+
+def classify_fault(error):
+    """Fault class of an exception raised by a bus transaction, None if it is not a bus fault"""
+    if isinstance(error, BusError):
+        return error.kind
+    if isinstance(error, ConnectionError):
+        return FAULT_TIMEOUT
+    # pyserial's SerialException is an OSError: the adapter vanished or the port stopped working
+    if isinstance(error, (OSError, _TermiosError)):
+        return FAULT_PORT_LOST
+    return None
+
+def norm_mode_for(joint_name):
+    """Return the normalization mode used for a joint"""
+    from lerobot.motors import MotorNormMode
+
+    return MotorNormMode.RANGE_0_100 if joint_name == 'gripper' else MotorNormMode.DEGREES
+
+
+def make_motors(motor_ids=None, model=MOTOR_MODEL):
+    """Build the name -> Motor mapping for an SO-101 arm"""
+    from lerobot.motors import Motor
+
+    motor_ids = motor_ids or DEFAULT_MOTOR_IDS
+    return {name: Motor(motor_id, model, norm_mode_for(name)) for name, motor_id in motor_ids.items()}
+
+
+def _sweep_ping(bus, ids, timeout_ms=SWEEP_PING_TIMEOUT_MS):
+    """Ping each ID over the already open port with a short reply window"""
+    import scservo_sdk as scs
+
+    port, packet = bus.port_handler, bus.packet_handler
+    found = []
+    for id_ in ids:
+        txpacket = [0] * 6
+        txpacket[scs.PKT_ID] = id_
+        txpacket[scs.PKT_LENGTH] = 2
+        txpacket[scs.PKT_INSTRUCTION] = scs.INST_PING
+        if packet.txPacket(port, txpacket) != scs.COMM_SUCCESS:
+            port.is_using = False
+            continue
+        port.setPacketTimeoutMillis(timeout_ms + port.tx_time_per_byte * 12)
+        rxpacket, result = packet.rxPacket(port)
+        if result == scs.COMM_SUCCESS and rxpacket[scs.PKT_ID] == id_:
+            found.append(id_)
+    return found
+
+
+def sweep_ping_timeout(port):
+    """Per-ID sweep window in ms: twice the adapter latency timer plus a margin, when it can be read"""
+    from bus_tuner import read_latency_timer
+
+    try:
+        timer_ms = read_latency_timer(port)
+    except (OSError, ValueError):
+        timer_ms = None
+    if timer_ms is None:
+        return SWEEP_PING_TIMEOUT_MS
+    return min(SWEEP_PING_TIMEOUT_MS, 2 * timer_ms + SWEEP_PING_MARGIN_MS)
+
+
+def discover_motors(port, baudrates=None, max_id=MAX_MOTOR_ID, disable_torque=False):
+    """
+    Discover every motor on a port using a single open connection.
+
+    For each baudrate a broadcast ping collects all responding IDs in one
+    transaction; if that fails, IDs 1..max_id are swept with short per-ID
+    pings on the same port. Returns {baudrate: {motor_id: model_number}}.
+    With disable_torque=True the found motors are released before closing.
+
+    Only the broadcast path is sub-second. The sweep costs max_id times the
+    per-ID window from sweep_ping_timeout(): ~1 s with the latency timer at
+    1 ms (see bus_tuner.py), ~5 s at the 16 ms default or when it can't be read.
+    """
+    from lerobot.motors.feetech import FeetechMotorsBus
+
+    baudrates = baudrates or [DEFAULT_BAUDRATE]
+    sweep_timeout_ms = sweep_ping_timeout(port)
+    bus = FeetechMotorsBus(port, motors={})
+    bus.connect(handshake=False)
+
+    results = {}
+    try:
+        for baudrate in baudrates:
+            bus.set_baudrate(baudrate)
+            id_models = bus.broadcast_ping()
+            if not id_models:
+                logger.debug(f"Broadcast ping found nothing at {baudrate} bps, sweeping IDs")
+                ids = _sweep_ping(bus, range(1, max_id + 1), sweep_timeout_ms)
+                id_models = bus._read_model_number(ids) if ids else {}
+            if id_models:
+                results[baudrate] = dict(sorted(id_models.items()))
+                if disable_torque:
+                    for motor_id in id_models:
+                        bus._disable_torque(motor_id, MOTOR_MODEL)
+    finally:
+        bus.disconnect(disable_torque=False)
+
+    return results
+
+
+def motors_from_discovery(id_models, layout=None):
+    """
+    Build the name -> Motor mapping from discovered {motor_id: model_number}.
+
+    IDs that match the SO-101 layout keep their joint name, anything else is
+    exposed as motor_<id> so it still shows up in the scan.
+    """
+    from lerobot.motors import Motor, MotorNormMode
+    from lerobot.motors.feetech.tables import MODEL_NUMBER_TABLE
+
+    layout = layout or DEFAULT_MOTOR_IDS
+    id_to_joint = {motor_id: name for name, motor_id in layout.items()}
+    number_to_model = {number: model for model, number in MODEL_NUMBER_TABLE.items()}
+
+    motors = {}
+    for motor_id, model_number in sorted(id_models.items()):
+        model = number_to_model.get(model_number, MOTOR_MODEL)
+        name = id_to_joint.get(motor_id)
+        if name is None:
+            motors[f'motor_{motor_id}'] = Motor(motor_id, model, MotorNormMode.DEGREES)
+        else:
+            motors[name] = Motor(motor_id, model, norm_mode_for(name))
+    return motors
+
+
+def decode_positions(replies, ids, out):
+    """Present_Position sync read replies {id: bytes} -> out[i] for ids[i], raw ticks"""
+    sign_bit = SIGN_BITS['Present_Position']
+    for i, id_ in enumerate(ids):
+        d = replies[id_]
+        out[i] = decode_sign_magnitude(d[0] | d[1] << 8, sign_bit)
+    return out
+
+def decode_state(replies, ids, out):
+    """STATE_ADDRESS block replies {id: bytes} -> out[i] = (position, velocity, load) for ids[i]"""
+    pos_bit, vel_bit, load_bit = SIGN_BITS['Present_Position'], SIGN_BITS['Present_Velocity'], SIGN_BITS['Present_Load']
+    for i, id_ in enumerate(ids):
+        d = replies[id_]
+        out[i, 0] = decode_sign_magnitude(d[0] | d[1] << 8, pos_bit)
+        out[i, 1] = decode_sign_magnitude(d[2] | d[3] << 8, vel_bit)
+        out[i, 2] = decode_sign_magnitude(d[4] | d[5] << 8, load_bit)
+    return out
+
+
+class JointBus:
+    """
+    Fixed-order joint vector access on a connected FeetechMotorsBus.
+
+    Index i of every array is joint_names[i]. Each read is one sync read
+    transaction and each write one sync write, whatever the joint count;
+    the sync packets are set up once and reused every call. Values are
+    raw ticks (no calibration applied).
+
+    ids overrides the motor ID behind each joint (e.g. a JointMapping for
+    an arm with swapped wiring); by default the bus's own motor table is used.
+    """
+
+    def __init__(self, bus, joint_names=JOINT_NAMES, ids=None):
+        import scservo_sdk as scs
+
+        self.bus = bus
+        self.joint_names = list(joint_names)
+        self.ids = list(ids) if ids is not None else [bus.motors[name].id for name in self.joint_names]
+        self._comm_success = scs.COMM_SUCCESS
+        self._comm_faults = {scs.COMM_RX_CORRUPT: FAULT_CHECKSUM, scs.COMM_TX_FAIL: FAULT_PORT_LOST}
+
+        self._position_reader = scs.GroupSyncRead(bus.port_handler, bus.packet_handler,
+                                                  POSITION_ADDRESS, POSITION_LENGTH)
+        self._state_reader = scs.GroupSyncRead(bus.port_handler, bus.packet_handler, STATE_ADDRESS, STATE_LENGTH)
+        self._writer = scs.GroupSyncWrite(bus.port_handler, bus.packet_handler, GOAL_ADDRESS, GOAL_LENGTH)
+        for id_ in self.ids:
+            self._position_reader.addParam(id_)
+            self._state_reader.addParam(id_)
+            self._writer.addParam(id_, [0] * GOAL_LENGTH)
+        self._block_readers = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index(self, joint_name):
+        return self.joint_names.index(joint_name)
+
+    def _transact(self, reader):
+        comm = reader.txRxPacket()
+        if comm != self._comm_success:
+            raise BusError(
+                f"Failed to sync read joints {self.ids}: {self.bus.packet_handler.getTxRxResult(comm)}",
+                self._comm_faults.get(comm, FAULT_TIMEOUT),
+            )
+        return reader.data_dict
+
+    def read_block(self, address, length, ids=None):
+        """Raw register bytes {id: bytes} of any block for some or all joints, one sync read"""
+        import scservo_sdk as scs
+
+        ids = tuple(self.ids if ids is None else ids)
+        reader = self._block_readers.get((address, length, ids))
+        if reader is None:
+            reader = scs.GroupSyncRead(self.bus.port_handler, self.bus.packet_handler, address, length)
+            for id_ in ids:
+                reader.addParam(id_)
+            self._block_readers[(address, length, ids)] = reader
+        data = self._transact(reader)
+        return {id_: data[id_] for id_ in ids}
+
+    def read_positions(self, out=None):
+        """Present_Position of every joint, shape (N,)"""
+        out = np.empty(len(self.ids), dtype=np.int32) if out is None else out
+        return decode_positions(self._transact(self._position_reader), self.ids, out)
+
+    def read_state(self, out=None):
+        """Position, velocity and load of every joint, shape (N, 3) ordered like STATE_FIELDS"""
+        out = np.empty((len(self.ids), len(STATE_FIELDS)), dtype=np.int32) if out is None else out
+        return decode_state(self._transact(self._state_reader), self.ids, out)
+
+    def write_goals(self, goals):
+        """Goal_Position of every joint in one sync write (raw ticks, shape (N,))"""
+        sign_bit = SIGN_BITS['Goal_Position']
+        data_dict = self._writer.data_dict
+        for id_, goal in zip(self.ids, goals):
+            value = encode_sign_magnitude(int(goal), sign_bit)
+            data_dict[id_] = [value & 0xFF, (value >> 8) & 0xFF]
+        self._writer.is_param_changed = True
+        comm = self._writer.txPacket()
+        if comm != self._comm_success:
+            raise BusError(
+                f"Failed to sync write joints {self.ids}: {self.bus.packet_handler.getTxRxResult(comm)}",
+                self._comm_faults.get(comm, FAULT_TIMEOUT),
+            )
+
+class PacketJointBus:
+    """
+    Fixed-order joint vectors over any raw-packet transport, same layout as JointBus.
+
+    transport needs transact(packet, reply_ids, reply_params) -> {id: params}
+    and a port attribute: a feetech_serial.FeetechSerial or a bus daemon
+    client's bus both qualify, so teleop does not need a FeetechMotorsBus.
+    """
+
+    def __init__(self, transport, joint_names=JOINT_NAMES, ids=None):
+        self.transport = transport
+        self.joint_names = list(joint_names)
+        self.ids = list(ids) if ids is not None else [DEFAULT_MOTOR_IDS[name] for name in self.joint_names]
+        self._position_packet = encode_sync_read(POSITION_ADDRESS, POSITION_LENGTH, self.ids)
+        self._state_packet = encode_sync_read(STATE_ADDRESS, STATE_LENGTH, self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def index(self, joint_name):
+        return self.joint_names.index(joint_name)
+
+    def _sync_read(self, packet, length, ids=None):
+        ids = self.ids if ids is None else ids
+        corrupt = getattr(self.transport, 'corrupt_packets', 0)
+        replies = self.transport.transact(packet, ids, length)
+        if len(replies) != len(ids):
+            missing = [id_ for id_ in ids if id_ not in replies]
+            # A reply dropped for a bad checksum looks like a timeout unless the parser counted it
+            kind = FAULT_CHECKSUM if getattr(self.transport, 'corrupt_packets', 0) != corrupt else FAULT_TIMEOUT
+            raise BusError(f"Failed to sync read joints {missing} on {self.transport.port}", kind)
+        return replies
+
+    def read_block(self, address, length, ids=None):
+        """Raw register bytes {id: bytes} of any block for some or all joints, one sync read"""
+        ids = list(self.ids if ids is None else ids)
+        return self._sync_read(encode_sync_read(address, length, ids), length, ids)
+
+    def read_positions(self, out=None):
+        """Present_Position of every joint, shape (N,)"""
+        out = np.empty(len(self.ids), dtype=np.int32) if out is None else out
+        return decode_positions(self._sync_read(self._position_packet, POSITION_LENGTH), self.ids, out)
+
+    def read_state(self, out=None):
+        """Position, velocity and load of every joint, shape (N, 3) ordered like STATE_FIELDS"""
+        out = np.empty((len(self.ids), len(STATE_FIELDS)), dtype=np.int32) if out is None else out
+        return decode_state(self._sync_read(self._state_packet, STATE_LENGTH), self.ids, out)
+
+    def write_goals(self, goals):
+        """Goal_Position of every joint in one sync write (raw ticks, shape (N,))"""
+        sign_bit = SIGN_BITS['Goal_Position']
+        ids_data = {}
+        for id_, goal in zip(self.ids, goals):
+            value = encode_sign_magnitude(int(goal), sign_bit)
+            ids_data[id_] = bytes((value & 0xFF, (value >> 8) & 0xFF))
+        self.transport.transact(encode_sync_write(GOAL_ADDRESS, GOAL_LENGTH, ids_data))
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Teleoperation Engine
+In-process leader -> follower loop on a deadline-based fixed-rate scheduler
+"""
+
+import math
+import sys
+import threading
+import time
+
+import numpy as np
+
+from joint_mapping import JointMapping
+from latency_histogram import LatencyHistogram, format_line
+from so101_bus import JOINT_NAMES, JointBus
+
+DEFAULT_RATE_HZ = 100
+
+# Per-tick pipeline stages timed into latency histograms
+# (leader normalize + follower unnormalize are one precomputed transform in 'map')
+STAGES = ('read', 'map', 'write', 'slack')
+
+# Sleep until this close to the deadline, then spin for the rest
+SPIN_THRESHOLD_S = 0.001
+
+def sleep_until(deadline):
+    """Sleep until a perf_counter deadline, spinning for the last millisecond"""
+    remaining = deadline - time.perf_counter()
+    if remaining > SPIN_THRESHOLD_S:
+        time.sleep(remaining - SPIN_THRESHOLD_S)
+    while time.perf_counter() < deadline:
+        pass
+
+class RateStats:
+    """Running tick period statistics (Welford), no per-tick allocation"""
+
+    def __init__(self, target_hz):
+        self.target_period = 1.0 / target_hz
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.overruns = 0
+        self.skipped = 0
+
+    def add(self, period):
+        self.count += 1
+        delta = period - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (period - self.mean)
+        if period < self.min:
+            self.min = period
+        if period > self.max:
+            self.max = period
+
+    @property
+    def jitter(self):
+        """Standard deviation of the tick period in seconds"""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    @property
+    def rate(self):
+        return 1.0 / self.mean if self.mean > 0 else 0.0
+
+    def summary(self, elapsed):
+        ticks = self.count + 1 if self.count else 0
+        return {
+            'ticks': ticks,
+            'elapsed_s': elapsed,
+            'target_hz': 1.0 / self.target_period,
+            'achieved_hz': ticks / elapsed if elapsed > 0 else 0.0,
+            'period_mean_ms': self.mean * 1000,
+            'period_min_ms': (self.min if self.count else 0.0) * 1000,
+            'period_max_ms': self.max * 1000,
+            'jitter_ms': self.jitter * 1000,
+            'overruns': self.overruns,
+            'skipped_ticks': self.skipped,
+        }
+
+class FixedRateLoop:
+    """
+    Call tick() at a fixed rate until stopped.
+
+    Deadlines are absolute (start + n * period) so the schedule never drifts;
+    a tick that overruns by more than a full period skips the missed slots
+    instead of bursting to catch up. Subclasses implement tick() and may
+    call stop() from it. Every status_interval the live status line is
+    printed, or status_callback() is called instead when one is set.
+
+    idle_task(deadline), when set, runs after every tick that finished
+    early and must return before the perf_counter deadline of the next
+    tick; it gets the loop thread (and so the buses) in between ticks, but
+    is skipped while buses_up() is false. tick_deadline is the perf_counter
+    time the running tick should be done by.
+    """
+
+    def __init__(self, rate_hz=DEFAULT_RATE_HZ, status_interval=None, stages=STAGES):
+        self.rate_hz = rate_hz
+        self.period = 1.0 / rate_hz
+        self.status_interval = status_interval
+        self.stats = RateStats(rate_hz)
+        self.latency = {stage: LatencyHistogram() for stage in stages}
+        self.status_callback = None
+        self.idle_task = None
+        self.tick_deadline = None
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def tick(self):
+        raise NotImplementedError
+
+    def buses_up(self):
+        return True
+
+    def run_idle(self, deadline):
+        self.idle_task(deadline)
+
+    def _print_status(self):
+        sys.stdout.write(f"\r{self.stats.rate:6.1f} Hz | {format_line(self.latency)}   ")
+        sys.stdout.flush()
+
+    def run(self, duration=None):
+        """Run until stop(), Ctrl+C or the duration elapses; returns the summary"""
+        self._stop.clear()
+        start = time.perf_counter()
+        end = start + duration if duration else math.inf
+        next_deadline = start
+        last_tick = None
+        next_status = start + self.status_interval if self.status_interval else math.inf
+        slack = self.latency['slack']
+
+        try:
+            while not self._stop.is_set():
+                now = time.perf_counter()
+                if now >= end:
+                    break
+                if last_tick is not None:
+                    self.stats.add(now - last_tick)
+                last_tick = now
+
+                self.tick_deadline = next_deadline + self.period
+                self.tick()
+
+                next_deadline += self.period
+                now = time.perf_counter()
+                if self.idle_task is not None and now < next_deadline and self.buses_up():
+                    self.run_idle(next_deadline)
+                    now = time.perf_counter()
+                if now > next_deadline:
+                    self.stats.overruns += 1
+                    missed = int((now - next_deadline) / self.period)
+                    if missed:
+                        self.stats.skipped += missed
+                        next_deadline += missed * self.period
+                else:
+                    slack.record_ns(int((next_deadline - now) * 1e9))
+                if now >= next_status:
+                    (self.status_callback or self._print_status)()
+                    next_status += self.status_interval
+                sleep_until(min(next_deadline, end))
+        except KeyboardInterrupt:
+            pass
+
+        if self.status_interval and self.status_callback is None:
+            sys.stdout.write("\n")
+        return self.stats.summary(time.perf_counter() - start)
+
+class TeleopEngine(FixedRateLoop):
+    """
+    Drive the follower from the leader at a fixed rate.
+
+    leader_joints/follower_joints replace the JointBus built on each
+    device's bus (e.g. PacketJointBus through the bus daemon); the devices
+    may then be None, and mapping must be given.
+
+    predictor (a LeaderPredictor) filters and extrapolates the leader
+    positions before they are mapped; it is fed the measured sample ->
+    goal written latency of every tick.
+
+    recovery (a fault_recovery.FaultRecovery over 'leader' and 'follower')
+    retries failed transactions within the tick. While an arm is being
+    reconnected the ticks go by without bus traffic and the follower holds
+    its last goal. Bus faults escaping the idle task are handed to
+    recovery too, and a lost port there is reconnected the same way.
+    """
+
+    def __init__(self, leader, follower, rate_hz=DEFAULT_RATE_HZ, status_interval=None, joint_names=JOINT_NAMES,
+                 mapping=None, recorder=None, leader_joints=None, follower_joints=None, predictor=None):
+        super().__init__(rate_hz, status_interval)
+        self.leader = leader
+        self.follower = follower
+        # Both calibrations and the joint -> motor ID tables, resolved once
+        self.mapping = mapping or JointMapping.from_buses(leader.bus, follower.bus, joint_names=joint_names)
+        if leader_joints is None:
+            leader_joints = JointBus(leader.bus, joint_names, ids=self.mapping.leader_ids)
+        if follower_joints is None:
+            follower_joints = JointBus(follower.bus, joint_names, ids=self.mapping.follower_ids)
+        self.leader_joints = leader_joints
+        self.follower_joints = follower_joints
+        # Tick buffers, reused every tick
+        self._leader_raw = np.zeros(len(joint_names), dtype=np.int32)
+        self._goals = np.zeros(len(joint_names), dtype=np.int32)
+        self.predictor = predictor
+        self._predicted = np.zeros(len(joint_names))
+        # Optional trajectory recorder; recording adds one follower state sync read per tick
+        self.recorder = recorder
+        self._follower_state = np.zeros((len(joint_names), 3), dtype=np.int32)
+        self._follower_pos = self._follower_state[:, 0]
+        self._follower_load = self._follower_state[:, 2]
+        if recorder is not None:
+            self.latency['record'] = LatencyHistogram()
+        self.recovery = None
+        self._generation = 0
+
+    def buses_up(self):
+        return self.recovery is None or self.recovery.all_up
+
+    def run_idle(self, deadline):
+        if self.recovery is None:
+            self.idle_task(deadline)
+            return
+        try:
+            self.idle_task(deadline)
+        except Exception as e:
+            # Idle tasks wrapped by recovery.guard() report their own arm; anything else may be either port
+            self.recovery.report(None, e)
+
+    def tick(self):
+        """One leader read -> follower write pass, timing every stage"""
+        perf_ns = time.perf_counter_ns
+        latency = self.latency
+        recovery = self.recovery
+        predictor = self.predictor
+
+        if recovery is not None:
+            if not recovery.all_up:
+                return
+            if recovery.generation != self._generation:
+                # Back from an outage: the filter state describes where the leader was before it
+                self._generation = recovery.generation
+                if predictor is not None:
+                    predictor.reset()
+
+        t0 = perf_ns()
+        if recovery is None:
+            raw = self.leader_joints.read_positions(self._leader_raw)
+        else:
+            raw = recovery.call('leader', self.leader_joints.read_positions, self._leader_raw, self.tick_deadline)
+            if raw is None:
+                return
+        t1 = perf_ns()
+        if predictor is None:
+            goals = self.mapping.apply(raw, self._goals)
+        else:
+            # The leader is sampled somewhere inside the read; take the middle
+            sampled = (t0 + t1) // 2
+            goals = self.mapping.apply_float(predictor.update(raw, sampled / 1e9, self._predicted), self._goals)
+        t2 = perf_ns()
+        if recovery is None:
+            self.follower_joints.write_goals(goals)
+        else:
+            # A sync write gets no reply: only a port failure shows here
+            recovery.call('follower', self.follower_joints.write_goals, goals)
+            if not recovery.all_up:
+                return
+        t3 = perf_ns()
+        if predictor is not None:
+            predictor.observe_pipeline((t3 - sampled) / 1e9)
+
+        latency['read'].record_ns(t1 - t0)
+        latency['map'].record_ns(t2 - t1)
+        latency['write'].record_ns(t3 - t2)
+
+        if self.recorder is not None:
+            if recovery is None:
+                self.follower_joints.read_state(self._follower_state)
+            elif recovery.call('follower', self.follower_joints.read_state, self._follower_state,
+                               self.tick_deadline) is None:
+                return
+            self.recorder.record(raw, goals, self._follower_pos, self._follower_load)
+            latency['record'].record_ns(perf_ns() - t3)
+
+def format_summary(summary):
+    """Human readable rate/jitter report"""
+    return (
+        f"Ticks: {summary['ticks']} in {summary['elapsed_s']:.2f} s\n"
+        f"Rate: {summary['achieved_hz']:.1f} Hz (target {summary['target_hz']:.0f} Hz)\n"
+        f"Period: mean {summary['period_mean_ms']:.2f} ms, min {summary['period_min_ms']:.2f} ms, "
+        f"max {summary['period_max_ms']:.2f} ms\n"
+        f"Jitter: {summary['jitter_ms']:.3f} ms, overruns: {summary['overruns']}, "
+        f"skipped ticks: {summary['skipped_ticks']}"
+    )
@@ -1,67 +1,124 @@
 #!/usr/bin/env python3
 """
 SO-101 Robot Arms Connection Testing Script
-Tests connections to both leader and follower arms
+Tests connections to both leader and follower arms in parallel
 """
 
 import argparse
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-def test_leader_arm(port):
-    """Test leader arm connection"""
-    try:
+MOTOR_IDS = range(1, 7)
+
+class ArmReport:
+    """Buffered output and per-stage timings for one arm"""
+
+    def __init__(self, arm, port):
+        self.arm = arm
+        self.port = port
+        self.lines = []
+        self.stages = {}
+        self.success = False
+
+    def log(self, line):
+        self.lines.append(line)
+
+    def time_stage(self, stage, start):
+        self.stages[stage] = time.perf_counter() - start
+
+    @property
+    def total(self):
+        return sum(self.stages.values())
+
+def _make_arm(arm, port):
+    """Instantiate the leader or follower device for a port"""
+    if arm == 'leader':
         from lerobot.teleoperators.so101_leader.so101_leader import SO101Leader
         from lerobot.teleoperators.so101_leader.config_so101_leader import SO101LeaderConfig
-        
-        print(f"Testing SO-101 Leader Arm on {port}...")
-        config = SO101LeaderConfig(port=port)
-        teleop = SO101Leader(config)
-        teleop.connect()
-        print("✅ SO-101 Leader Arm - CONNECTED SUCCESSFULLY!")
-        print("All 6 motors detected and operational")
-        teleop.disconnect()
-        return True
-    except Exception as e:
-        print(f"❌ SO-101 Leader Arm - CONNECTION FAILED!")
-        print(f"Error: {e}")
-        return False
+        return SO101Leader(SO101LeaderConfig(port=port))
 
-def test_follower_arm(port):
-    """Test follower arm connection"""
+    from lerobot.robots.so101_follower.so101_follower import SO101Follower
+    from lerobot.robots.so101_follower.config_so101_follower import SO101FollowerConfig
+    return SO101Follower(SO101FollowerConfig(port=port))
+
+def test_arm_motors(bus, report):
+    """Check every motor over the already open bus with one batched read"""
+    start = time.perf_counter()
     try:
-        from lerobot.robots.so101_follower.so101_follower import SO101Follower
-        from lerobot.robots.so101_follower.config_so101_follower import SO101FollowerConfig
-        
-        print(f"Testing SO-101 Follower Arm on {port}...")
-        config = SO101FollowerConfig(port=port)
-        robot = SO101Follower(config)
-        robot.connect()
-        print("✅ SO-101 Follower Arm - CONNECTED SUCCESSFULLY!")
-        print("All 6 motors detected and operational")
-        robot.disconnect()
+        positions = bus.sync_read('Present_Position', normalize=False)
+        for name, pos in positions.items():
+            report.log(f"✅ Motor ID {bus.motors[name].id} ({name}) - WORKING, position {pos}")
         return True
     except Exception as e:
-        print(f"❌ SO-101 Follower Arm - CONNECTION FAILED!")
-        print(f"Error: {e}")
-        return False
+        # The sync read failed as a whole: ping each ID on the same bus to find the culprit
+        report.log(f"⚠️  Batched read failed ({e}), pinging motors individually")
+        ok = True
+        for name, motor in bus.motors.items():
+            if bus.ping(motor.id) is None:
+                report.log(f"❌ Motor ID {motor.id} ({name}) - FAILED")
+                ok = False
+            else:
+                report.log(f"✅ Motor ID {motor.id} ({name}) - WORKING")
+        return ok
+    finally:
+        report.time_stage('motors', start)
 
-def test_motor_connection(port, motor_id):
-    """Test individual motor connection"""
+def test_arm(arm, port, test_motors=False):
+    """Test one arm connection, optionally checking each motor"""
+    report = ArmReport(arm, port)
+    device = None
     try:
-        from lerobot.motors.feetech import FeetechMotorsBus
-        from lerobot.motors import Motor, MotorNormMode
-        
-        print(f"Testing Motor ID {motor_id} on {port}...")
-        bus = FeetechMotorsBus(port, motors={f'motor_{motor_id}': Motor(motor_id, 'sts3215', MotorNormMode.DEGREES)})
-        bus.connect()
-        print(f"✅ Motor ID {motor_id} - WORKING")
-        bus.disconnect()
-        return True
+        start = time.perf_counter()
+        device = _make_arm(arm, port)
+        report.time_stage('init', start)
+
+        start = time.perf_counter()
+        device.connect()
+        report.time_stage('connect', start)
+        report.log(f"✅ SO-101 {arm.title()} Arm - CONNECTED SUCCESSFULLY!")
+        report.log("All 6 motors detected and operational")
+        report.success = True
+
+        if test_motors:
+            report.success = test_arm_motors(device.bus, report)
     except Exception as e:
-        print(f"❌ Motor ID {motor_id} - FAILED")
-        print(f"Error: {e}")
-        return False
+        report.log(f"❌ SO-101 {arm.title()} Arm - CONNECTION FAILED!")
+        report.log(f"Error: {e}")
+    finally:
+        if device is not None and device.is_connected:
+            start = time.perf_counter()
+            try:
+                device.disconnect()
+            except Exception as e:
+                report.log(f"⚠️  Disconnect failed: {e}")
+            report.time_stage('disconnect', start)
+    return report
+
+def test_leader_arm(port, test_motors=False):
+    """Test leader arm connection"""
+    return test_arm('leader', port, test_motors)
+
+def test_follower_arm(port, test_motors=False):
+    """Test follower arm connection"""
+    return test_arm('follower', port, test_motors)
+
+def run_tests(arms, test_motors=False):
+    """Test all (arm, port) pairs concurrently, one worker per port"""
+    with ThreadPoolExecutor(max_workers=len(arms)) as pool:
+        futures = [pool.submit(test_arm, arm, port, test_motors) for arm, port in arms]
+        return [future.result() for future in futures]
+
+def print_timings(reports, wall_time):
+    """Print the per-stage timing breakdown for every arm"""
+    stages = ['init', 'connect', 'motors', 'disconnect']
+    print("\n⏱️  Timing breakdown (ms)")
+    print(f"{'ARM':<10} | " + " | ".join(f"{s:>10}" for s in stages) + f" | {'TOTAL':>8}")
+    for report in reports:
+        cells = [f"{report.stages[s] * 1000:>10.1f}" if s in report.stages else f"{'-':>10}" for s in stages]
+        print(f"{report.arm:<10} | " + " | ".join(cells) + f" | {report.total * 1000:>8.1f}")
+    print(f"Wall time: {wall_time * 1000:.1f} ms "
+          f"(sum of arms: {sum(r.total for r in reports) * 1000:.1f} ms)")
 
 def main():
     parser = argparse.ArgumentParser(description='Test SO-101 robot arm connections')
@@ -70,43 +127,47 @@ def main():
     parser.add_argument('--leader-port', default='COM3', help='Leader arm port (default: COM3)')
     parser.add_argument('--follower-port', default='COM4', help='Follower arm port (default: COM4)')
     parser.add_argument('--test-motors', action='store_true', help='Test individual motors')
-    
+    parser.add_argument('--discover', action='store_true',
+                       help='Find the leader and follower ports by their stored calibration first')
+
     args = parser.parse_args()
-    
+
     print("🤖 SO-101 Robot Arms Connection Tester")
     print("=" * 50)
-    
-    success = True
-    
+
+    if args.discover:
+        from port_discovery import discover, print_discovery
+
+        discovery = discover()
+        print_discovery(discovery)
+        args.leader_port = discovery.leader or args.leader_port
+        args.follower_port = discovery.follower or args.follower_port
+
+    arms = []
     if args.arm in ['leader', 'both']:
-        print(f"\n🔧 Testing Leader Arm ({args.leader_port})")
-        if not test_leader_arm(args.leader_port):
-            success = False
-            
-        if args.test_motors:
-            print("\n🔍 Testing Individual Leader Arm Motors:")
-            for motor_id in range(1, 7):
-                test_motor_connection(args.leader_port, motor_id)
-                time.sleep(0.1)
-    
+        arms.append(('leader', args.leader_port))
     if args.arm in ['follower', 'both']:
-        print(f"\n🔧 Testing Follower Arm ({args.follower_port})")
-        if not test_follower_arm(args.follower_port):
-            success = False
-            
-        if args.test_motors:
-            print("\n🔍 Testing Individual Follower Arm Motors:")
-            for motor_id in range(1, 7):
-                test_motor_connection(args.follower_port, motor_id)
-                time.sleep(0.1)
-    
+        arms.append(('follower', args.follower_port))
+
+    start = time.perf_counter()
+    reports = run_tests(arms, args.test_motors)
+    wall_time = time.perf_counter() - start
+
+    for report in reports:
+        print(f"\n🔧 Testing {report.arm.title()} Arm ({report.port})")
+        for line in report.lines:
+            print(line)
+
+    print_timings(reports, wall_time)
+
     print("\n" + "=" * 50)
-    if success:
+    if all(report.success for report in reports):
         print("🎉 ALL TESTS PASSED! Robot arms are ready for teleoperation.")
-        print("Run: python -m lerobot.teleoperate --teleop.type=so101_leader --teleop.port=COM3 --robot.type=so101_follower --robot.port=COM4")
+        print(f"Run: python -m lerobot.teleoperate --teleop.type=so101_leader --teleop.port={args.leader_port} "
+              f"--robot.type=so101_follower --robot.port={args.follower_port}")
     else:
         print("❌ SOME TESTS FAILED! Check connections and try again.")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+SO-101 Robot Arms Trajectory Recorder
+Memory-mapped ring buffer of timestamped leader/follower joint vectors
+
+File layout (.trj): a 4096 byte header followed by `capacity` fixed-size
+records. During a session the file is a ring buffer that other processes can
+attach to read-only (zero copy); at the end it is flushed to a compact file
+with the same layout holding only the recorded ticks, oldest first.
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from so101_bus import JOINT_NAMES
+
+MAGIC = b'SO101TRJ'
+FORMAT_VERSION = 1
+HEADER_SIZE = 4096
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('n_joints', '<u4'),
+    ('capacity', '<u8'),
+    ('count', '<u8'),          # records ever written; the ring head is count % capacity
+    ('start_unix', '<f8'),     # wall clock time of record t == 0
+    ('rate_hz', '<f8'),
+    ('joint_names', 'S256'),   # comma separated
+])
+
+def record_dtype(n_joints):
+    """One tick: sequence number, seconds since start and raw tick vectors"""
+    return np.dtype([
+        ('seq', '<u8'),
+        ('t', '<f8'),
+        ('leader_pos', '<i2', (n_joints,)),
+        ('goal', '<i2', (n_joints,)),
+        ('follower_pos', '<i2', (n_joints,)),
+        ('follower_load', '<i2', (n_joints,)),
+    ])
+
+def _map(path, mode, capacity=None, n_joints=None):
+    """Memory-map the header and the record array of a trajectory file (shape read from the header if not given)"""
+    header = np.memmap(path, dtype=HEADER_DTYPE, mode=mode, shape=(1,))
+    if capacity is None:
+        if header['magic'][0] != MAGIC:
+            raise ValueError(f"{path} is not a trajectory file")
+        if header['version'][0] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported trajectory format version {header['version'][0]} in {path}")
+        capacity, n_joints = int(header['capacity'][0]), int(header['n_joints'][0])
+    records = np.memmap(path, dtype=record_dtype(n_joints), mode=mode, offset=HEADER_SIZE, shape=(capacity,))
+    return header, records
+
+def _write_file(path, records, joint_names, start_unix, rate_hz):
+    """Write a compact trajectory file holding exactly `records`"""
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = MAGIC
+    header['version'] = FORMAT_VERSION
+    header['n_joints'] = len(joint_names)
+    header['capacity'] = len(records)
+    header['count'] = len(records)
+    header['start_unix'] = start_unix
+    header['rate_hz'] = rate_hz
+    header['joint_names'] = ','.join(joint_names).encode()
+    with open(path, 'wb') as f:
+        f.write(header.tobytes().ljust(HEADER_SIZE, b'\0'))
+        records.tofile(f)
+
+class TrajectoryRecorder:
+    """
+    Fixed-size ring buffer recorder backed by a memory-mapped file.
+
+    record() only stores into the mapped arrays (no allocation, no syscalls);
+    the page cache writes the data back. The record is written before the
+    header count is advanced, so readers never see a half-written head.
+    """
+
+    def __init__(self, path, capacity, joint_names=JOINT_NAMES, rate_hz=0.0):
+        self.path = Path(path)
+        self.joint_names = list(joint_names)
+        self.capacity = int(capacity)
+        if self.capacity <= 0:
+            raise ValueError("Recorder capacity must be positive")
+
+        n = len(self.joint_names)
+        size = HEADER_SIZE + self.capacity * record_dtype(n).itemsize
+        with open(self.path, 'wb') as f:
+            f.truncate(size)
+        self._header, self._records = _map(self.path, 'r+', self.capacity, n)
+
+        self.start_unix = time.time()
+        self._t0 = time.perf_counter()
+        self.rate_hz = rate_hz
+        header = self._header
+        header['magic'] = MAGIC
+        header['version'] = FORMAT_VERSION
+        header['n_joints'] = n
+        header['capacity'] = self.capacity
+        header['count'] = 0
+        header['start_unix'] = self.start_unix
+        header['rate_hz'] = rate_hz
+        header['joint_names'] = ','.join(self.joint_names).encode()
+
+        # Plain ndarray column views (memmap subclass indexing is several times slower),
+        # so a tick writes straight into the mapping
+        records = self._records.view(np.ndarray)
+        self._seq = records['seq']
+        self._t = records['t']
+        self._leader_pos = records['leader_pos']
+        self._goal = records['goal']
+        self._follower_pos = records['follower_pos']
+        self._follower_load = records['follower_load']
+        self._count_field = header.view(np.ndarray)['count']
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def elapsed(self):
+        """Seconds since the recorder was opened (the record time base)"""
+        return time.perf_counter() - self._t0
+
+    def record(self, leader_pos, goal, follower_pos=None, follower_load=None, t=None):
+        """Append one tick; follower vectors are left at zero when not read"""
+        i = self.count % self.capacity
+        self._seq[i] = self.count
+        self._t[i] = self.elapsed() if t is None else t
+        self._leader_pos[i] = leader_pos
+        self._goal[i] = goal
+        if follower_pos is not None:
+            self._follower_pos[i] = follower_pos
+        if follower_load is not None:
+            self._follower_load[i] = follower_load
+        self.count += 1
+        self._count_field[0] = self.count
+
+    def ordered(self):
+        """Recorded ticks oldest first (a copy once the ring has wrapped)"""
+        if self.count <= self.capacity:
+            return self._records[:self.count]
+        head = self.count % self.capacity
+        return np.concatenate((self._records[head:], self._records[:head]))
+
+    def flush(self, path):
+        """Write the recorded ticks to a compact trajectory file; returns the record count"""
+        ordered = self.ordered()
+        _write_file(path, ordered, self.joint_names, self.start_unix, self.rate_hz)
+        return len(ordered)
+
+    def close(self, compact_path=None, remove=False):
+        """Flush to compact_path if given, then unmap; remove deletes the ring file"""
+        if self._records is None:
+            return
+        if compact_path:
+            self.flush(compact_path)
+        self._records.flush()
+        self._header.flush()
+        self._seq = self._t = self._leader_pos = self._goal = None
+        self._follower_pos = self._follower_load = self._count_field = None
+        self._records = self._header = None
+        if remove:
+            os.remove(self.path)
+
+class TrajectoryReader:
+    """
+    Read-only zero-copy view of a trajectory file, live ring or compact.
+
+    Attaching to a ring that is still being written is safe: latest()
+    re-checks the header count and drops records overwritten while copying.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._header, self.records = _map(self.path, 'r')
+        header = self._header[0]
+        self.capacity = int(header['capacity'])
+        self.joint_names = header['joint_names'].decode().split(',')
+        self.start_unix = float(header['start_unix'])
+        self.rate_hz = float(header['rate_hz'])
+
+    @property
+    def count(self):
+        return int(self._header['count'][0])
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def latest(self, n=None):
+        """Copy of the last n records (all available by default), oldest first"""
+        count = self.count
+        n = min(count, self.capacity) if n is None else min(n, count, self.capacity)
+        first = count - n
+        index = np.arange(first, count) % self.capacity
+        out = self.records[index]
+        # The writer may have lapped the oldest records while they were copied
+        overwritten = self.count - self.capacity
+        if overwritten > first:
+            out = out[out['seq'] >= overwritten]
+        return out
+
+    def ordered(self):
+        """Every available record oldest first"""
+        return self.latest()
+
+def _print_summary(reader):
+    records = reader.latest()
+    print(f"📼 {reader.path}")
+    print(f"Joints: {', '.join(reader.joint_names)}")
+    print(f"Records: {len(records)} available, {reader.count} written, capacity {reader.capacity}")
+    if len(records) > 1:
+        span = records['t'][-1] - records['t'][0]
+        print(f"Span: {span:.2f} s ({(len(records) - 1) / span:.1f} Hz)" if span > 0 else "Span: 0 s")
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect or follow a recorded/live trajectory file')
+    parser.add_argument('path', help='Trajectory file (.trj), live ring buffer or compact')
+    parser.add_argument('--follow', action='store_true', help='Print the latest leader/goal vectors until Ctrl+C')
+    parser.add_argument('--interval', type=float, default=0.1, help='Seconds between --follow lines (default: 0.1)')
+
+    args = parser.parse_args()
+    reader = TrajectoryReader(args.path)
+    _print_summary(reader)
+    if not args.follow:
+        return
+
+    try:
+        while True:
+            last = reader.latest(1)
+            if len(last):
+                rec = last[0]
+                print(f"\r#{rec['seq']} t={rec['t']:8.3f}s leader {rec['leader_pos'].tolist()} "
+                      f"goal {rec['goal'].tolist()}   ", end='', flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print()
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,16 @@
 #!/usr/bin/env python3
 
+import sys
+from pathlib import Path
+
+# Add the shared helpers to the path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
 from lerobot.robots.so101_follower.so101_follower import SO101Follower
 from lerobot.robots.so101_follower.config_so101_follower import SO101FollowerConfig
+from calibration_tables import CompiledCalibration
+from motion import move_and_settle
+from so101_bus import JointBus
 
 def test_motor_ranges():
     config = SO101FollowerConfig(port='COM4')
@@ -9,16 +18,26 @@ def test_motor_ranges():
     
     try:
         robot.connect()
-        print("Motor positions and ranges:")
+        joints = JointBus(robot.bus)
+        calibration = CompiledCalibration.from_bus(robot.bus, joints.joint_names)
+
+        def move_normalized(joint, value):
+            """Move one joint to a normalized goal and wait until it settles"""
+            normalized = calibration.to_normalized(joints.read_positions())
+            normalized[joints.index(joint)] = value
+            goal = calibration.to_raw(normalized)[joints.index(joint)]
+            return move_and_settle(joints, {joint: goal})
+
+        print("Motor positions and ranges (raw ticks, one sync read):")
         print("-" * 40)
         
-        for name, motor in robot.bus.motors.items():
-            pos = motor.get_position()
-            print(f"{name}: position = {pos}")
+        state = joints.read_state()
+        for name, (pos, vel, load) in zip(joints.joint_names, state):
+            print(f"{name}: position = {pos}, velocity = {vel}, load = {load}")
             
         print("\nTesting gripper movement:")
-        gripper = robot.bus.motors['gripper']
-        current_pos = gripper.get_position()
+        gripper = joints.index('gripper')
+        current_pos = joints.read_positions()[gripper]
         print(f"Current gripper position: {current_pos}")
         
         # Try to move gripper to different positions
@@ -26,15 +45,14 @@ def test_motor_ranges():
         for pos in test_positions:
             try:
                 print(f"Trying to move gripper to {pos}...")
-                gripper.set_position(pos)
-                actual_pos = gripper.get_position()
-                print(f"  Actual position: {actual_pos}")
+                result = move_normalized('gripper', pos)
+                print(f"  Actual position: {result.positions[gripper]} - {result.summary()}")
             except Exception as e:
                 print(f"  Error: {e}")
                 
         print("\nTesting shoulder pan movement:")
-        shoulder_pan = robot.bus.motors['shoulder_pan']
-        current_pos = shoulder_pan.get_position()
+        shoulder_pan = joints.index('shoulder_pan')
+        current_pos = joints.read_positions()[shoulder_pan]
         print(f"Current shoulder pan position: {current_pos}")
         
         # Try to move shoulder pan
@@ -42,9 +60,8 @@ def test_motor_ranges():
         for pos in test_positions:
             try:
                 print(f"Trying to move shoulder pan to {pos}...")
-                shoulder_pan.set_position(pos)
-                actual_pos = shoulder_pan.get_position()
-                print(f"  Actual position: {actual_pos}")
+                result = move_normalized('shoulder_pan', pos)
+                print(f"  Actual position: {result.positions[shoulder_pan]} - {result.summary()}")
             except Exception as e:
                 print(f"  Error: {e}")
                 
@@ -54,4 +71,4 @@ def test_motor_ranges():
         robot.disconnect()
 
 if __name__ == "__main__":
-    test_motor_ranges() 
\ No newline at end of file
+    test_motor_ranges()
\ No newline at end of file